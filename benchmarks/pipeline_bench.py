@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline de ponta a ponta do ShortsGenerator.
+
+Gera um vídeo sintético do tamanho pedido com o lavfi do FFmpeg (testsrc2 +
+áudio parecido com fala, com sílabas e pausas, ou um tom senoidal), aponta o
+LLM para o servidor stub local (benchmarks/stub_openai_server.py) e transcreve
+com uma ASR falsa (ou um modelo pequeno do Whisper). O tempo de cada etapa vem
+do relatório de métricas do job; os resultados são gravados em JSON e podem
+ser comparados com uma execução anterior.
+
+Uso:
+    python benchmarks/pipeline_bench.py [--duration 300] [--runs 3] [--asr fake|tiny]
+    
+    # Gravar uma referência e comparar depois de uma mudança
+    python benchmarks/pipeline_bench.py --output baseline.json
+    python benchmarks/pipeline_bench.py --baseline baseline.json --threshold 0.15
+
+Retorna código de saída 1 se alguma etapa ficar mais lenta que a referência
+além do limite.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent))
+
+from stub_openai_server import StubOpenAIHandler, start_stub_server
+
+SAMPLE_RATE = 16000
+WORDS = ("olha", "isso", "não", "acredito", "cara", "que", "jogada", "incrível",
+         "ele", "caiu", "de", "novo", "vamos", "lá", "chat", "risada")
+
+
+class FakeWhisperModel:
+    """
+    Substituto do modelo do Whisper com a mesma interface de transcribe().
+    
+    Emite um segmento a cada segment_seconds de áudio com energia (pula o
+    silêncio), com timestamps por palavra. rtf simula o custo de uma ASR real:
+    cada segundo de áudio dorme rtf segundos.
+    """
+    
+    def __init__(self, rtf: float = 0.0, segment_seconds: float = 3.0):
+        self.rtf = rtf
+        self.segment_seconds = segment_seconds
+    
+    def transcribe(self, audio: np.ndarray, verbose=None, **options):
+        duration = len(audio) / SAMPLE_RATE
+        if self.rtf:
+            time.sleep(duration * self.rtf)
+        
+        segments = []
+        step = int(self.segment_seconds * SAMPLE_RATE)
+        for index, first in enumerate(range(0, len(audio), step)):
+            window = audio[first:first + step]
+            if len(window) < SAMPLE_RATE // 2 or float(np.sqrt(np.mean(window ** 2))) < 1e-3:
+                continue
+            
+            start = first / SAMPLE_RATE
+            end = min(duration, start + self.segment_seconds)
+            words = [WORDS[(index * 7 + i * 3) % len(WORDS)] for i in range(6)]
+            word_length = (end - start) / len(words)
+            segments.append({
+                'id': len(segments),
+                'start': start,
+                'end': end,
+                'text': " " + " ".join(words),
+                'words': [
+                    {'word': f" {word}", 'start': start + i * word_length,
+                     'end': start + (i + 1) * word_length, 'probability': 0.9}
+                    for i, word in enumerate(words)
+                ],
+            })
+        
+        return {'text': "".join(s['text'] for s in segments), 'segments': segments, 'language': 'pt'}
+
+
+def generate_synthetic_video(ffmpeg_path: str, output_path: Path, duration: float,
+                             size: str, fps: int, audio: str) -> Path:
+    """Gera o vídeo de teste: padrão de cores + fala sintética (ou tom senoidal)."""
+    if audio == "speech":
+        # Ruído rosa na banda da voz, modulado a 4 Hz (sílabas), com pausas de 2s a cada 7s
+        audio_source = (
+            f"anoisesrc=color=pink:sample_rate=44100:amplitude=0.5:duration={duration},"
+            "bandpass=f=1000:width_type=h:w=2000,"
+            "volume='if(lt(mod(t,7),5),0.6+0.4*sin(2*PI*4*t),0.01)':eval=frame"
+        )
+    else:
+        audio_source = f"sine=frequency=440:sample_rate=44100:duration={duration}"
+    
+    cmd = [
+        ffmpeg_path, "-nostdin", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}:duration={duration}",
+        "-f", "lavfi", "-i", audio_source,
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", "-y", str(output_path)
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return output_path
+
+
+def load_asr_models(asr: str, rtf: float) -> dict:
+    """Modelos compartilhados com o AudioProcessor: a ASR falsa ou um Whisper pequeno."""
+    from config.settings import WHISPER_DRAFT_MODEL, WHISPER_MODEL
+    
+    if asr == "fake":
+        model = FakeWhisperModel(rtf=rtf)
+    else:
+        import whisper
+        started = time.perf_counter()
+        model = whisper.load_model(asr)
+        print(f"Modelo Whisper '{asr}' carregado em {time.perf_counter() - started:.1f}s (fora da medição)")
+    
+    # O mesmo modelo responde pelo rascunho e pelo refinamento dos momentos
+    return {WHISPER_DRAFT_MODEL: model, WHISPER_MODEL: model}
+
+
+def run_once(video_path: Path, work_dir: Path, models: dict, args: argparse.Namespace) -> dict:
+    """Executa o pipeline uma vez sem caches e retorna os segundos de cada etapa."""
+    from src.main import ShortsGenerator
+    
+    generator = ShortsGenerator(
+        use_cache=False, use_llm_cache=False,
+        data_dir=work_dir / "data", output_dir=work_dir / "output", models=models
+    )
+    generate = generator.generate_shorts_pipelined if args.pipelined else generator.generate_shorts
+    
+    started = time.perf_counter()
+    shorts = generate(str(video_path), create_compilation=args.compilation)
+    total = time.perf_counter() - started
+    if not shorts:
+        print("Aviso: nenhum short foi criado; o tempo de renderização desta execução não é representativo")
+    
+    stages = generator.metrics.report()['stages']
+    timings = {name: stage['wall_seconds'] for name, stage in stages.items()}
+    timings['total'] = total
+    return {'timings': timings, 'shorts': len(shorts), 'stages': stages}
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """
+    Compara as medianas por etapa com a referência.
+    
+    Args:
+        current: Medianas desta execução (segundos por etapa)
+        baseline: Medianas da referência
+        threshold: Aumento relativo tolerado (0.15 = 15%)
+        min_delta: Aumento absoluto mínimo para contar como regressão (segundos)
+    
+    Returns:
+        List[str]: Etapas que regrediram
+    """
+    regressions = []
+    print(f"\n{'Etapa':<12}{'Referência':>12}{'Atual':>10}{'Variação':>10}")
+    for stage in sorted(set(current) | set(baseline), key=lambda s: (s == 'total', s)):
+        before, after = baseline.get(stage), current.get(stage)
+        if before is None or after is None:
+            print(f"{stage:<12}{'-' if before is None else f'{before:.2f}s':>12}"
+                  f"{'-' if after is None else f'{after:.2f}s':>10}")
+            continue
+        
+        change = (after - before) / before if before else 0.0
+        regressed = after - before > min_delta and change > threshold
+        marker = "  ❌" if regressed else ""
+        print(f"{stage:<12}{before:>11.2f}s{after:>9.2f}s{change:>+10.0%}{marker}")
+        if regressed:
+            regressions.append(stage)
+    
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline de ponta a ponta do pipeline")
+    parser.add_argument("--duration", type=float, default=300, help="Duração do vídeo sintético (s)")
+    parser.add_argument("--size", default="1280x720", help="Resolução do vídeo sintético")
+    parser.add_argument("--fps", type=int, default=30, help="Quadros por segundo do vídeo sintético")
+    parser.add_argument("--audio", choices=["speech", "tone"], default="speech",
+                        help="Áudio sintético: fala (sílabas e pausas) ou tom senoidal")
+    parser.add_argument("--video", type=Path, help="Usar um vídeo existente em vez do sintético")
+    parser.add_argument("--asr", default="fake",
+                        help="'fake' (sem Whisper) ou o nome de um modelo do Whisper, ex.: tiny")
+    parser.add_argument("--asr-rtf", type=float, default=0.0,
+                        help="Fator de tempo real simulado pela ASR falsa")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Atraso do stub do LLM por requisição (s)")
+    parser.add_argument("--pipelined", action="store_true", help="Medir generate_shorts_pipelined")
+    parser.add_argument("--compilation", action="store_true", help="Criar também a compilação")
+    parser.add_argument("--runs", type=int, default=3, help="Execuções (a comparação usa a mediana)")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON com os resultados")
+    parser.add_argument("--baseline", type=Path, help="Resultados anteriores para comparação")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Aumento relativo tolerado por etapa")
+    parser.add_argument("--min-delta", type=float, default=0.5,
+                        help="Aumento absoluto mínimo (s) para contar como regressão")
+    args = parser.parse_args()
+    
+    # config.settings lê OPENAI_API_BASE na importação: o projeto só é importado depois disto
+    stub = start_stub_server(latency=args.llm_latency)
+    os.environ["OPENAI_API_BASE"] = f"http://127.0.0.1:{stub.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    
+    from config.settings import DATA_DIR, FFMPEG_PATH
+    
+    config = {
+        'duration': args.duration, 'size': args.size, 'fps': args.fps, 'audio': args.audio,
+        'video': str(args.video) if args.video else None, 'asr': args.asr, 'asr_rtf': args.asr_rtf,
+        'llm_latency': args.llm_latency, 'pipelined': args.pipelined, 'compilation': args.compilation,
+    }
+    models = load_asr_models(args.asr, args.asr_rtf)
+    runs = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        video_path = args.video
+        if not video_path:
+            print(f"Gerando vídeo sintético de {args.duration:.0f}s ({args.size}, {args.audio})...")
+            video_path = generate_synthetic_video(
+                FFMPEG_PATH, tmp / "synthetic.mp4", args.duration, args.size, args.fps, args.audio
+            )
+        
+        for run in range(1, args.runs + 1):
+            print(f"\n===== Execução {run}/{args.runs} =====")
+            runs.append(run_once(video_path, tmp / f"run_{run}", models, args))
+    
+    stage_names = {name for run in runs for name in run['timings']}
+    median = {
+        name: statistics.median(run['timings'][name] for run in runs if name in run['timings'])
+        for name in stage_names
+    }
+    
+    print(f"\n📊 Mediana de {args.runs} execução(ões), {StubOpenAIHandler.request_count} requisições ao stub do LLM:")
+    for name in sorted(median, key=lambda s: (s == 'total', s)):
+        print(f"   {name:<10}{median[name]:>8.2f}s")
+    
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count()},
+        'config': config,
+        'median': median,
+        'runs': runs,
+    }
+    output = args.output or DATA_DIR / "benchmarks" / f"pipeline_{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados: {output}")
+    
+    if not args.baseline:
+        return
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('config') != config:
+        print("Aviso: a referência foi medida com outra configuração; a comparação pode não ser justa")
+    
+    regressions = compare(median, baseline['median'], args.threshold, args.min_delta)
+    if regressions:
+        print(f"❌ Regressão acima de {args.threshold:.0%} em: {', '.join(regressions)}")
+        sys.exit(1)
+    
+    print(f"✅ Nenhuma etapa ficou mais de {args.threshold:.0%} mais lenta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compara a velocidade de renderização dos backends FFmpeg e MoviePy.
+
+Gera um vídeo sintético 1920x1080 (testsrc2 + tom senoidal) com o lavfi do FFmpeg,
+renderiza o mesmo momento com cada backend e reporta quadros por segundo.
+
+Uso:
+    python benchmarks/render_backends.py [--duration 30] [--fps 30] [--video arquivo.mp4]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import FFMPEG_PATH
+from src.video_editor import VideoEditor
+
+
+def generate_synthetic_video(output_path: Path, duration: float, fps: int) -> Path:
+    """Gera um vídeo de teste com padrão de cores e áudio senoidal."""
+    cmd = [
+        FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size=1920x1080:rate={fps}:duration={duration}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={duration}",
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", "-y", str(output_path)
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return output_path
+
+
+def benchmark_backend(backend: str, video_path: Path, moment: dict, output_dir: Path) -> float:
+    """Renderiza o momento com o backend indicado e retorna o tempo em segundos."""
+    editor = VideoEditor(render_backend=backend)
+    output_path = output_dir / f"bench_{backend}.mp4"
+    
+    # Chama cada backend diretamente para que o fallback não mascare o resultado
+    start = time.perf_counter()
+    if backend == "ffmpeg":
+        editor.ffmpeg_renderer.render(
+            video_path, moment['start'], moment['end'], output_path, moment['title'], 'top'
+        )
+    else:
+        editor._render_short_moviepy(video_path, moment, output_path)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de renderização")
+    parser.add_argument("--duration", type=float, default=30, help="Duração do trecho renderizado (s)")
+    parser.add_argument("--fps", type=int, default=30, help="Quadros por segundo do vídeo sintético")
+    parser.add_argument("--video", type=str, help="Usar um vídeo existente em vez do sintético")
+    parser.add_argument("--backends", nargs="+", default=["ffmpeg", "moviepy"])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        
+        if args.video:
+            video_path = Path(args.video)
+        else:
+            print(f"Gerando vídeo sintético de {args.duration + 10:.0f}s...")
+            video_path = generate_synthetic_video(tmp_dir / "synthetic.mp4", args.duration + 10, args.fps)
+        
+        # Começa após 5s para exercitar a busca no arquivo de entrada
+        moment = {
+            'start': 5.0,
+            'end': 5.0 + args.duration,
+            'title': "Benchmark: momento de teste",
+        }
+        frames = args.duration * args.fps
+        
+        results = {}
+        for backend in args.backends:
+            elapsed = benchmark_backend(backend, video_path, moment, tmp_dir)
+            results[backend] = elapsed
+            print(f"{backend:>8}: {elapsed:6.2f}s  ({frames / elapsed:6.1f} fps, "
+                  f"{args.duration / elapsed:.2f}x tempo real)")
+        
+        if "ffmpeg" in results and "moviepy" in results:
+            print(f"Speedup ffmpeg vs moviepy: {results['moviepy'] / results['ffmpeg']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Simula uma live servindo um vídeo gravado como HLS em um servidor HTTP local.
+
+O FFmpeg empacota o arquivo em segmentos HLS na velocidade nativa (-re), então
+a playlist cresce como a de uma live de verdade; o diretório é servido por um
+servidor HTTP na mesma máquina.
+
+Uso:
+    python benchmarks/serve_hls.py video.mp4 --port 8080 [--segment-time 4]
+    
+    python src/main.py http://127.0.0.1:8080/live.m3u8 --live
+"""
+
+import argparse
+import functools
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import FFMPEG_PATH
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serve os arquivos da live sem registrar cada requisição."""
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_hls_packager(video_path: Path, output_dir: Path, segment_time: float = 4.0,
+                       realtime: bool = True) -> subprocess.Popen:
+    """Inicia o FFmpeg gerando live.m3u8 + segmentos a partir do vídeo."""
+    cmd = [FFMPEG_PATH, "-nostdin", "-loglevel", "error"]
+    if realtime:
+        cmd.append("-re")
+    cmd += [
+        "-i", str(video_path),
+        "-c:v", "libx264", "-preset", "veryfast", "-g", str(int(segment_time * 30)),
+        "-c:a", "aac", "-ar", "44100",
+        "-f", "hls",
+        "-hls_time", str(segment_time),
+        "-hls_playlist_type", "event",
+        "-hls_segment_filename", str(output_dir / "live_%05d.ts"),
+        str(output_dir / "live.m3u8")
+    ]
+    return subprocess.Popen(cmd)
+
+
+def start_hls_server(directory: Path, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve o diretório em uma thread e retorna o servidor (porta em server_address)."""
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HLS local simulando uma live")
+    parser.add_argument("video", type=Path, help="Vídeo gravado a ser transmitido")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--segment-time", type=float, default=4.0, help="Duração dos segmentos HLS (s)")
+    parser.add_argument("--fast", action="store_true", help="Empacotar o mais rápido possível (sem -re)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory(prefix="hls-live-") as tmp:
+        output_dir = Path(tmp)
+        packager = start_hls_packager(args.video, output_dir, args.segment_time, realtime=not args.fast)
+        server = start_hls_server(output_dir, args.host, args.port)
+        print(f"Live simulada em http://{args.host}:{server.server_address[1]}/live.m3u8")
+        
+        try:
+            packager.wait()
+            print("Transmissão concluída; a playlist continua disponível (Ctrl+C para sair)")
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if packager.poll() is None:
+                packager.terminate()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
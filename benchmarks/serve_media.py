@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local de mídia com suporte a Range (como um CDN de VOD).
+
+Serve os arquivos de um diretório respondendo a requisições parciais
+(206 Partial Content), o que permite ao FFmpeg/yt-dlp buscar trechos do vídeo
+sem baixar o arquivo inteiro. Ao sair, mostra quantos bytes foram servidos,
+para comparar o download completo com a ingestão --audio-first.
+
+Uso:
+    python benchmarks/serve_media.py pasta_com_videos --port 8080
+    
+    python src/main.py http://127.0.0.1:8080/video.mp4 --audio-first
+"""
+
+import argparse
+import functools
+import re
+import threading
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler com respostas parciais e contagem de bytes enviados."""
+    
+    bytes_served = 0
+    _lock = threading.Lock()
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        match = RANGE_PATTERN.match(self.headers.get("Range", "").strip())
+        if not path.is_file() or not match or match.groups() == ("", ""):
+            self._range = None
+            return super().send_head()
+        
+        size = path.stat().st_size
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) if last else size - 1, size - 1)
+        else:
+            start, end = max(0, size - int(last)), size - 1
+        
+        if start >= size or start > end:
+            self.send_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            return None
+        
+        f = open(path, "rb")
+        f.seek(start)
+        self._range = end - start + 1
+        self.send_response(HTTPStatus.PARTIAL_CONTENT)
+        self.send_header("Content-Type", self.guess_type(str(path)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(self._range))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return f
+    
+    def end_headers(self):
+        if getattr(self, "_range", None) is None:
+            self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
+    
+    def copyfile(self, source, outputfile):
+        remaining = self._range
+        sent = 0
+        try:
+            if remaining is None:
+                while chunk := source.read(64 * 1024):
+                    outputfile.write(chunk)
+                    sent += len(chunk)
+            else:
+                while remaining > 0:
+                    chunk = source.read(min(64 * 1024, remaining))
+                    if not chunk:
+                        break
+                    outputfile.write(chunk)
+                    sent += len(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # O cliente fecha a conexão ao terminar de buscar o trecho que queria
+            pass
+        finally:
+            with self._lock:
+                RangeRequestHandler.bytes_served += sent
+
+
+def start_media_server(directory: Path, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve o diretório em uma thread e retorna o servidor (porta em server_address)."""
+    handler = functools.partial(RangeRequestHandler, directory=str(directory))
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP local de mídia com suporte a Range")
+    parser.add_argument("directory", type=Path, help="Diretório com os vídeos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    
+    server = start_media_server(args.directory, args.host, args.port)
+    total = sum(f.stat().st_size for f in args.directory.iterdir() if f.is_file())
+    print(f"Servindo {args.directory} em http://{args.host}:{server.server_address[1]}/ "
+          f"({total / 1e6:.1f} MB)")
+    
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"Bytes servidos: {RangeRequestHandler.bytes_served / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Mede o tempo de inicialização da CLI (src/main.py --help).
+
+Uso:
+    python benchmarks/startup_time.py [--runs 10] [--budget-ms 300]
+
+Retorna código de saída 1 se a mediana ultrapassar o orçamento.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def measure_startup(runs: int) -> list[float]:
+    """Executa `main.py --help` várias vezes e retorna os tempos em ms."""
+    cmd = [sys.executable, str(PROJECT_ROOT / "src" / "main.py"), "--help"]
+    timings = []
+    
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da CLI")
+    parser.add_argument("--runs", type=int, default=10, help="Número de execuções")
+    parser.add_argument("--budget-ms", type=float, default=300, help="Orçamento da mediana em ms")
+    args = parser.parse_args()
+    
+    timings = measure_startup(args.runs)
+    median = statistics.median(timings)
+    
+    print(f"main.py --help: mediana {median:.0f} ms "
+          f"(mín {min(timings):.0f} ms, máx {max(timings):.0f} ms, {args.runs} execuções)")
+    
+    if median > args.budget_ms:
+        print(f"❌ Acima do orçamento de {args.budget_ms:.0f} ms")
+        print("Dica: python -X importtime src/main.py --help mostra os imports mais caros")
+        sys.exit(1)
+    
+    print(f"✅ Dentro do orçamento de {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
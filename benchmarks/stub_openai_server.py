@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Servidor local compatível com a API de chat completions da OpenAI.
+
+Responde com momentos fictícios derivados dos timestamps presentes no prompt,
+sem custo nem latência de rede. Útil para testar o cache de respostas e para
+benchmarks offline.
+
+Uso:
+    python benchmarks/stub_openai_server.py --port 8765 [--latency 0.5]
+    
+    OPENAI_API_BASE=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub \\
+        python src/main.py video.mp4
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TIMESTAMP_PATTERN = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})\]", re.MULTILINE)
+
+
+def _format_timestamp(seconds: float) -> str:
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def build_canned_moments(prompt: str, count: int = 3, duration: int = 20) -> dict:
+    """Gera momentos espaçados ao longo dos timestamps encontrados no prompt."""
+    timestamps = [
+        int(h) * 3600 + int(m) * 60 + int(s)
+        for h, m, s in TIMESTAMP_PATTERN.findall(prompt)
+    ]
+    
+    moments = []
+    if timestamps:
+        step = max(1, len(timestamps) // count)
+        for i, index in enumerate(range(0, len(timestamps), step)):
+            if i >= count:
+                break
+            start = timestamps[index]
+            moments.append({
+                "start_time": _format_timestamp(start),
+                "end_time": _format_timestamp(start + duration),
+                "title": f"Momento de teste {i + 1}",
+                "description": "Momento gerado pelo servidor stub",
+                "reason": "Resposta fixa para testes",
+                "priority": 10 - i,
+                "tags": ["stub"],
+            })
+    
+    return {"moments": moments, "summary": "Resposta do servidor stub"}
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Atende POST /v1/chat/completions (ou /chat/completions)."""
+    
+    latency = 0.0
+    request_count = 0
+    lock = threading.Lock()
+    
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "\n".join(m.get('content', '') for m in body.get('messages', []))
+        
+        with StubOpenAIHandler.lock:
+            StubOpenAIHandler.request_count += 1
+        
+        if self.latency:
+            time.sleep(self.latency)
+        
+        content = json.dumps(build_canned_moments(prompt), ensure_ascii=False)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        response = {
+            "id": f"chatcmpl-stub-{StubOpenAIHandler.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model', 'stub'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        
+        payload = json.dumps(response).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Inicia o servidor em uma thread e retorna a instância (porta em server_address)."""
+    StubOpenAIHandler.latency = latency
+    server = ThreadingHTTPServer((host, port), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor stub compatível com a API da OpenAI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso artificial por requisição (s)")
+    args = parser.parse_args()
+    
+    StubOpenAIHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), StubOpenAIHandler)
+    print(f"Stub OpenAI em http://{args.host}:{args.port}/v1")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nRequisições atendidas: {StubOpenAIHandler.request_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,18 +16,110 @@ OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
 # Configurações de processamento
 MAX_VIDEO_DURATION = 3600  # 1 hora em segundos
 CHUNK_DURATION = 300  # 5 minutos por chunk para processamento
+CHUNK_OVERLAP = 5  # Sobreposição (segundos) entre chunks consecutivos
 SHORT_DURATION = 60  # Duração máxima do short em segundos
 MIN_MOMENT_DURATION = 10  # Duração mínima de um momento engraçado
+REFINE_BOUNDARIES = True  # Ajustar início/fim dos momentos a palavras ou pausas
+BOUNDARY_TOLERANCE = 0.75  # Deslocamento máximo (segundos) de cada borda no ajuste
+BOUNDARY_PADDING = 0.1  # Margem mantida antes da primeira e depois da última palavra
+
+# Ingestão de vídeos locais: "auto", "link", "reference", "remux" ou "transcode"
+# "auto" evita recodificar quando o arquivo já pode ser lido/buscado pelo FFmpeg
+LOCAL_VIDEO_STRATEGY = os.getenv("LOCAL_VIDEO_STRATEGY", "auto")
+
+# Ingestão de URLs em duas fases (--audio-first): primeiro só o áudio para transcrição
+# e análise, depois apenas os trechos de vídeo que cobrem os momentos escolhidos
+AUDIO_FIRST_DOWNLOAD = False
+SECTION_PADDING = 5.0  # Vídeo extra baixado antes e depois de cada momento (segundos)
+
+# Configurações de renderização
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "ffmpeg")  # "ffmpeg" (filtergraph nativo) ou "moviepy"
+SHORT_RESOLUTION = (1080, 1920)  # Largura x altura dos shorts
+OVERLAY_FONT_FILE = os.getenv("OVERLAY_FONT_FILE")  # Fonte TTF para o título (opcional)
+OVERLAY_FONT_SIZE = 50  # Tamanho da fonte do título
+OVERLAY_STROKE_WIDTH = 2  # Contorno preto em volta das letras
+OVERLAY_MARGIN = 40  # Margem lateral; títulos mais largos quebram em várias linhas
+OVERLAY_CACHE_DIR = DATA_DIR / "cache" / "overlays"  # Títulos já rasterizados (PNG RGBA)
+OVERLAY_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Limite do cache (LRU)
+OVERLAY_MEMORY_ITEMS = 32  # Títulos mantidos em memória por processo
+MAX_INDIVIDUAL_SHORTS = 5  # Quantidade máxima de shorts individuais
+RENDER_WORKERS = max(1, min(MAX_INDIVIDUAL_SHORTS, (os.cpu_count() or 1) // 2))  # Shorts renderizados em paralelo
+RENDER_THREADS_PER_JOB = max(1, (os.cpu_count() or 1) // RENDER_WORKERS)  # Threads do encoder por short
+CLIP_POOL_MAX_READERS = 2  # Leitores VideoFileClip abertos simultaneamente (MoviePy)
+
+# Pipeline (--pipeline): download, transcrição, LLM e renderização em paralelo
+PIPELINE_CHUNK_SECONDS = 120  # Áudio decodificado antes de cada transcrição parcial
+PIPELINE_QUEUE_SIZE = 2  # Itens aguardando entre dois estágios (limita a memória)
 
 # Configurações de transcrição
-WHISPER_MODEL = "base"  # Modelo do Whisper para transcrição
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")  # Modelo preciso: transcrição final dos momentos
+WHISPER_DRAFT_MODEL = os.getenv("WHISPER_DRAFT_MODEL", "tiny")  # Modelo rápido: rascunho da live inteira
+# Opt-in (ou --two-pass): a descoberta dos momentos passa a usar só o rascunho do modelo rápido
+TWO_PASS_TRANSCRIPTION = os.getenv("TWO_PASS_TRANSCRIPTION", "false").lower() in ("1", "true", "yes")
+REFINE_PADDING = 2.0  # Contexto (segundos) retranscrito antes e depois de cada momento
+SAVE_EXTRACTED_AUDIO = False  # Gravar extracted_audio.wav além do buffer em memória
+CHUNKED_TRANSCRIPTION = True  # Transcrever chunks de CHUNK_DURATION em paralelo
+TRANSCRIPTION_WORKERS = max(1, (os.cpu_count() or 1) // 4)  # Processos do pool de transcrição
+USE_TRANSCRIPTION_CACHE = True  # Reaproveitar transcrições de áudios já processados
+TRANSCRIPTION_CACHE_DIR = DATA_DIR / "cache" / "transcriptions"
+TRANSCRIPTION_CACHE_MAX_BYTES = 500 * 1024 * 1024  # Limite do cache (LRU)
+USE_VAD = True  # Transcrever apenas os trechos com voz (detector de energia/cruzamentos por zero)
+VAD_FRAME_MS = 30  # Tamanho do frame analisado pelo detector de voz
+VAD_THRESHOLD_DB = 12.0  # Margem acima do piso de ruído para considerar fala
+VAD_MIN_SPEECH = 0.25  # Trechos de fala mais curtos são descartados (segundos)
+VAD_MIN_SILENCE = 0.8  # Pausas mais curtas não separam regiões de fala (segundos)
+VAD_PADDING = 0.2  # Margem mantida em volta de cada região de fala (segundos)
 
 # Configurações do LLM
 LLM_MODEL = "gpt-4o-mini"  # Modelo para identificar momentos engraçados
 LLM_TEMPERATURE = 0.7
 LLM_MAX_TOKENS = 1000
+LLM_WINDOW_DURATION = 900  # Transcrições mais longas são analisadas em janelas de 15 minutos
+LLM_WINDOW_OVERLAP = 60  # Sobreposição entre janelas consecutivas (segundos)
+LLM_CONCURRENCY = 4  # Janelas analisadas simultaneamente
+MOMENT_OVERLAP_THRESHOLD = 0.5  # Fração de sobreposição a partir da qual dois momentos são o mesmo
+LLM_BUCKET_SECONDS = 15  # Segmentos agrupados em blocos com um único timestamp no prompt
+LLM_PROMPT_TOKEN_BUDGET = 12000  # Orçamento de tokens da transcrição por prompt
+FILLER_WORDS = frozenset({"ahn", "ah", "eh", "éh", "hm", "hmm", "hum", "uh", "uhm", "né"})
+USE_LLM_CACHE = True  # Reaproveitar respostas para prompts idênticos
+LLM_CACHE_DIR = DATA_DIR / "cache" / "llm"
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Limite do cache (LRU)
+LLM_CACHE_TTL = 7 * 24 * 3600  # Validade das respostas em cache (segundos)
+
+# Pré-filtro acústico: em transmissões longas, só as janelas mais agitadas vão ao LLM
+ACOUSTIC_PREFILTER = False  # Opt-in (ou --prefilter): trechos calmos não chegam ao LLM
+ACOUSTIC_MIN_DURATION = 1800  # Aplicar apenas a áudios a partir desta duração (segundos)
+ACOUSTIC_WINDOW_SECONDS = 30  # Tamanho das janelas avaliadas
+ACOUSTIC_TOP_K = 12  # Janelas candidatas enviadas ao LLM
+ACOUSTIC_CONTEXT_SECONDS = 30  # Contexto incluído antes e depois de cada janela candidata
+
+# Modo live (--live): latência ≈ LIVE_WINDOW_SECONDS + LIVE_ANALYSIS_INTERVAL + renderização
+LIVE_SEGMENT_SECONDS = 10  # Duração dos segmentos gravados a partir do stream
+LIVE_WINDOW_SECONDS = 60  # Áudio acumulado antes de cada transcrição incremental
+LIVE_ANALYSIS_INTERVAL = 120  # Segundos de stream novos entre análises com LLM
+LIVE_CONTEXT_SECONDS = 300  # Janela deslizante de transcrição enviada ao LLM
+LIVE_POLL_INTERVAL = 1.0  # Intervalo (segundos) entre verificações de novos segmentos
+
+
+# Jobs: cada execução grava em JOBS_DIR/<id> (com manifest.json) e em OUTPUT_DIR/<id>
+JOBS_DIR = DATA_DIR / "jobs"
+CHECKPOINT_HASH_MAX_BYTES = 64 * 1024 * 1024  # Acima disso a impressão digital usa tamanho + data de modificação
+
+# Métricas por etapa (metrics.json/metrics.prom no diretório do job)
+METRICS_PROFILE = os.getenv("METRICS_PROFILE") or None  # "cprofile" ou "pyspy" para perfilar cada etapa
+
+# Serviço de jobs (src/service.py): modelos residentes e fila persistente em SQLite
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8700"))
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "3"))  # Jobs processados ao mesmo tempo
+SERVICE_DB_PATH = DATA_DIR / "jobs.sqlite3"
+SERVICE_POLL_INTERVAL = 1.0  # Intervalo (segundos) entre consultas à fila
+# Jobs que podem executar cada etapa ao mesmo tempo; o Whisper residente não é
+# reentrante, então "asr" fica em 1 (os outros jobs baixam, consultam o LLM ou renderizam)
+SERVICE_STAGE_LIMITS = {"ingest": 2, "asr": 1, "llm": 4, "render": 1}
 
-# Criar diretórios se não existirem
-DATA_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
+def ensure_directories():
+    """Cria os diretórios de dados e saída se não existirem."""
+    DATA_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(exist_ok=True)
 
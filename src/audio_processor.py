@@ -1,101 +1,549 @@
+import os
+import time
+import hashlib
 import subprocess
-import whisper
+import threading
+import wave
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from config.settings import DATA_DIR, FFMPEG_PATH, WHISPER_MODEL
+from typing import List, Dict, Any, Iterator, Optional, Union, TYPE_CHECKING
+from config.settings import (
+    DATA_DIR, FFMPEG_PATH, WHISPER_MODEL, WHISPER_DRAFT_MODEL, TWO_PASS_TRANSCRIPTION,
+    REFINE_PADDING, CHUNK_DURATION, CHUNK_OVERLAP,
+    CHUNKED_TRANSCRIPTION, TRANSCRIPTION_WORKERS, SAVE_EXTRACTED_AUDIO,
+    USE_TRANSCRIPTION_CACHE, TRANSCRIPTION_CACHE_DIR, TRANSCRIPTION_CACHE_MAX_BYTES, USE_VAD
+)
+from src import metrics
+from src.disk_cache import DiskCache
+from src.vad import VoiceActivityDetector
+from src.transcript import Transcript
+
+# numpy e whisper são importados sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000  # Taxa de amostragem usada pelo Whisper
+
+# Opções de decodificação repassadas ao Whisper (também fazem parte da chave do cache)
+TRANSCRIBE_OPTIONS = {'word_timestamps': True}
+
+# Abaixo desta fração de silêncio não compensa recortar o áudio antes do Whisper
+VAD_MIN_SKIPPED = 0.05
+
+# Acima desta fração o detector provavelmente errou (ex.: fala sobre música alta)
+VAD_MAX_SKIPPED = 0.9
+
+# Modelo carregado uma única vez em cada processo do pool de transcrição
+_worker_model = None
+
+# Evita que duas threads carreguem o mesmo modelo ao mesmo tempo (modo serviço)
+_model_lock = threading.Lock()
+
+
+def _init_transcription_worker(model_name: str, num_threads: int):
+    """Inicializa um processo do pool: limita threads do torch e carrega o modelo."""
+    global _worker_model
+    import torch
+    import whisper
+    torch.set_num_threads(num_threads)
+    _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_chunk(audio: "np.ndarray", offset: float) -> List[Dict[str, Any]]:
+    """
+    Transcreve um chunk de áudio em um processo do pool.
+    
+    Args:
+        audio: Amostras float32 mono a 16kHz
+        offset: Posição do chunk (segundos) na linha do tempo original
+        
+    Returns:
+        List: Segmentos do Whisper com timestamps globais
+    """
+    result = _worker_model.transcribe(audio, verbose=None, **TRANSCRIBE_OPTIONS)
+    return _shift_segments(result.get('segments', []), offset)
+
+
+def _shift_segments(segments: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """Desloca (in place) os timestamps de segmentos e palavras do Whisper."""
+    for segment in segments:
+        segment['start'] += offset
+        segment['end'] += offset
+        for word in segment.get('words', []):
+            word['start'] += offset
+            word['end'] += offset
+    return segments
 
 
 class AudioProcessor:
-    """Classe responsável por extrair áudio e gerar transcrições."""
+    """
+    Classe responsável por extrair áudio e gerar transcrições.
+    
+    Com two_pass, a live inteira é transcrita pelo modelo rápido
+    (WHISPER_DRAFT_MODEL) e só os momentos escolhidos passam pelo modelo
+    preciso (WHISPER_MODEL), em refine_transcript.
+    
+    models permite compartilhar modelos já carregados entre instâncias (modo
+    serviço). Nesse caso a transcrição roda no próprio processo, sem o pool de
+    chunks, que carregaria o modelo de novo a cada chamada.
+    """
     
-    def __init__(self):
+    def __init__(self, save_audio: bool = SAVE_EXTRACTED_AUDIO,
+                 use_cache: bool = USE_TRANSCRIPTION_CACHE, use_vad: bool = USE_VAD,
+                 two_pass: bool = TWO_PASS_TRANSCRIPTION, models: Optional[Dict[str, Any]] = None):
         self.data_dir = DATA_DIR
-        self.whisper_model = whisper.load_model(WHISPER_MODEL)
+        self.save_audio = save_audio
+        self.use_cache = use_cache
+        self.cache = DiskCache(TRANSCRIPTION_CACHE_DIR, TRANSCRIPTION_CACHE_MAX_BYTES)
+        self.vad = VoiceActivityDetector() if use_vad else None
+        self.last_transcription_stats: Dict[str, float] = {}
+        self.model_name = WHISPER_MODEL
+        self.draft_model_name = (
+            WHISPER_DRAFT_MODEL if two_pass and WHISPER_DRAFT_MODEL != WHISPER_MODEL else None
+        )
+        self.shared_models = models is not None
+        self._models: Dict[str, Any] = models if models is not None else {}
+    
+    @property
+    def whisper_model(self):
+        """Modelo preciso do Whisper, carregado apenas no primeiro uso."""
+        return self.load_model(self.model_name)
+    
+    @property
+    def discovery_model_name(self) -> str:
+        """Modelo usado para transcrever o áudio inteiro."""
+        return self.draft_model_name or self.model_name
+    
+    def load_model(self, model_name: str):
+        """Carrega (uma vez) e retorna um modelo do Whisper pelo nome."""
+        with _model_lock:
+            if model_name not in self._models:
+                import whisper
+                print(f"Carregando modelo Whisper '{model_name}'...")
+                self._models[model_name] = whisper.load_model(model_name)
+            return self._models[model_name]
         
-    def extract_audio(self, video_path: Path, audio_path: Optional[Path] = None) -> Path:
+    def load_audio(self, video_path: Path, save_path: Optional[Path] = None) -> "np.ndarray":
         """
-        Extrai o áudio de um arquivo de vídeo.
+        Decodifica o áudio do vídeo direto para a memória, sem arquivo intermediário.
+        
+        O FFmpeg envia PCM 16-bit mono a 16kHz pelo stdout, que vira um buffer NumPy.
         
         Args:
             video_path: Caminho para o arquivo de vídeo
-            audio_path: Caminho de saída para o áudio (opcional)
+            save_path: Se informado, grava também o WAV correspondente
             
         Returns:
-            Path: Caminho para o arquivo de áudio extraído
+            np.ndarray: Amostras float32 normalizadas em [-1, 1]
         """
-        if not audio_path:
-            audio_path = self.data_dir / "extracted_audio.wav"
-            
         try:
             cmd = [
-                FFMPEG_PATH, "-i", str(video_path),
+                FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+                "-i", str(video_path),
                 "-vn",  # Sem vídeo
-                "-acodec", "pcm_s16le",  # Codec de áudio WAV
-                "-ar", "16000",  # Sample rate 16kHz (recomendado para Whisper)
+                "-f", "s16le",  # PCM cru no stdout
+                "-acodec", "pcm_s16le",
+                "-ar", str(SAMPLE_RATE),  # Sample rate 16kHz (recomendado para Whisper)
                 "-ac", "1",  # Mono
-                "-y", str(audio_path)
+                "-"
             ]
             
-            subprocess.run(cmd, check=True, capture_output=True)
-            print(f"Áudio extraído: {audio_path}")
-            return audio_path
+            import numpy as np
+            
+            started = time.perf_counter()
+            result = subprocess.run(cmd, check=True, capture_output=True)
+            pcm = np.frombuffer(result.stdout, np.int16)
+            metrics.record('decode_seconds', time.perf_counter() - started)
+            metrics.record('decoded_audio_seconds', len(pcm) / SAMPLE_RATE)
+            
+            if save_path:
+                self._write_wav(pcm, save_path)
+                print(f"Áudio extraído: {save_path}")
+            
+            duration = len(pcm) / SAMPLE_RATE
+            print(f"Áudio decodificado em memória: {duration:.1f}s")
+            return pcm.astype(np.float32) / 32768.0
             
         except subprocess.CalledProcessError as e:
             raise Exception(f"Erro ao extrair áudio: {e.stderr.decode()}")
     
-    def transcribe_audio(self, audio_path: Path) -> Dict[str, Any]:
+    def stream_audio(self, source: Union[str, Path], block_seconds: float = 10.0) -> Iterator["np.ndarray"]:
+        """
+        Decodifica o áudio em blocos, à medida que o FFmpeg lê a entrada.
+        
+        Ao contrário de load_audio, os primeiros blocos ficam disponíveis antes
+        de o arquivo (ou a URL) terminar de ser lido.
+        
+        Args:
+            source: Caminho ou URL que o FFmpeg consegue ler
+            block_seconds: Duração de cada bloco entregue
+            
+        Yields:
+            np.ndarray: Amostras float32 mono a 16kHz, em ordem
+        """
+        import numpy as np
+        
+        cmd = [
+            FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+            "-i", str(source),
+            "-vn", "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE), "-ac", "1",
+            "-"
+        ]
+        block_bytes = int(block_seconds * SAMPLE_RATE) * 2
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                # Uma leitura pode terminar no meio de uma amostra de 16 bits
+                if len(data) % 2:
+                    data += process.stdout.read(1)
+                yield np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+            
+            if process.wait() != 0:
+                raise Exception(f"Erro ao extrair áudio: {process.stderr.read().decode(errors='replace')}")
+        
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+    
+    def transcribe_audio(self, audio: Union[Path, "np.ndarray"], model_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Transcreve o áudio usando Whisper.
         
+        Com o detector de voz ativo, apenas as regiões com fala são transcritas
+        (concatenadas) e os timestamps voltam para a linha do tempo original.
+        Áudios mais longos que CHUNK_DURATION são divididos em chunks
+        transcritos em paralelo quando CHUNKED_TRANSCRIPTION está ativo.
+        
         Args:
-            audio_path: Caminho para o arquivo de áudio
+            audio: Caminho para um WAV 16kHz mono ou amostras já em memória
+            model_name: Modelo do Whisper (padrão: discovery_model_name)
             
         Returns:
-            Dict: Resultado da transcrição com timestamps
+            Dict: Resultado da transcrição com timestamps; 'model' é o modelo
+                usado (o preciso, se o rascunho veio vazio)
         """
+        model_name = model_name or self.discovery_model_name
         try:
-            print("Iniciando transcrição do áudio...")
-            result = self.whisper_model.transcribe(
-                str(audio_path),
-                word_timestamps=True,
-                verbose=False
-            )
-            
-            print(f"Transcrição concluída. Texto: {len(result['text'])} caracteres")
+            print(f"Iniciando transcrição do áudio (modelo '{model_name}')...")
+            if isinstance(audio, (str, Path)):
+                audio = self._read_wav(audio)
+            duration = len(audio) / SAMPLE_RATE
+            started = time.perf_counter()
+            
+            speech, timeline = audio, None
+            if self.vad:
+                speech, timeline = self.vad.extract_speech(audio)
+                if timeline.skipped_fraction < VAD_MIN_SKIPPED:
+                    speech, timeline = audio, None
+                elif timeline.skipped_fraction > VAD_MAX_SKIPPED and not self.vad.is_silent(audio):
+                    print(f"Aviso: VAD descartaria {timeline.skipped_fraction:.0%} de um áudio com som; "
+                          f"transcrevendo o áudio inteiro")
+                    speech, timeline = audio, None
+            speech_duration = len(speech) / SAMPLE_RATE
+            
+            if speech_duration == 0:
+                result = {'text': "", 'segments': [], 'language': None}
+            elif (CHUNKED_TRANSCRIPTION and TRANSCRIPTION_WORKERS > 1 and not self.shared_models
+                    and speech_duration > CHUNK_DURATION):
+                result = self.transcribe_audio_chunked(speech, model_name=model_name)
+            else:
+                result = self.load_model(model_name).transcribe(
+                    speech,
+                    verbose=False,
+                    **TRANSCRIBE_OPTIONS
+                )
+            
+            if timeline is not None:
+                timeline.remap_segments(result['segments'])
+            
+            # Um rascunho vazio (ex.: 'tiny' sobre as regiões do VAD) não teria
+            # momentos para refinar: a descoberta usa então o modelo preciso
+            if not result['segments'] and speech_duration > 0 and model_name == self.draft_model_name:
+                print(f"Aviso: Rascunho '{model_name}' vazio com {speech_duration:.0f}s de fala; "
+                      f"transcrevendo com '{self.model_name}'")
+                return self.transcribe_audio(audio, self.model_name)
+            
+            elapsed = time.perf_counter() - started
+            self.last_transcription_stats = {
+                'audio_seconds': duration,
+                'speech_seconds': speech_duration,
+                'skipped_fraction': 1 - speech_duration / duration if duration else 0.0,
+                'transcription_seconds': elapsed,
+                'real_time_factor': elapsed / duration if duration else 0.0,
+            }
+            
+            stats = self.last_transcription_stats
+            for name in ('audio_seconds', 'speech_seconds', 'transcription_seconds'):
+                metrics.record(name, stats[name])
+            if self.vad:
+                print(f"VAD: {stats['skipped_fraction']:.0%} do áudio ignorado "
+                      f"({speech_duration:.0f}s de fala em {duration:.0f}s)")
+            print(f"Transcrição concluída. Texto: {len(result['text'])} caracteres "
+                  f"(RTF {stats['real_time_factor']:.3f})")
+            # Modelo que de fato transcreveu (chave do cache)
+            result['model'] = model_name
             return result
             
         except Exception as e:
             raise Exception(f"Erro na transcrição: {str(e)}")
     
-    def format_transcription(self, transcription_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def transcribe_audio_chunked(self, audio: "np.ndarray", workers: int = TRANSCRIPTION_WORKERS,
+                                 model_name: Optional[str] = None) -> Dict[str, Any]:
         """
-        Formata o resultado da transcrição em segmentos com timestamps.
+        Transcreve o áudio em chunks paralelos em um pool de processos.
+        
+        Cada chunk cobre CHUNK_DURATION segundos mais CHUNK_OVERLAP de cada lado;
+        os segmentos são reposicionados na linha do tempo global e a sobreposição
+        é removida na junção.
         
         Args:
-            transcription_result: Resultado bruto do Whisper
+            audio: Amostras float32 mono a 16kHz
+            workers: Número de processos do pool
+            model_name: Modelo do Whisper (padrão: discovery_model_name)
+            
+        Returns:
+            Dict: Resultado no mesmo formato de whisper.transcribe
+        """
+        chunk_samples = int(CHUNK_DURATION * SAMPLE_RATE)
+        overlap_samples = int(CHUNK_OVERLAP * SAMPLE_RATE)
+        total_samples = len(audio)
+        
+        chunks = []
+        for nominal_start in range(0, total_samples, chunk_samples):
+            start = max(0, nominal_start - overlap_samples)
+            end = min(total_samples, nominal_start + chunk_samples + overlap_samples)
+            chunks.append((nominal_start, start, end))
+        
+        workers = max(1, min(workers, len(chunks)))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        print(f"Transcrevendo {len(chunks)} chunks de {CHUNK_DURATION}s com {workers} processos...")
+        
+        # 'spawn' evita herdar o estado do torch do processo principal
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_transcription_worker,
+            initargs=(model_name or self.discovery_model_name, threads)
+        ) as executor:
+            futures = [
+                executor.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE)
+                for _, start, end in chunks
+            ]
+            chunk_segments = [future.result() for future in futures]
+        
+        boundaries = [nominal_start / SAMPLE_RATE for nominal_start, _, _ in chunks]
+        boundaries.append(float('inf'))
+        segments = self._stitch_chunks(chunk_segments, boundaries)
+        
+        return {
+            'text': "".join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': None
+        }
+    
+    def _stitch_chunks(self, chunk_segments: List[List[Dict[str, Any]]],
+                       boundaries: List[float]) -> List[Dict[str, Any]]:
+        """
+        Une os segmentos dos chunks, descartando o que caiu na sobreposição.
+        
+        Cada chunk contribui com os segmentos que tocam o seu intervalo nominal
+        e começam antes do fim dele, então um segmento que atravessa a fronteira
+        segue inteiro no chunk anterior. O começo do chunk seguinte é recortado
+        até o fim do que já foi aceito (_trim_overlap), por palavras quando há
+        timestamps delas; textos repetidos na junção também são descartados.
+        """
+        stitched = []
+        covered_until = float('-inf')
+        
+        for i, segments in enumerate(chunk_segments):
+            nominal_start, nominal_end = boundaries[i], boundaries[i + 1]
+            
+            for segment in segments:
+                if segment['start'] >= nominal_end or segment['end'] <= nominal_start:
+                    continue
+                
+                segment = self._trim_overlap(segment, covered_until)
+                if segment is None:
+                    continue
+                
+                if stitched:
+                    previous = stitched[-1]
+                    same_text = (self._normalize_text(previous['text'])
+                                 == self._normalize_text(segment['text']))
+                    if same_text and segment['start'] - previous['end'] < CHUNK_OVERLAP:
+                        continue
+                
+                stitched.append(segment)
+            
+            if stitched:
+                covered_until = max(covered_until, stitched[-1]['end'])
+        
+        for i, segment in enumerate(stitched):
+            segment['id'] = i
+        
+        return stitched
+    
+    @staticmethod
+    def _trim_overlap(segment: Dict[str, Any], covered_until: float) -> Optional[Dict[str, Any]]:
+        """
+        Remove de um segmento o trecho já coberto pelo chunk anterior.
+        
+        Com palavras, ficam só as que têm o meio depois de covered_until; sem
+        elas, o segmento é descartado se mais da metade dele já estiver coberta.
+        
+        Args:
+            segment: Segmento do chunk seguinte (dicionário)
+            covered_until: Fim do último segmento aceito do chunk anterior
             
         Returns:
-            List: Lista de segmentos formatados
+            Dict: O segmento (recortado se preciso) ou None se já estava coberto
         """
-        segments = []
+        if segment['start'] >= covered_until:
+            return segment
         
-        for segment in transcription_result.get('segments', []):
-            formatted_segment = {
-                'start': segment['start'],
-                'end': segment['end'],
-                'text': segment['text'].strip(),
-                'duration': segment['end'] - segment['start']
+        words = segment.get('words')
+        if words:
+            kept = [word for word in words if (word['start'] + word['end']) / 2 >= covered_until]
+            if len(kept) == len(words):
+                return segment
+            if not kept:
+                return None
+            
+            prefix = " " if segment['text'].startswith(" ") else ""
+            trimmed = {
+                **segment,
+                'start': kept[0]['start'],
+                'text': prefix + " ".join(word['word'].strip() for word in kept),
+                'words': kept,
             }
-            segments.append(formatted_segment)
+            if 'duration' in segment:
+                trimmed['duration'] = trimmed['end'] - trimmed['start']
+            return trimmed
+        
+        covered = min(segment['end'], covered_until) - segment['start']
+        return None if covered > (segment['end'] - segment['start']) / 2 else segment
+    
+    def transcribe_chunk(self, audio: "np.ndarray", offset: float = 0.0) -> Transcript:
+        """
+        Transcreve um trecho do áudio (consultando o cache) na linha do tempo global.
+        
+        Args:
+            audio: Amostras float32 mono a 16kHz do trecho
+            offset: Posição do trecho (segundos) no áudio completo
+            
+        Returns:
+            Transcript: Transcrição do trecho com timestamps globais
+        """
+        local = self._cached_transcription(audio)
+        if local is None:
+            local = self._transcribe_and_cache(audio)
+        
+        return local.shifted(offset)
+    
+    def _cached_transcription(self, audio: "np.ndarray") -> Optional[Transcript]:
+        """
+        Transcrição de descoberta já em cache, se houver.
         
-        return segments
+        Com duas passadas, uma transcrição do modelo preciso (gravada quando o
+        rascunho veio vazio) também serve.
+        """
+        if not self.use_cache:
+            return None
+        
+        models = [self.discovery_model_name]
+        if self.draft_model_name:
+            models.append(self.model_name)
+        for model_name in models:
+            cached = self.cache.get(self._cache_key(audio, model_name))
+            if cached is not None:
+                return Transcript.from_dict(cached)
+        return None
+    
+    def _transcribe_and_cache(self, audio: "np.ndarray") -> Transcript:
+        """Transcreve e grava no cache sob a chave do modelo que de fato transcreveu."""
+        result = self.transcribe_audio(audio)
+        transcript = self.format_transcription(result)
+        if self.use_cache:
+            self.cache.set(self._cache_key(audio, result['model']), transcript.to_dict())
+        return transcript
+    
+    def _cache_key(self, audio: "np.ndarray", model_name: Optional[str] = None) -> str:
+        """Chave do cache: hash das amostras + modelo + opções de decodificação."""
+        options = {
+            **TRANSCRIBE_OPTIONS,
+            'chunked': CHUNKED_TRANSCRIPTION,
+            'chunk_duration': CHUNK_DURATION,
+            'chunk_overlap': CHUNK_OVERLAP,
+            'format': 'transcript-v2',
+            'vad': self.vad.options if self.vad else None,
+        }
+        return DiskCache.make_key(self._audio_hash(audio), model_name or self.discovery_model_name, options)
+    
+    def _audio_hash(self, audio: "np.ndarray") -> str:
+        """Hash das amostras de áudio."""
+        import numpy as np
+        
+        return hashlib.blake2b(np.ascontiguousarray(audio), digest_size=20).hexdigest()
+    
+    def _normalize_text(self, text: str) -> str:
+        """Normaliza texto para comparação (minúsculas, sem pontuação)."""
+        return "".join(c for c in text.lower() if c.isalnum())
     
-    def save_transcription(self, segments: List[Dict[str, Any]], output_path: Optional[Path] = None) -> Path:
+    def _read_wav(self, audio_path: Path) -> "np.ndarray":
+        """Lê um WAV PCM 16-bit mono como float32 normalizado."""
+        import numpy as np
+        
+        with wave.open(str(audio_path), 'rb') as wav_file:
+            frames = wav_file.readframes(wav_file.getnframes())
+        
+        return np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+    
+    def _write_wav(self, pcm: "np.ndarray", audio_path: Path):
+        """Grava amostras PCM 16-bit mono como WAV."""
+        with wave.open(str(audio_path), 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(SAMPLE_RATE)
+            wav_file.writeframes(pcm.tobytes())
+    
+    def format_transcription(self, transcription_result: Dict[str, Any]) -> Transcript:
+        """
+        Formata o resultado da transcrição em segmentos com timestamps.
+        
+        Args:
+            transcription_result: Resultado bruto do Whisper
+            
+        Returns:
+            Transcript: Transcrição colunar com os segmentos e as palavras
+        """
+        raw_segments = transcription_result.get('segments', [])
+        
+        return Transcript(
+            (segment['start'] for segment in raw_segments),
+            (segment['end'] for segment in raw_segments),
+            (segment['text'].strip() for segment in raw_segments),
+            words=[
+                [
+                    {'start': word['start'], 'end': word['end'], 'word': word['word'].strip()}
+                    for word in segment.get('words', [])
+                ]
+                for segment in raw_segments
+            ]
+        )
+    
+    def save_transcription(self, segments: Transcript, output_path: Optional[Path] = None) -> Path:
         """
         Salva a transcrição em um arquivo de texto.
         
         Args:
-            segments: Lista de segmentos da transcrição
+            segments: Transcrição (Transcript)
             output_path: Caminho de saída (opcional)
             
         Returns:
@@ -109,18 +557,17 @@ class AudioProcessor:
                 f.write("TRANSCRIÇÃO DO VÍDEO\n")
                 f.write("=" * 50 + "\n\n")
                 
-                for segment in segments:
-                    start_time = self._format_timestamp(segment['start'])
-                    end_time = self._format_timestamp(segment['end'])
+                for i in range(len(segments)):
+                    start_time = self._format_timestamp(segments.starts[i])
+                    end_time = self._format_timestamp(segments.ends[i])
                     
-                    f.write(f"[{start_time} - {end_time}] {segment['text']}\n")
+                    f.write(f"[{start_time} - {end_time}] {segments.text_at(i)}\n")
                 
                 f.write("\n" + "=" * 50 + "\n")
                 f.write("TEXTO COMPLETO\n")
                 f.write("=" * 50 + "\n\n")
                 
-                full_text = " ".join([seg['text'] for seg in segments])
-                f.write(full_text)
+                f.write(segments.text)
             
             print(f"Transcrição salva: {output_path}")
             return output_path
@@ -135,27 +582,136 @@ class AudioProcessor:
         secs = int(seconds % 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
-    def process_audio(self, video_path: Path) -> tuple[List[Dict[str, Any]], Path]:
+    def prepare_audio(self, video_path: Path) -> "np.ndarray":
+        """Decodifica o áudio do vídeo (e grava o WAV se save_audio estiver ativo)."""
+        save_path = self.data_dir / "extracted_audio.wav" if self.save_audio else None
+        return self.load_audio(video_path, save_path)
+    
+    def process_audio(self, video_path: Path, audio: Optional["np.ndarray"] = None) -> tuple[Transcript, Path]:
         """
         Método principal para processar áudio: extração + transcrição.
         
         Args:
             video_path: Caminho para o arquivo de vídeo
+            audio: Áudio já decodificado por prepare_audio (opcional)
             
         Returns:
             tuple: (segmentos_da_transcrição, caminho_do_arquivo_de_transcrição)
         """
-        # Extrair áudio
-        audio_path = self.extract_audio(video_path)
+        # Extrair áudio direto para a memória (WAV em disco apenas se solicitado)
+        if audio is None:
+            audio = self.prepare_audio(video_path)
         
-        # Transcrever áudio
-        transcription_result = self.transcribe_audio(audio_path)
+        # Consultar o cache antes de carregar o modelo e transcrever
+        segments = self._cached_transcription(audio)
         
-        # Formatar segmentos
-        segments = self.format_transcription(transcription_result)
+        if segments is not None:
+            metrics.record('transcription_cache_hits')
+            print(f"Transcrição recuperada do cache ({len(segments)} segmentos)")
+        else:
+            segments = self._transcribe_and_cache(audio)
         
         # Salvar transcrição
         transcription_file = self.save_transcription(segments)
         
         return segments, transcription_file
-
+    
+    def refine_transcript(self, audio: "np.ndarray", transcript: Transcript,
+                          moments: List[Dict[str, Any]]) -> Transcript:
+        """
+        Segunda passada: retranscreve só os trechos dos momentos com o modelo preciso.
+        
+        Cada momento (mais REFINE_PADDING de contexto) é expandido até as bordas
+        dos segmentos do rascunho que toca; esse intervalo é retranscrito com
+        palavras e substitui os segmentos do rascunho. O custo cresce com a
+        duração dos momentos, não com a da live.
+        
+        Args:
+            audio: Amostras float32 mono a 16kHz
+            transcript: Transcrição de rascunho
+            moments: Momentos escolhidos
+            
+        Returns:
+            Transcript: Nova transcrição (ou a mesma, sem two_pass ou sem momentos)
+        """
+        replacements = self.refine_replacements(audio, transcript, moments)
+        if not replacements:
+            return transcript
+        
+        transcript = transcript.replace_ranges(replacements)
+        self.save_transcription(transcript)
+        return transcript
+    
+    def refine_replacements(self, audio: "np.ndarray", transcript: Transcript,
+                            moments: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Retranscreve os trechos dos momentos sem alterar a transcrição.
+        
+        Separado de refine_transcript para que o pipeline retranscreva sobre um
+        snapshot e só aplique as trocas (índices do snapshot) sob o seu lock.
+        
+        Args:
+            audio: Amostras float32 mono a 16kHz
+            transcript: Transcrição de rascunho
+            moments: Momentos escolhidos
+            
+        Returns:
+            list: Tuplas (lo, hi, Transcript) para Transcript.replace_ranges
+        """
+        # Sem segmentos no rascunho não há bordas para alinhar os trechos
+        if not self.draft_model_name or not moments or not transcript:
+            return []
+        
+        # Intervalos a retranscrever, alinhados às bordas dos segmentos do rascunho
+        ranges = []
+        for moment in moments:
+            start = max(0.0, moment['start'] - REFINE_PADDING)
+            end = min(len(audio) / SAMPLE_RATE, moment['end'] + REFINE_PADDING)
+            view = transcript.range(start, end)
+            if view:
+                start = min(start, view.starts[0])
+                end = max(end, max(view.ends))
+            ranges.append((start, end))
+        
+        merged = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        
+        started = time.perf_counter()
+        replacements = []
+        for start, end in merged:
+            view = transcript.range(start, end)
+            first, last = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+            segment_audio = audio[first:last]
+            
+            cache_key = None
+            if self.use_cache:
+                cache_key = DiskCache.make_key(
+                    self._audio_hash(segment_audio), self.model_name,
+                    {**TRANSCRIBE_OPTIONS, 'refine': True, 'format': 'transcript-v2'}
+                )
+            cached = self.cache.get(cache_key) if cache_key else None
+            
+            # Timestamps relativos ao trecho: o cache vale para o mesmo áudio em qualquer posição
+            if cached is not None:
+                local = Transcript.from_dict(cached)
+            else:
+                result = self.load_model(self.model_name).transcribe(
+                    segment_audio, verbose=None, **TRANSCRIBE_OPTIONS
+                )
+                local = self.format_transcription(result)
+                if cache_key:
+                    self.cache.set(cache_key, local.to_dict())
+            
+            replacements.append((view.lo, view.hi, local.shifted(start)))
+        
+        refined_seconds = sum(end - start for start, end in merged)
+        elapsed = time.perf_counter() - started
+        metrics.record('refined_audio_seconds', refined_seconds)
+        metrics.record('refine_seconds', elapsed)
+        print(f"Refinamento com '{self.model_name}': {len(merged)} trechos, "
+              f"{refined_seconds:.0f}s de {len(audio) / SAMPLE_RATE:.0f}s em {elapsed:.1f}s")
+        return replacements
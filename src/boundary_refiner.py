@@ -0,0 +1,165 @@
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from config.settings import BOUNDARY_TOLERANCE, BOUNDARY_PADDING
+from src.transcript import Transcript
+
+# numpy é importado sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000  # Mesma taxa do áudio decodificado pelo AudioProcessor
+ENERGY_FRAME_SIZE = 160  # Frames de 10 ms para localizar pausas
+
+
+class BoundaryRefiner:
+    """
+    Ajusta o início e o fim dos momentos para não cortar palavras.
+    
+    Os timestamps do LLM têm resolução de segundos. Cada borda é movida para
+    uma fronteira de palavra dentro da tolerância: o início logo antes de uma
+    palavra começar, o fim logo depois de uma palavra terminar, sem invadir a
+    palavra vizinha. Sem palavras no entorno (música, silêncio), a borda vai
+    para o trecho de menor energia do áudio dentro da tolerância.
+    Todas as bordas são ajustadas de uma vez, com operações vetorizadas.
+    """
+    
+    def __init__(self, tolerance: float = BOUNDARY_TOLERANCE, padding: float = BOUNDARY_PADDING,
+                 sample_rate: int = SAMPLE_RATE):
+        self.tolerance = tolerance
+        self.padding = padding
+        self.sample_rate = sample_rate
+    
+    def refine(self, moments: List[Dict[str, Any]], transcript: Transcript,
+               audio: Optional["np.ndarray"] = None) -> List[Dict[str, Any]]:
+        """
+        Ajusta as bordas dos momentos (in place) e atualiza duração e segmentos.
+        
+        Args:
+            moments: Momentos identificados pelo LLM
+            transcript: Transcrição com as palavras (word_starts/word_ends)
+            audio: Amostras float32 a 16 kHz, para o ajuste por energia (opcional)
+        
+        Returns:
+            List: Os mesmos momentos, com 'start', 'end' e 'duration' ajustados
+        """
+        import numpy as np
+        
+        if not moments:
+            return moments
+        
+        starts = np.array([moment['start'] for moment in moments], dtype=np.float64)
+        ends = np.array([moment['end'] for moment in moments], dtype=np.float64)
+        word_starts, word_ends, start_cuts, end_cuts = self._word_cut_points(transcript)
+        
+        new_starts, start_snapped = self._snap(starts, start_cuts, word_starts, word_ends)
+        new_ends, end_snapped = self._snap(ends, end_cuts, word_starts, word_ends)
+        
+        if audio is not None:
+            quiet_starts = self._quietest_points(audio, starts[~start_snapped])
+            new_starts[~start_snapped] = quiet_starts
+            quiet_ends = self._quietest_points(audio, ends[~end_snapped])
+            new_ends[~end_snapped] = quiet_ends
+        
+        # Nunca inverter um momento: se o ajuste cruzar as bordas, manter o original
+        invalid = new_ends <= new_starts
+        new_starts[invalid] = starts[invalid]
+        new_ends[invalid] = ends[invalid]
+        
+        for i, moment in enumerate(moments):
+            moment['start'] = float(max(0.0, new_starts[i]))
+            moment['end'] = float(new_ends[i])
+            moment['duration'] = moment['end'] - moment['start']
+            moment['segments'] = transcript.range(moment['start'], moment['end'])
+        
+        moved = np.abs(new_starts - starts).mean() + np.abs(new_ends - ends).mean()
+        print(f"Bordas ajustadas: {int(start_snapped.sum() + end_snapped.sum())} em palavras, "
+              f"deslocamento médio {moved / 2:.2f}s")
+        return moments
+    
+    def _word_cut_points(self, transcript: Transcript) -> tuple:
+        """
+        Pontos de corte válidos para início e fim de cada palavra.
+        
+        O início de cada palavra recua padding segundos, sem passar do fim da
+        palavra anterior; o fim avança padding, sem passar do início da próxima.
+        
+        Returns:
+            tuple: (inícios, fins, cortes_de_início, cortes_de_fim), um item por palavra
+        """
+        import numpy as np
+        
+        if not transcript.has_words or len(transcript.word_starts) == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, empty, empty
+        
+        word_starts = np.frombuffer(transcript.word_starts, dtype=np.float64)
+        word_ends = np.frombuffer(transcript.word_ends, dtype=np.float64)
+        
+        previous_ends = np.concatenate(([-np.inf], word_ends[:-1]))
+        next_starts = np.concatenate((word_starts[1:], [np.inf]))
+        
+        start_cuts = np.maximum(word_starts - self.padding, np.minimum(previous_ends, word_starts))
+        end_cuts = np.minimum(word_ends + self.padding, np.maximum(next_starts, word_ends))
+        
+        return word_starts, word_ends, start_cuts, end_cuts
+    
+    def _snap(self, points: "np.ndarray", cuts: "np.ndarray",
+              word_starts: "np.ndarray", word_ends: "np.ndarray") -> tuple:
+        """
+        Move cada ponto para um corte dentro da tolerância.
+        
+        Um ponto no meio de uma palavra vai para o corte dessa palavra, de
+        modo que ela fique inteira no momento (não perder o começo de uma fala
+        nem o final de uma piada); nos demais casos, vai para o corte mais próximo.
+        
+        Returns:
+            tuple: (pontos ajustados, máscara dos pontos que foram ajustados)
+        """
+        import numpy as np
+        
+        if len(cuts) == 0:
+            return points.copy(), np.zeros(len(points), dtype=bool)
+        
+        # Palavra que contém o ponto, se houver
+        word = np.clip(np.searchsorted(word_starts, points, side='right') - 1, 0, len(word_starts) - 1)
+        inside = (word_starts[word] <= points) & (points < word_ends[word])
+        
+        # Corte mais próximo, para pontos entre palavras
+        sorted_cuts = np.sort(cuts)
+        right = np.clip(np.searchsorted(sorted_cuts, points), 0, len(sorted_cuts) - 1)
+        left = np.clip(right - 1, 0, len(sorted_cuts) - 1)
+        nearest = np.where(
+            np.abs(sorted_cuts[left] - points) <= np.abs(sorted_cuts[right] - points),
+            sorted_cuts[left], sorted_cuts[right]
+        )
+        
+        target = np.where(inside, cuts[word], nearest)
+        snapped = np.abs(target - points) <= self.tolerance
+        return np.where(snapped, target, points), snapped
+    
+    def _quietest_points(self, audio: "np.ndarray", points: "np.ndarray") -> "np.ndarray":
+        """Para cada ponto, o centro do frame de 10 ms mais silencioso dentro da tolerância."""
+        import numpy as np
+        
+        if len(points) == 0:
+            return points
+        
+        frames_each_side = int(self.tolerance * self.sample_rate / ENERGY_FRAME_SIZE)
+        n_frames = 2 * frames_each_side + 1
+        span = n_frames * ENERGY_FRAME_SIZE
+        
+        if len(audio) < span:
+            return points
+        
+        # Trechos de áudio em torno de cada ponto (deslocados para dentro do arquivo)
+        first_samples = (points * self.sample_rate).astype(np.int64) - span // 2
+        first_samples = np.clip(first_samples, 0, len(audio) - span)
+        windows = audio[first_samples[:, None] + np.arange(span)[None, :]]
+        
+        energy = np.square(windows).reshape(len(points), n_frames, ENERGY_FRAME_SIZE).mean(axis=2)
+        # Empates (ex.: silêncio digital) ficam com o frame mais próximo do ponto original
+        frame_centers = first_samples[:, None] + np.arange(n_frames) * ENERGY_FRAME_SIZE
+        distance = np.abs(frame_centers - (points * self.sample_rate)[:, None])
+        quietest = np.lexsort((distance, energy), axis=1)[:, 0]
+        
+        centers = first_samples + quietest * ENERGY_FRAME_SIZE + ENERGY_FRAME_SIZE // 2
+        return centers / self.sample_rate
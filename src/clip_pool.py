@@ -0,0 +1,129 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union, TYPE_CHECKING
+from config.settings import CLIP_POOL_MAX_READERS
+
+if TYPE_CHECKING:
+    from moviepy.editor import VideoFileClip
+
+
+class VideoReaderPool:
+    """
+    Pool limitado de leitores VideoFileClip, indexado pelo caminho do vídeo.
+    
+    Cada VideoFileClip mantém um subprocesso FFmpeg de leitura e seus buffers.
+    O pool reaproveita um único leitor por arquivo para todos os subclipes,
+    mantém no máximo max_readers abertos (fechando o menos usado) e fecha
+    todos de forma determinística em close_all().
+    
+    Subclipes compartilham o leitor do clipe pai: eles não devem ser fechados
+    individualmente nem usados depois que o pool liberar o arquivo.
+    """
+    
+    def __init__(self, max_readers: int = CLIP_POOL_MAX_READERS):
+        self.max_readers = max(1, max_readers)
+        self._readers: "OrderedDict[str, VideoFileClip]" = OrderedDict()
+        self._lock = threading.RLock()
+        
+        # Contadores
+        self.readers_opened = 0
+        self.readers_closed = 0
+        self.reuse_hits = 0
+        self.peak_open_readers = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close_all()
+    
+    def subclip(self, video_path: Union[str, Path], start_time: float, end_time: float) -> "VideoFileClip":
+        """
+        Retorna um subclipe servido pelo leitor compartilhado do arquivo.
+        
+        Args:
+            video_path: Caminho para o arquivo de vídeo
+            start_time: Tempo de início em segundos
+            end_time: Tempo de fim em segundos
+        
+        Returns:
+            VideoFileClip: Subclipe do intervalo pedido
+        """
+        with self._lock:
+            return self._acquire(video_path).subclip(start_time, end_time)
+    
+    def _acquire(self, video_path: Union[str, Path]) -> "VideoFileClip":
+        """Obtém (ou abre) o leitor do arquivo, respeitando o limite do pool."""
+        key = str(Path(video_path).resolve())
+        clip = self._readers.get(key)
+        
+        # Leitor fechado por fora (ex.: clip.close() em um derivado): reabrir
+        if clip is not None and getattr(clip, 'reader', None) is None:
+            self._close(key)
+            clip = None
+        
+        if clip is not None:
+            self._readers.move_to_end(key)
+            self.reuse_hits += 1
+            return clip
+        
+        while len(self._readers) >= self.max_readers:
+            oldest_key = next(iter(self._readers))
+            self._close(oldest_key)
+        
+        from moviepy.editor import VideoFileClip
+        
+        clip = VideoFileClip(key)
+        self._readers[key] = clip
+        self.readers_opened += 1
+        self.peak_open_readers = max(self.peak_open_readers, len(self._readers))
+        return clip
+    
+    def release(self, video_path: Union[str, Path]):
+        """Fecha o leitor de um arquivo específico, se estiver aberto."""
+        with self._lock:
+            key = str(Path(video_path).resolve())
+            if key in self._readers:
+                self._close(key)
+    
+    def close_all(self):
+        """Fecha todos os leitores abertos."""
+        with self._lock:
+            for key in list(self._readers):
+                self._close(key)
+    
+    def _close(self, key: str):
+        clip = self._readers.pop(key)
+        try:
+            clip.close()
+        except Exception as e:
+            print(f"Aviso: Erro ao fechar leitor de vídeo: {e}")
+        self.readers_closed += 1
+    
+    @property
+    def open_readers(self) -> int:
+        """Quantidade de leitores abertos no momento."""
+        return len(self._readers)
+    
+    @staticmethod
+    def open_file_handles() -> Optional[int]:
+        """Descritores de arquivo abertos pelo processo (None se indisponível)."""
+        for fd_dir in ("/proc/self/fd", "/dev/fd"):
+            try:
+                return len(os.listdir(fd_dir))
+            except OSError:
+                continue
+        return None
+    
+    def stats(self) -> Dict[str, Optional[int]]:
+        """Contadores do pool para diagnóstico."""
+        return {
+            'open_readers': self.open_readers,
+            'peak_open_readers': self.peak_open_readers,
+            'readers_opened': self.readers_opened,
+            'readers_closed': self.readers_closed,
+            'reuse_hits': self.reuse_hits,
+            'open_file_handles': self.open_file_handles(),
+        }
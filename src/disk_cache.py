@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+
+class DiskCache:
+    """
+    Cache persistente em disco (um arquivo JSON por chave) com despejo LRU por tamanho.
+    
+    Entradas mais antigas que ttl segundos (se definido) são tratadas como ausentes.
+    Com enabled=False o cache é ignorado: get sempre falha e set não grava nada.
+    
+    Com outro suffix, get_path/set_bytes guardam arquivos binários (ex.: PNG)
+    no lugar do JSON, com o mesmo despejo LRU.
+    """
+    
+    def __init__(self, cache_dir: Path, max_bytes: int, ttl: Optional[float] = None,
+                 enabled: bool = True, suffix: str = ".json"):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.suffix = suffix
+        
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Gera uma chave estável a partir de partes serializáveis em JSON."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=20).hexdigest()
+    
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Recupera um valor do cache.
+        
+        Args:
+            key: Chave gerada por make_key
+        
+        Returns:
+            O valor armazenado ou None se ausente/corrompido
+        """
+        if not self.enabled:
+            return None
+        
+        path = self._path_for(key)
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, json.JSONDecodeError):
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        
+        if not isinstance(entry, dict) or 'value' not in entry:
+            self.misses += 1
+            return None
+        
+        if self.ttl is not None and time.time() - entry.get('created_at', 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        
+        # Atualizar mtime marca a entrada como usada recentemente (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return entry['value']
+    
+    def set(self, key: str, value: Any):
+        """
+        Armazena um valor no cache e aplica o limite de tamanho.
+        
+        Args:
+            key: Chave gerada por make_key
+            value: Valor serializável em JSON
+        """
+        if not self.enabled:
+            return
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'created_at': time.time(), 'value': value}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f"Aviso: Erro ao gravar cache: {e}")
+            return
+        
+        self._evict()
+    
+    def get_path(self, key: str) -> Optional[Path]:
+        """
+        Caminho de um arquivo binário do cache, se existir (marcado como usado).
+        
+        Args:
+            key: Chave gerada por make_key
+        
+        Returns:
+            Path do arquivo ou None se ausente
+        """
+        if not self.enabled:
+            return None
+        
+        path = self._path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return path
+    
+    def set_bytes(self, key: str, data: bytes) -> Optional[Path]:
+        """
+        Armazena um arquivo binário no cache e aplica o limite de tamanho.
+        
+        Args:
+            key: Chave gerada por make_key
+            data: Conteúdo do arquivo
+        
+        Returns:
+            Path do arquivo gravado ou None se o cache estiver desativado ou falhar
+        """
+        if not self.enabled:
+            return None
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            print(f"Aviso: Erro ao gravar cache: {e}")
+            return None
+        
+        self._evict(keep=path)
+        return path
+    
+    def stats(self) -> dict:
+        """Contadores de acertos e falhas desde a criação."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+    
+    def _evict(self, keep: Optional[Path] = None):
+        """Remove as entradas menos usadas (exceto keep) até o cache caber em max_bytes."""
+        entries = []
+        total_size = 0
+        
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total_size -= size
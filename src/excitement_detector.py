@@ -0,0 +1,181 @@
+from typing import List, Dict, Any, TYPE_CHECKING
+from config.settings import ACOUSTIC_WINDOW_SECONDS, ACOUSTIC_TOP_K
+
+# numpy é importado sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000  # Mesma taxa do áudio decodificado pelo AudioProcessor
+FRAME_SIZE = 512  # Amostras por frame (32 ms a 16 kHz)
+BLOCK_FRAMES = 8192  # Frames processados por bloco de FFT (limita a memória)
+LAUGHTER_BAND = (1000.0, 4000.0)  # Faixa (Hz) onde risadas concentram energia
+ONSET_DB = 6.0  # Subida de volume (dB) entre frames que conta como ataque/sílaba
+SILENCE_DB = -50.0  # Frames abaixo disso não entram nas médias espectrais
+
+# Peso de cada característica no escore final
+FEATURE_WEIGHTS = {
+    'loudness_spike': 1.0,
+    'spectral_flux': 1.0,
+    'laughter_energy': 1.0,
+    'speech_rate_change': 0.5,
+}
+
+
+class ExcitementDetector:
+    """
+    Pré-filtro acústico: ranqueia janelas de áudio pela "agitação".
+    
+    Uma passada vetorizada em NumPy calcula, por frame, volume (RMS), fluxo
+    espectral, energia na faixa típica de risadas e ataques de volume (proxy
+    da velocidade da fala). Os valores são agregados por janela, normalizados
+    de forma robusta (mediana/MAD) e somados em um escore; as top-K janelas
+    viram candidatas para a análise com LLM.
+    """
+    
+    def __init__(self, window_seconds: float = ACOUSTIC_WINDOW_SECONDS, top_k: int = ACOUSTIC_TOP_K,
+                 sample_rate: int = SAMPLE_RATE):
+        self.window_seconds = window_seconds
+        self.top_k = top_k
+        self.sample_rate = sample_rate
+    
+    def frame_features(self, audio: "np.ndarray") -> Dict[str, "np.ndarray"]:
+        """
+        Calcula as características de cada frame de FRAME_SIZE amostras.
+        
+        A FFT é feita em blocos de BLOCK_FRAMES frames para que a memória não
+        cresça com a duração do áudio.
+        
+        Args:
+            audio: Amostras mono float32 em [-1, 1]
+        
+        Returns:
+            Dict: Arrays por frame (rms_db, flux, laughter, active)
+        """
+        import numpy as np
+        
+        n_frames = len(audio) // FRAME_SIZE
+        frames = audio[:n_frames * FRAME_SIZE].reshape(n_frames, FRAME_SIZE)
+        
+        freqs = np.fft.rfftfreq(FRAME_SIZE, 1.0 / self.sample_rate)
+        band = (freqs >= LAUGHTER_BAND[0]) & (freqs < LAUGHTER_BAND[1])
+        window = np.hanning(FRAME_SIZE).astype(np.float32)
+        
+        rms_db = np.empty(n_frames, np.float32)
+        flux = np.empty(n_frames, np.float32)
+        laughter = np.empty(n_frames, np.float32)
+        previous = None
+        
+        for block_start in range(0, n_frames, BLOCK_FRAMES):
+            block = frames[block_start:block_start + BLOCK_FRAMES]
+            block_slice = slice(block_start, block_start + len(block))
+            
+            rms = np.sqrt(np.mean(np.square(block, dtype=np.float32), axis=1))
+            rms_db[block_slice] = 20 * np.log10(rms + 1e-6)
+            
+            spectrum = np.abs(np.fft.rfft(block * window, axis=1)).astype(np.float32)
+            power = np.square(spectrum)
+            total_power = power.sum(axis=1) + 1e-12
+            laughter[block_slice] = power[:, band].sum(axis=1) / total_power
+            
+            # Fluxo espectral: aumento de magnitude entre frames consecutivos (normalizado)
+            shifted = np.vstack([spectrum[:1] if previous is None else previous, spectrum[:-1]])
+            increase = np.maximum(spectrum - shifted, 0).sum(axis=1)
+            flux[block_slice] = increase / (spectrum.sum(axis=1) + 1e-6)
+            previous = spectrum[-1:]
+        
+        return {
+            'rms_db': rms_db,
+            'flux': flux,
+            'laughter': laughter,
+            'active': rms_db > SILENCE_DB,
+        }
+    
+    def window_features(self, audio: "np.ndarray") -> Dict[str, "np.ndarray"]:
+        """
+        Agrega as características por janela de window_seconds.
+        
+        Args:
+            audio: Amostras mono float32 em [-1, 1]
+        
+        Returns:
+            Dict: Arrays por janela (loudness_spike, spectral_flux,
+                laughter_energy, speech_rate, speech_rate_change)
+        """
+        import numpy as np
+        
+        features = self.frame_features(audio)
+        n_frames = len(features['rms_db'])
+        frames_per_window = max(1, int(round(self.window_seconds * self.sample_rate / FRAME_SIZE)))
+        starts = np.arange(0, n_frames, frames_per_window)
+        counts = np.diff(np.append(starts, n_frames)).astype(np.float32)
+        
+        def window_mean(values: "np.ndarray", weights: "np.ndarray" = None) -> "np.ndarray":
+            if weights is None:
+                return np.add.reduceat(values, starts) / counts
+            weight_sum = np.add.reduceat(weights, starts)
+            return np.add.reduceat(values * weights, starts) / np.maximum(weight_sum, 1)
+        
+        rms_db = features['rms_db']
+        active = features['active'].astype(np.float32)
+        
+        # Pico de volume: quanto o trecho mais alto da janela supera a média dela
+        loudness_spike = np.maximum.reduceat(rms_db, starts) - window_mean(rms_db)
+        
+        # Ataques de volume por segundo aproximam a velocidade da fala
+        onsets = np.zeros(n_frames, np.float32)
+        onsets[1:] = (np.diff(rms_db) > ONSET_DB) & (rms_db[1:] > SILENCE_DB)
+        seconds = counts * FRAME_SIZE / self.sample_rate
+        speech_rate = np.add.reduceat(onsets, starts) / seconds
+        speech_rate_change = np.abs(np.diff(speech_rate, prepend=speech_rate[:1]))
+        
+        return {
+            'start': starts * FRAME_SIZE / self.sample_rate,
+            'end': (starts + counts) * FRAME_SIZE / self.sample_rate,
+            'loudness_spike': loudness_spike,
+            'spectral_flux': window_mean(features['flux'], active),
+            'laughter_energy': window_mean(features['laughter'], active),
+            'speech_rate': speech_rate,
+            'speech_rate_change': speech_rate_change,
+        }
+    
+    def detect(self, audio: "np.ndarray") -> List[Dict[str, Any]]:
+        """
+        Ranqueia as janelas do áudio e retorna as top-K candidatas.
+        
+        Args:
+            audio: Amostras mono float32 em [-1, 1]
+        
+        Returns:
+            List: Janelas {'start', 'end', 'score', 'features'} em ordem de escore
+        """
+        import numpy as np
+        
+        windows = self.window_features(audio)
+        n_windows = len(windows['start'])
+        if n_windows == 0:
+            return []
+        
+        score = np.zeros(n_windows, np.float32)
+        for name, weight in FEATURE_WEIGHTS.items():
+            score += weight * self._robust_zscore(windows[name])
+        
+        ranked = np.argsort(-score, kind='stable')[:self.top_k]
+        
+        candidates = []
+        for i in ranked:
+            candidates.append({
+                'start': float(windows['start'][i]),
+                'end': float(windows['end'][i]),
+                'score': float(score[i]),
+                'features': {name: float(windows[name][i]) for name in FEATURE_WEIGHTS},
+            })
+        
+        return candidates
+    
+    def _robust_zscore(self, values: "np.ndarray") -> "np.ndarray":
+        """Desvio em relação à mediana, em unidades de MAD (só acima, limitado a 10)."""
+        import numpy as np
+        
+        median = np.median(values)
+        mad = np.median(np.abs(values - median)) * 1.4826
+        return np.clip((values - median) / (mad + 1e-6), 0, 10)
@@ -0,0 +1,122 @@
+import subprocess
+from pathlib import Path
+from typing import Optional
+from config.settings import FFMPEG_PATH, SHORT_RESOLUTION
+from src import metrics
+from src.text_overlay import TextOverlayRenderer
+
+
+class FFmpegRenderer:
+    """
+    Renderiza shorts com um único comando FFmpeg, sem passar quadros pelo Python.
+    
+    O título é rasterizado pelo TextOverlayRenderer (um PNG em cache por
+    título) e aplicado com o filtro overlay, sem depender do drawtext.
+    """
+    
+    def __init__(self, target_resolution: tuple = SHORT_RESOLUTION,
+                 text_overlay: Optional[TextOverlayRenderer] = None):
+        self.target_resolution = target_resolution
+        self.text_overlay = text_overlay or TextOverlayRenderer()
+    
+    def build_filtergraph(self, with_title: bool = False, position: str = 'top') -> str:
+        """
+        Monta o filtergraph equivalente a resize_for_shorts + add_text_overlay.
+        
+        Args:
+            with_title: Se o PNG do título é a segunda entrada ([1:v])
+            position: Posição do texto ('top', 'bottom', 'center')
+        
+        Returns:
+            str: Filtergraph para -filter_complex, com a saída em [v]
+        """
+        target_w, target_h = self.target_resolution
+        
+        # Escalar para preencher a altura e cortar o centro se ficar mais largo que o alvo
+        filters = [
+            f"scale=-2:{target_h}",
+            f"crop='min(iw,{target_w})':{target_h}",
+            "setsar=1",
+        ]
+        
+        if not with_title:
+            return f"[0:v]{','.join(filters)}[v]"
+        
+        if position == 'top':
+            y = "50"
+        elif position == 'bottom':
+            y = "H-100"
+        else:  # center
+            y = "(H-h)/2"
+        
+        # O PNG tem um único quadro; o overlay o repete até o fim do vídeo
+        return f"[0:v]{','.join(filters)}[base];[base][1:v]overlay=x=(W-w)/2:y={y}[v]"
+    
+    def build_command(self, video_path: Path, start: float, duration: float, output_path: Path,
+                      title: Optional[str] = None, position: str = 'top',
+                      threads: Optional[int] = None) -> list:
+        """Monta o comando FFmpeg completo para um segmento."""
+        cmd = [
+            FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+            # Progresso em key=value no stdout (frame=N conta os quadros codificados)
+            "-progress", "pipe:1", "-nostats",
+            # -ss/-t antes de -i: busca no arquivo de entrada, sem decodificar o início
+            "-ss", f"{start:.3f}", "-t", f"{duration:.3f}",
+            "-i", str(video_path),
+        ]
+        
+        if title:
+            cmd += ["-i", str(self.text_overlay.overlay_path(title, self.target_resolution[0]))]
+        
+        cmd += [
+            "-filter_complex", self.build_filtergraph(bool(title), position),
+            "-map", "[v]", "-map", "0:a?",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            # Mesmos parâmetros de áudio do MoviePy, para que as partes possam ser concatenadas
+            "-c:a", "aac", "-ar", "44100", "-ac", "2",
+            "-movflags", "+faststart",
+        ]
+        
+        if threads:
+            cmd += ["-threads", str(threads)]
+        
+        cmd += ["-y", str(output_path)]
+        return cmd
+    
+    def render(self, video_path: Path, start: float, end: float, output_path: Path,
+               title: Optional[str] = None, position: str = 'top',
+               threads: Optional[int] = None) -> Path:
+        """
+        Renderiza um segmento do vídeo no formato de shorts.
+        
+        Args:
+            video_path: Caminho para o vídeo original
+            start: Tempo de início em segundos
+            end: Tempo de fim em segundos
+            output_path: Caminho do arquivo de saída
+            title: Texto sobreposto (opcional)
+            position: Posição do texto ('top', 'bottom', 'center')
+            threads: Limite de threads do FFmpeg (opcional)
+        
+        Returns:
+            Path: Caminho para o vídeo renderizado
+        """
+        cmd = self.build_command(
+            video_path, start, end - start, output_path, title, position, threads
+        )
+        
+        try:
+            result = subprocess.run(cmd, check=True, capture_output=True)
+            metrics.record('frames_encoded', self._encoded_frames(result.stdout))
+            return output_path
+        
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erro ao renderizar com FFmpeg: {e.stderr.decode(errors='replace')}")
+    
+    @staticmethod
+    def _encoded_frames(progress: bytes) -> int:
+        """Último valor de frame= na saída de -progress."""
+        for line in reversed(progress.decode(errors='replace').splitlines()):
+            if line.startswith("frame="):
+                return int(line.split("=", 1)[1])
+        return 0
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from config.settings import CHECKPOINT_HASH_MAX_BYTES
+from src.disk_cache import DiskCache
+
+
+class JobManifest:
+    """
+    Checkpoints das etapas de um job, gravados em <diretório do job>/manifest.json.
+    
+    Cada etapa concluída registra os artefatos que produziu (com impressão
+    digital), o hash da sua entrada e os parâmetros usados. Ao retomar, uma
+    etapa só é reaproveitada se a entrada e os parâmetros forem os mesmos e os
+    artefatos ainda estiverem intactos; a entrada de cada etapa é o
+    output_hash da anterior, então invalidar uma etapa invalida as seguintes.
+    """
+    
+    def __init__(self, job_dir: Path, job_id: str):
+        self.job_dir = Path(job_dir)
+        self.job_id = job_id
+        self.path = self.job_dir / "manifest.json"
+        self._lock = threading.Lock()
+        self.data = self._load()
+    
+    @staticmethod
+    def new_job_id() -> str:
+        """Identificador ordenável por data, único entre execuções simultâneas."""
+        return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    
+    @staticmethod
+    def fingerprint(path: Path) -> str:
+        """
+        Impressão digital de um arquivo.
+        
+        Arquivos de até CHECKPOINT_HASH_MAX_BYTES têm o conteúdo inteiro
+        hasheado; vídeos maiores usam tamanho + data de modificação, como o make.
+        """
+        path = Path(path)
+        stat = path.stat()
+        if stat.st_size > CHECKPOINT_HASH_MAX_BYTES:
+            return DiskCache.make_key(path.name, stat.st_size, stat.st_mtime_ns)
+        
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get('stages'), dict):
+                return data
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Aviso: manifest.json ilegível, o job recomeça do início: {e}")
+        
+        return {'job_id': self.job_id, 'created_at': time.time(), 'stages': {}}
+    
+    def _save(self):
+        """Grava o manifesto de forma atômica (um crash nunca deixa o arquivo pela metade)."""
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.data['updated_at'] = time.time()
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+    
+    def set_info(self, **info: Any):
+        """Registra dados do job (ex.: source, output_dir) usados por --resume."""
+        with self._lock:
+            if any(self.data.get(key) != value for key, value in info.items()):
+                self.data.update(info)
+                self._save()
+    
+    def restore(self, stage: str, input_hash: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o checkpoint da etapa se ele ainda for válido.
+        
+        Args:
+            stage: Nome da etapa
+            input_hash: Hash da entrada atual da etapa
+            params: Parâmetros atuais da etapa
+        
+        Returns:
+            dict: Registro da etapa (artifacts, data, output_hash) ou None
+        """
+        record = self.data['stages'].get(stage)
+        if not record or record['input_hash'] != input_hash:
+            return None
+        if record['params'] != json.loads(json.dumps(params, default=str)):
+            return None
+        
+        for artifact in record['artifacts']:
+            try:
+                if self.fingerprint(Path(artifact['path'])) != artifact['fingerprint']:
+                    return None
+            except OSError:
+                return None
+        
+        print(f"♻️  Etapa '{stage}' retomada do checkpoint")
+        return record
+    
+    def checkpoint(self, stage: str, artifacts: List[Path], input_hash: str,
+                   params: Dict[str, Any], data: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Registra a conclusão de uma etapa.
+        
+        Args:
+            stage: Nome da etapa
+            artifacts: Arquivos produzidos pela etapa
+            input_hash: Hash da entrada da etapa
+            params: Parâmetros que influenciam o resultado
+            data: Dados pequenos necessários para retomar (serializáveis em JSON)
+        
+        Returns:
+            dict: O registro gravado
+        """
+        fingerprints = [
+            {'path': str(Path(path).resolve()), 'fingerprint': self.fingerprint(path)}
+            for path in artifacts
+        ]
+        record = {
+            'input_hash': input_hash,
+            'params': json.loads(json.dumps(params, default=str)),
+            'artifacts': fingerprints,
+            'data': json.loads(json.dumps(data, default=str)),
+            'output_hash': DiskCache.make_key(stage, input_hash, fingerprints, data),
+            'completed_at': time.time(),
+        }
+        
+        with self._lock:
+            self.data['stages'][stage] = record
+            self._save()
+        return record
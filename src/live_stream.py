@@ -0,0 +1,324 @@
+import csv
+import time
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from config.settings import (
+    DATA_DIR, FFMPEG_PATH, MOMENT_OVERLAP_THRESHOLD, LIVE_SEGMENT_SECONDS, LIVE_WINDOW_SECONDS,
+    LIVE_ANALYSIS_INTERVAL, LIVE_CONTEXT_SECONDS, LIVE_POLL_INTERVAL
+)
+from src.transcript import Transcript
+
+if TYPE_CHECKING:
+    from src.audio_processor import AudioProcessor
+    from src.moment_identifier import MomentIdentifier
+    from src.video_editor import VideoEditor
+
+
+class LiveStreamProcessor:
+    """
+    Gera shorts enquanto a live ainda está acontecendo.
+    
+    O FFmpeg grava o stream em segmentos de LIVE_SEGMENT_SECONDS e anota cada
+    segmento fechado em uma lista CSV. Conforme os segmentos chegam, o áudio é
+    acumulado e transcrito a cada LIVE_WINDOW_SECONDS; a cada
+    LIVE_ANALYSIS_INTERVAL os últimos LIVE_CONTEXT_SECONDS de transcrição vão
+    ao LLM. Momentos novos são renderizados em segundo plano, a partir dos
+    segmentos que os cobrem, sem interromper a ingestão.
+    """
+    
+    def __init__(self, audio_processor: "AudioProcessor", moment_identifier: "MomentIdentifier",
+                 video_editor: "VideoEditor", live_dir: Optional[Path] = None,
+                 segment_seconds: float = LIVE_SEGMENT_SECONDS,
+                 window_seconds: float = LIVE_WINDOW_SECONDS,
+                 analysis_interval: float = LIVE_ANALYSIS_INTERVAL,
+                 context_seconds: float = LIVE_CONTEXT_SECONDS):
+        self.audio_processor = audio_processor
+        self.moment_identifier = moment_identifier
+        self.video_editor = video_editor
+        self.live_dir = live_dir or DATA_DIR / "live"
+        self.segment_seconds = segment_seconds
+        self.window_seconds = window_seconds
+        self.analysis_interval = analysis_interval
+        self.context_seconds = context_seconds
+        
+        self.segments: List[Dict[str, Any]] = []
+        self.transcript = Transcript()
+        self.moments: List[Dict[str, Any]] = []
+        self._audio_chunks: list = []
+        self._buffer_start = 0.0
+        self._stream_time = 0.0
+        self._last_analysis = 0.0
+        self._list_offset = 0
+        self._renders: List[Tuple[int, Future]] = []
+        self._render_executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def segment_list_path(self) -> Path:
+        return self.live_dir / "segments.csv"
+    
+    @property
+    def ingest_log_path(self) -> Path:
+        return self.live_dir / "ingest.log"
+    
+    def run(self, source: str, realtime: bool = False) -> List[Path]:
+        """
+        Processa a live até o stream terminar (ou Ctrl+C).
+        
+        Args:
+            source: URL/caminho que o FFmpeg consegue ler (ex.: playlist HLS)
+            realtime: Ler a entrada na velocidade nativa (-re), para simular
+                uma live a partir de um arquivo ou VOD
+        
+        Returns:
+            List[Path]: Shorts criados, na ordem em que os momentos surgiram
+        """
+        self._prepare_live_dir()
+        process = self._start_ingest(source, realtime)
+        self._render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-render")
+        print(f"🔴 Live: segmentos de {self.segment_seconds}s, transcrição a cada "
+              f"{self.window_seconds}s, análise a cada {self.analysis_interval}s")
+        
+        try:
+            while True:
+                new_segments = self._poll_segments()
+                for segment in new_segments:
+                    self._on_segment(segment)
+                
+                if not new_segments:
+                    if process.poll() is not None:
+                        # O último segmento é anotado quando o FFmpeg termina
+                        for segment in self._poll_segments():
+                            self._on_segment(segment)
+                        break
+                    time.sleep(LIVE_POLL_INTERVAL)
+            
+            if process.returncode:
+                print(f"Aviso: FFmpeg encerrou com código {process.returncode}: {self._ingest_log_tail()}")
+            
+            # Fim do stream: transcrever o que sobrou e fazer a última análise
+            self._transcribe_buffer()
+            self._analyze()
+        
+        except KeyboardInterrupt:
+            print("\n⏹️  Encerrando a live...")
+        
+        finally:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+            self._ingest_log.close()
+            self._render_executor.shutdown(wait=True)
+        
+        return self._collect_renders()
+    
+    def _prepare_live_dir(self):
+        """Cria o diretório da live e remove segmentos de uma execução anterior."""
+        self.live_dir.mkdir(parents=True, exist_ok=True)
+        for old_file in self.live_dir.glob("seg_*.ts"):
+            old_file.unlink()
+        self.segment_list_path.unlink(missing_ok=True)
+    
+    def _start_ingest(self, source: str, realtime: bool) -> subprocess.Popen:
+        """
+        Inicia o FFmpeg gravando o stream em segmentos MPEG-TS, sem recodificar.
+        
+        O stderr vai para ingest.log no diretório da live: um pipe que ninguém
+        lê enche em lives longas (reconexões, avisos de decodificação) e
+        bloquearia o FFmpeg.
+        """
+        cmd = [FFMPEG_PATH, "-nostdin", "-loglevel", "error"]
+        if realtime:
+            cmd.append("-re")
+        cmd += [
+            "-i", source,
+            "-map", "0:v:0?", "-map", "0:a:0",
+            "-c", "copy",
+            "-f", "segment",
+            "-segment_time", str(self.segment_seconds),
+            "-segment_format", "mpegts",
+            "-segment_list", str(self.segment_list_path),
+            "-segment_list_type", "csv",
+            "-reset_timestamps", "1",
+            str(self.live_dir / "seg_%05d.ts")
+        ]
+        self._ingest_log = open(self.ingest_log_path, 'wb')
+        return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=self._ingest_log)
+    
+    def _ingest_log_tail(self, max_bytes: int = 2000) -> str:
+        """Final do log do FFmpeg de ingestão."""
+        try:
+            with open(self.ingest_log_path, 'rb') as f:
+                f.seek(max(0, self.ingest_log_path.stat().st_size - max_bytes))
+                return f.read().decode(errors='replace').strip()
+        except OSError:
+            return ""
+    
+    def _poll_segments(self) -> List[Dict[str, Any]]:
+        """Lê as linhas novas da lista de segmentos (cada linha = segmento fechado)."""
+        if not self.segment_list_path.exists():
+            return []
+        
+        with open(self.segment_list_path, 'r', encoding='utf-8', newline='') as f:
+            f.seek(self._list_offset)
+            lines = []
+            while True:
+                line = f.readline()
+                # Linha sem quebra ainda está sendo escrita
+                if not line.endswith('\n'):
+                    break
+                lines.append(line)
+                self._list_offset = f.tell()
+        
+        arrived_at = time.time()
+        segments = []
+        for filename, start, end in csv.reader(lines):
+            segments.append({
+                'path': self.live_dir / filename,
+                'start': float(start),
+                'end': float(end),
+                'arrived_at': arrived_at,
+            })
+        return segments
+    
+    def _on_segment(self, segment: Dict[str, Any]):
+        """Acumula o áudio do segmento e dispara transcrição/análise quando for a hora."""
+        if not self._audio_chunks:
+            self._buffer_start = segment['start']
+        
+        self.segments.append(segment)
+        self._audio_chunks.append(self.audio_processor.load_audio(segment['path']))
+        self._stream_time = segment['end']
+        
+        if self._stream_time - self._buffer_start >= self.window_seconds:
+            self._transcribe_buffer()
+        
+        if self._stream_time - self._last_analysis >= self.analysis_interval:
+            self._analyze()
+    
+    def _transcribe_buffer(self):
+        """Transcreve o áudio acumulado e o anexa à transcrição da live."""
+        if not self._audio_chunks:
+            return
+        
+        import numpy as np
+        
+        audio = np.concatenate(self._audio_chunks)
+        self._audio_chunks = []
+        
+        result = self.audio_processor.transcribe_audio(audio)
+        window = self.audio_processor.format_transcription(result).shifted(self._buffer_start)
+        end = len(self.transcript)
+        self.transcript = self.transcript.replace_ranges([(end, end, window)])
+    
+    def _analyze(self):
+        """Analisa a janela deslizante mais recente e agenda a renderização dos momentos novos."""
+        transcribed_until = max(self.transcript.ends) if len(self.transcript) else 0.0
+        if transcribed_until <= self._last_analysis:
+            return
+        
+        context = self.transcript.range(max(0.0, transcribed_until - self.context_seconds), transcribed_until)
+        self._last_analysis = self._stream_time
+        if not context:
+            return
+        
+        try:
+            moments = self.moment_identifier.analyze_segments(context)
+        except Exception as e:
+            print(f"Aviso: Erro na análise da live: {e}")
+            return
+        
+        # Momentos que terminam depois do que já foi transcrito podem estar incompletos:
+        # a janela seguinte (sobreposta) os encontra novamente
+        new_moments = [
+            moment for moment in moments
+            if moment['end'] <= transcribed_until and not self._is_duplicate(moment)
+        ]
+        if not new_moments:
+            return
+        
+        refiner = self.moment_identifier.boundary_refiner
+        if refiner:
+            refiner.refine(new_moments, self.transcript)
+        
+        for moment in new_moments:
+            self.moments.append(moment)
+            index = len(self.moments)
+            covering = [
+                segment for segment in self.segments
+                if segment['start'] < moment['end'] and segment['end'] > moment['start']
+            ]
+            print(f"✨ Momento ao vivo {index}: {moment['title']} "
+                  f"({moment['start']:.0f}s-{moment['end']:.0f}s)")
+            future = self._render_executor.submit(self._render_moment, moment, covering, index)
+            self._renders.append((index, future))
+    
+    def _is_duplicate(self, moment: Dict[str, Any]) -> bool:
+        """Verifica se o momento já foi emitido por uma análise anterior."""
+        for kept in self.moments:
+            overlap = min(moment['end'], kept['end']) - max(moment['start'], kept['start'])
+            shortest = min(moment['duration'], kept['duration'])
+            if shortest > 0 and overlap / shortest >= MOMENT_OVERLAP_THRESHOLD:
+                return True
+        return False
+    
+    def _render_moment(self, moment: Dict[str, Any], covering: List[Dict[str, Any]], index: int) -> Tuple[Path, float]:
+        """
+        Junta os segmentos que cobrem o momento e renderiza o short.
+        
+        Returns:
+            tuple: (caminho_do_short, latência desde a chegada do último segmento)
+        """
+        source_path = self.live_dir / f"moment_{index:02d}_source.ts"
+        list_path = self.live_dir / f"moment_{index:02d}_concat.txt"
+        
+        try:
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for segment in covering:
+                    escaped = str(Path(segment['path']).resolve()).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            
+            cmd = [
+                FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", str(list_path),
+                "-c", "copy", "-y", str(source_path)
+            ]
+            subprocess.run(cmd, check=True, capture_output=True)
+            
+            offset = covering[0]['start']
+            local_moment = {
+                **{key: value for key, value in moment.items() if key != 'segments'},
+                'start': moment['start'] - offset,
+                'end': moment['end'] - offset,
+            }
+            short_path = self.video_editor.create_short_from_moment(
+                source_path, local_moment, f"live_short_{index:02d}.mp4"
+            )
+            return short_path, time.time() - covering[-1]['arrived_at']
+        
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erro ao juntar segmentos da live: {e.stderr.decode(errors='replace')}")
+        
+        finally:
+            list_path.unlink(missing_ok=True)
+            source_path.unlink(missing_ok=True)
+    
+    def _collect_renders(self) -> List[Path]:
+        """Aguarda as renderizações e mostra a latência de cada short."""
+        created = []
+        latencies = []
+        
+        for index, future in self._renders:
+            try:
+                short_path, latency = future.result()
+                created.append(short_path)
+                latencies.append(latency)
+                print(f"  🎬 {short_path.name}: pronto {latency:.1f}s após o fim do momento chegar")
+            except Exception as e:
+                print(f"Erro ao criar short ao vivo {index}: {e}")
+        
+        if latencies:
+            print(f"Latência média: {sum(latencies) / len(latencies):.1f}s "
+                  f"(máxima {max(latencies):.1f}s)")
+        return created
@@ -5,14 +5,16 @@ Versão simplificada para identificar momentos engraçados usando LLM
 """
 
 import argparse
+import json
 import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 
 # Adicionar o diretório pai ao path para imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-import os 
 from dotenv import load_dotenv
 
 # Carregar variáveis do arquivo .env
@@ -21,24 +23,107 @@ load_dotenv()
 from src.video_ingestion import VideoIngestion
 from src.audio_processor import AudioProcessor
 from src.moment_identifier import MomentIdentifier
+from src.excitement_detector import ExcitementDetector
 from src.video_editor import VideoEditor
-from config.settings import OUTPUT_DIR, DATA_DIR
+from src.job_manifest import JobManifest
+from src import metrics
+from src.transcript import Transcript
+from config.settings import (
+    OUTPUT_DIR, JOBS_DIR, LLM_MODEL, SECTION_PADDING, SAVE_EXTRACTED_AUDIO, USE_TRANSCRIPTION_CACHE, USE_LLM_CACHE,
+    ACOUSTIC_PREFILTER, ACOUSTIC_MIN_DURATION, ACOUSTIC_CONTEXT_SECONDS, USE_VAD, TWO_PASS_TRANSCRIPTION, AUDIO_FIRST_DOWNLOAD,
+    METRICS_PROFILE,
+    ensure_directories
+)
 
 
 class ShortsGenerator:
-    """Classe principal que orquestra todo o processo de geração de shorts."""
+    """
+    Classe principal que orquestra todo o processo de geração de shorts.
     
-    def __init__(self):
+    Cada instância é um job: os arquivos intermediários ficam em
+    JOBS_DIR/<job_id> (junto com o manifest.json dos checkpoints) e os shorts em
+    OUTPUT_DIR/<job_id>, então execuções simultâneas não se misturam. Criar o
+    gerador com o job_id de uma execução interrompida retoma generate_shorts
+    a partir da última etapa concluída.
+    """
+    
+    def __init__(self, save_audio: bool = SAVE_EXTRACTED_AUDIO,
+                 use_cache: bool = USE_TRANSCRIPTION_CACHE,
+                 use_llm_cache: bool = USE_LLM_CACHE,
+                 use_prefilter: bool = ACOUSTIC_PREFILTER,
+                 use_vad: bool = USE_VAD,
+                 two_pass: bool = TWO_PASS_TRANSCRIPTION,
+                 audio_first: bool = AUDIO_FIRST_DOWNLOAD,
+                 job_id: Optional[str] = None,
+                 data_dir: Optional[Path] = None,
+                 output_dir: Optional[Path] = None,
+                 models: Optional[Dict[str, Any]] = None,
+                 stage_limits: Optional[Dict[str, Any]] = None,
+                 on_stage: Optional[Callable[[str], None]] = None,
+                 profile: Optional[str] = METRICS_PROFILE):
+        ensure_directories()
+        self.use_prefilter = use_prefilter
+        self.audio_first = audio_first
+        self.job_id = job_id or JobManifest.new_job_id()
+        self.data_dir = Path(data_dir) if data_dir else JOBS_DIR / self.job_id
+        self.output_dir = Path(output_dir) if output_dir else OUTPUT_DIR / self.job_id
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Modo serviço: limites de concorrência por etapa e acompanhamento do job
+        self.stage_limits = stage_limits or {}
+        self.on_stage = on_stage
+        self.manifest = JobManifest(self.data_dir, self.job_id)
+        self.metrics = metrics.RunMetrics(self.job_id, profile=profile, profile_dir=self.data_dir / "profiles")
+        
+        # Os componentes só importam whisper/moviepy/openai/yt-dlp no primeiro uso
         self.video_ingestion = VideoIngestion()
-        self.audio_processor = AudioProcessor()
-        self.moment_identifier = MomentIdentifier()
+        self.audio_processor = AudioProcessor(
+            save_audio=save_audio, use_cache=use_cache, use_vad=use_vad, two_pass=two_pass,
+            models=models
+        )
+        self.moment_identifier = MomentIdentifier(use_cache=use_llm_cache)
+        self.excitement_detector = ExcitementDetector()
         self.video_editor = VideoEditor()
+        
+        for component in (self.video_ingestion, self.audio_processor,
+                          self.moment_identifier, self.video_editor):
+            component.data_dir = self.data_dir
+        self.video_editor.output_dir = self.output_dir
+    
+    @contextmanager
+    def _stage(self, name: str):
+        """
+        Delimita uma etapa do processamento: ingest, asr, llm ou render.
+        
+        No modo serviço, stage_limits limita quantos jobs executam a etapa ao
+        mesmo tempo e on_stage acompanha o progresso (e pode cancelar o job
+        levantando uma exceção antes de a etapa começar). O tempo, os recursos
+        e os contadores da etapa vão para self.metrics.
+        """
+        limit = self.stage_limits.get(name)
+        waited = time.perf_counter()
+        if limit is not None:
+            limit.acquire()
+        try:
+            if self.on_stage:
+                self.on_stage(name)
+            with self.metrics.stage(name):
+                if limit is not None:
+                    metrics.record('queue_wait_seconds', time.perf_counter() - waited)
+                yield
+        finally:
+            if limit is not None:
+                limit.release()
     
     def generate_shorts(self, source: str, create_individual: bool = True, 
                        create_compilation: bool = True) -> list[Path]:
         """
         Método principal para gerar shorts a partir de uma fonte de vídeo.
         
+        Cada etapa concluída é registrada no manifesto do job; etapas com
+        checkpoint válido (mesma entrada, mesmos parâmetros, artefatos intactos)
+        não são executadas de novo.
+        
         Args:
             source: URL ou caminho para arquivo de vídeo
             create_individual: Se deve criar shorts individuais
@@ -50,25 +135,91 @@ class ShortsGenerator:
         try:
             print("🎬 Iniciando geração de shorts...")
             print(f"📹 Fonte: {source}")
+            print(f"🗂️  Job: {self.job_id} ({self.data_dir})")
+            self.manifest.set_info(source=source, output_dir=str(self.output_dir))
             
-            # 1. Ingestão de vídeo
+            # 1. Ingestão de vídeo (com --audio-first, só o áudio; o vídeo vem na etapa 4)
+            audio_first = self.audio_first and self.video_ingestion.is_url(source)
             print("\n📥 Etapa 1: Processando vídeo...")
-            video_path, video_info = self.video_ingestion.ingest_video(source)
+            ingest_params = {'audio_first': audio_first}
+            source_hash = self._source_hash(source)
+            ingested = self.manifest.restore("ingest", source_hash, ingest_params)
+            if ingested:
+                video_path, video_info = Path(ingested['artifacts'][0]['path']), ingested['data']
+            else:
+                with self._stage("ingest"):
+                    if audio_first:
+                        video_path, video_info = self.video_ingestion.ingest_audio(source)
+                    else:
+                        video_path, video_info = self.video_ingestion.ingest_video(source)
+                ingested = self.manifest.checkpoint(
+                    "ingest", [video_path], source_hash, ingest_params, data=video_info
+                )
             
             # Verificar duração do vídeo
             if video_info['duration'] > 7200:  # 2 horas
                 print("⚠️  Aviso: Vídeo muito longo. Considere usar um segmento menor.")
             
-            # 2. Processamento de áudio e transcrição
-            print("\n🎵 Etapa 2: Extraindo áudio e gerando transcrição...")
-            segments, transcription_file = self.audio_processor.process_audio(video_path)
-            
-            if not segments:
-                raise Exception("Não foi possível gerar transcrição do áudio")
+            # 2 e 3. Transcrição e análise (a análise inclui o refinamento da transcrição)
+            transcribe_params = {
+                'model': self.audio_processor.discovery_model_name,
+                'vad': self.audio_processor.vad is not None,
+            }
+            analyze_params = {
+                'llm_model': LLM_MODEL,
+                'prefilter': self.use_prefilter,
+                'refine_model': self.audio_processor.draft_model_name and self.audio_processor.model_name,
+                'refine_boundaries': self.moment_identifier.boundary_refiner is not None,
+            }
+            transcribed = self.manifest.restore("transcribe", ingested['output_hash'], transcribe_params)
+            analyzed = transcribed and self.manifest.restore(
+                "analyze", transcribed['output_hash'], analyze_params
+            )
+            # Shorts de uma execução interrompida só valem para os mesmos momentos
+            moments_restored = bool(analyzed)
             
-            # 3. Identificação de momentos engraçados
-            print("\n🤖 Etapa 3: Identificando momentos engraçados com IA...")
-            funny_moments = self.moment_identifier.identify_moments(segments)
+            if analyzed:
+                segments = Transcript.from_dict(self._read_json(Path(analyzed['artifacts'][1]['path'])))
+                funny_moments = self.moment_identifier.load_analysis_results(
+                    segments, Path(analyzed['artifacts'][0]['path'])
+                )
+            else:
+                print("\n🎵 Etapa 2: Extraindo áudio e gerando transcrição...")
+                with self._stage("asr"):
+                    audio = self.audio_processor.prepare_audio(video_path)
+                    if transcribed:
+                        segments = Transcript.from_dict(self._read_json(Path(transcribed['artifacts'][0]['path'])))
+                    else:
+                        segments, transcription_file = self.audio_processor.process_audio(video_path, audio)
+                    
+                    if not segments:
+                        raise Exception("Não foi possível gerar transcrição do áudio")
+                    
+                    if not transcribed:
+                        transcript_path = self._write_json("transcript.json", segments.to_dict())
+                        transcribed = self.manifest.checkpoint(
+                            "transcribe", [transcript_path], ingested['output_hash'], transcribe_params
+                        )
+                    
+                    # Pré-filtro acústico: janelas mais agitadas do áudio (só em áudios longos)
+                    candidate_windows = self._detect_candidate_windows(audio)
+                
+                # 3. Identificação de momentos engraçados
+                print("\n🤖 Etapa 3: Identificando momentos engraçados com IA...")
+                with self._stage("llm"):
+                    funny_moments = self.moment_identifier.analyze_segments(segments, candidate_windows)
+                
+                # Segunda passada: modelo preciso só nos trechos escolhidos (se houver rascunho)
+                with self._stage("asr"):
+                    segments = self.audio_processor.refine_transcript(audio, segments, funny_moments)
+                funny_moments = self.moment_identifier.finalize_moments(funny_moments, segments, audio)
+                del audio
+                
+                final_transcript_path = self._write_json("transcript_final.json", segments.to_dict())
+                analyzed = self.manifest.checkpoint(
+                    "analyze", [self.moment_identifier.analysis_path, final_transcript_path],
+                    transcribed['output_hash'], analyze_params
+                )
             
             if not funny_moments:
                 print("❌ Nenhum momento engraçado foi identificado.")
@@ -83,13 +234,37 @@ class ShortsGenerator:
             
             # 4. Criação dos shorts
             print("\n✂️  Etapa 4: Criando shorts...")
-            created_shorts = self.video_editor.create_shorts(
-                video_path, funny_moments, create_individual, create_compilation
-            )
+            render_input = analyzed
+            if audio_first:
+                # Os shorts são lidos dos trechos baixados (source_path), não de video_path
+                render_input = self._download_sections(source, funny_moments, analyzed)
+            
+            render_params = {
+                'individual': create_individual,
+                'compilation': create_compilation,
+                'backend': self.video_editor.render_backend,
+            }
+            rendered = self.manifest.restore("render", render_input['output_hash'], render_params)
+            if rendered:
+                created_shorts = [Path(artifact['path']) for artifact in rendered['artifacts']]
+            else:
+                with self._stage("render"):
+                    created_shorts = self.video_editor.create_shorts(
+                        video_path, funny_moments, create_individual, create_compilation,
+                        resume=moments_restored
+                    )
+                
+                # Com algum short faltando a etapa fica em aberto: --resume renderiza só os que faltam
+                expected = self.video_editor.expected_shorts(funny_moments, create_individual, create_compilation)
+                if len(created_shorts) == expected:
+                    self.manifest.checkpoint("render", created_shorts, render_input['output_hash'], render_params)
+                else:
+                    print(f"⚠️  {expected - len(created_shorts)} de {expected} shorts falharam; "
+                          f"retome com: python src/main.py --resume {self.job_id}")
             
             # Resultados finais
             print(f"\n🎉 Processo concluído!")
-            print(f"📁 Shorts criados em: {OUTPUT_DIR}")
+            print(f"📁 Shorts criados em: {self.output_dir}")
             print(f"📊 Total de shorts: {len(created_shorts)}")
             
             for short_path in created_shorts:
@@ -100,18 +275,162 @@ class ShortsGenerator:
         except Exception as e:
             print(f"\n❌ Erro durante o processamento: {str(e)}")
             raise
+        
+        finally:
+            self._write_metrics()
+    
+    def _download_sections(self, source: str, moments: list, analyzed: Dict[str, Any]) -> Dict[str, Any]:
+        """Baixa os trechos dos momentos (--audio-first) ou os retoma do checkpoint."""
+        params = {'padding': SECTION_PADDING}
+        sections = self.manifest.restore("sections", analyzed['output_hash'], params)
+        
+        if sections:
+            for moment, (source_path, source_offset) in zip(moments, sections['data']):
+                moment['source_path'] = source_path
+                moment['source_offset'] = source_offset
+            return sections
+        
+        with self._stage("ingest"):
+            self.video_ingestion.download_sections(source, moments, padding=SECTION_PADDING)
+        
+        section_files = list(dict.fromkeys(Path(moment['source_path']) for moment in moments))
+        placements = [[str(moment['source_path']), moment['source_offset']] for moment in moments]
+        return self.manifest.checkpoint("sections", section_files, analyzed['output_hash'], params, data=placements)
+    
+    def _source_hash(self, source: str) -> str:
+        """Hash da fonte: a URL, ou a impressão digital do arquivo local."""
+        path = Path(source)
+        if not self.video_ingestion.is_url(source) and path.is_file():
+            return JobManifest.fingerprint(path)
+        return source
+    
+    def _write_json(self, filename: str, data: Any) -> Path:
+        """Grava um artefato JSON no diretório do job."""
+        path = self.data_dir / filename
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+    
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def generate_shorts_pipelined(self, source: str, create_individual: bool = True,
+                                  create_compilation: bool = True) -> list[Path]:
+        """
+        Variante de generate_shorts com as etapas sobrepostas (ver ShortsPipeline).
+        
+        A transcrição começa nos primeiros chunks decodificados, o LLM analisa
+        cada janela assim que ela é transcrita e a renderização começa no
+        primeiro momento confirmado.
+        
+        Args:
+            source: URL ou caminho para arquivo de vídeo
+            create_individual: Se deve criar shorts individuais
+            create_compilation: Se deve criar short de compilação
+            
+        Returns:
+            List[Path]: Lista de caminhos para os shorts criados
+        """
+        from src.pipeline import ShortsPipeline
+        
+        print("🎬 Iniciando geração de shorts (pipeline)...")
+        print(f"📹 Fonte: {source}")
+        
+        try:
+            created_shorts = ShortsPipeline(self).run(source, create_individual, create_compilation)
+        except Exception as e:
+            print(f"\n❌ Erro durante o processamento: {str(e)}")
+            raise
+        finally:
+            self._write_metrics()
+        
+        print(f"\n🎉 Processo concluído!")
+        print(f"📁 Shorts criados em: {self.output_dir}")
+        print(f"📊 Total de shorts: {len(created_shorts)}")
+        return created_shorts
+    
+    def generate_live_shorts(self, source: str, realtime: bool = False) -> list[Path]:
+        """
+        Gera shorts enquanto a live acontece (transcrição e análise incrementais).
+        
+        Args:
+            source: URL da live, playlist HLS ou arquivo
+            realtime: Ler a entrada na velocidade nativa (simular live com um arquivo)
+            
+        Returns:
+            List[Path]: Lista de caminhos para os shorts criados
+        """
+        from src.live_stream import LiveStreamProcessor
+        
+        print("🎬 Iniciando geração de shorts ao vivo...")
+        print(f"📹 Fonte: {source}")
+        
+        stream_url = self.video_ingestion.resolve_stream_url(source)
+        live = LiveStreamProcessor(
+            self.audio_processor, self.moment_identifier, self.video_editor,
+            live_dir=self.data_dir / "live"
+        )
+        
+        try:
+            created_shorts = live.run(stream_url, realtime=realtime)
+        finally:
+            self.video_editor.close()
+            self._write_metrics()
+        
+        print(f"\n🎉 Live encerrada! {len(created_shorts)} shorts em: {self.output_dir}")
+        return created_shorts
+    
+    def _write_metrics(self):
+        """Mostra o resumo das métricas e grava metrics.json/metrics.prom no diretório do job."""
+        try:
+            self.metrics.print_summary()
+            report_path = self.metrics.write(self.data_dir)
+            print(f"📈 Relatório de métricas: {report_path}")
+        except Exception as e:
+            print(f"Aviso: Erro ao gravar métricas: {e}")
+    
+    def _detect_candidate_windows(self, audio) -> Optional[list]:
+        """Ranqueia janelas pelo áudio quando o pré-filtro se aplica; senão None."""
+        duration = len(audio) / self.excitement_detector.sample_rate
+        if not self.use_prefilter or duration < ACOUSTIC_MIN_DURATION:
+            return None
+        
+        candidates = self.excitement_detector.detect(audio)
+        print(f"Pré-filtro acústico: {len(candidates)} janelas candidatas de "
+              f"{self.excitement_detector.window_seconds}s")
+        
+        # Mesmo recorte que o MomentIdentifier envia ao LLM (janelas + contexto)
+        covered, reach = 0.0, 0.0
+        for c in sorted(candidates, key=lambda c: c['start']):
+            start = max(reach, c['start'] - ACOUSTIC_CONTEXT_SECONDS)
+            end = min(duration, c['end'] + ACOUSTIC_CONTEXT_SECONDS)
+            if end > start:
+                covered += end - start
+                reach = end
+        skipped = duration - covered
+        print(f"⚠️  AVISO: o pré-filtro acústico descarta {skipped / 60:.1f} min de {duration / 60:.1f} min "
+              f"({skipped / duration:.0%} do áudio) sem análise do LLM; "
+              f"momentos em trechos calmos não serão encontrados")
+        return candidates
     
     def cleanup_temp_files(self):
         """Remove arquivos temporários."""
         try:
             temp_files = [
-                DATA_DIR / "downloaded_video.*",
-                DATA_DIR / "input_video.*",
-                DATA_DIR / "extracted_audio.wav",
+                "downloaded_video.*",
+                "downloaded_audio.*",
+                "section_*.*",
+                "input_video.*",
             ]
             
+            # O WAV só existe quando pedido explicitamente; nesse caso é mantido
+            if not self.audio_processor.save_audio:
+                temp_files.append("extracted_audio.wav")
+            
             for pattern in temp_files:
-                for file_path in DATA_DIR.glob(pattern.name):
+                for file_path in self.data_dir.glob(pattern):
                     if file_path.exists():
                         file_path.unlink()
                         print(f"🗑️  Removido: {file_path.name}")
@@ -128,7 +447,8 @@ def main():
     
     parser.add_argument(
         "source",
-        help="URL do vídeo/live ou caminho para arquivo local"
+        nargs="?",
+        help="URL do vídeo/live ou caminho para arquivo local (opcional com --resume)"
     )
     
     parser.add_argument(
@@ -149,19 +469,105 @@ def main():
         help="Manter arquivos temporários"
     )
     
+    parser.add_argument(
+        "--save-audio",
+        action="store_true",
+        help="Gravar o áudio extraído em data/jobs/<id>/extracted_audio.wav"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignorar o cache de transcrições e transcrever novamente"
+    )
+    
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignorar o cache de respostas do LLM e consultar a API novamente"
+    )
+    
+    parser.add_argument(
+        "--prefilter",
+        action="store_true",
+        help=f"Em áudios a partir de {ACOUSTIC_MIN_DURATION // 60} min, enviar ao LLM só as janelas "
+             "mais agitadas (trechos calmos são ignorados)"
+    )
+    
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Transcrever o áudio inteiro, sem pular trechos sem voz"
+    )
+    
+    parser.add_argument(
+        "--two-pass",
+        action="store_true",
+        help="Transcrever a live inteira com WHISPER_DRAFT_MODEL (rápido) e só os momentos "
+             "escolhidos com WHISPER_MODEL; a descoberta fica com a qualidade do rascunho"
+    )
+    
+    parser.add_argument(
+        "--audio-first",
+        action="store_true",
+        help="Para URLs, baixar só o áudio e depois apenas os trechos de vídeo dos momentos"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Sobrepor download, transcrição, análise e renderização (filas entre as etapas)"
+    )
+    
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Modo live: transcrever, analisar e renderizar enquanto o stream acontece"
+    )
+    
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="No modo live, ler a fonte na velocidade nativa (simular live com um arquivo)"
+    )
+    
     parser.add_argument(
         "--output-dir",
         type=str,
-        help="Diretório de saída personalizado"
+        help="Diretório de saída personalizado (padrão: output/<job>)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "pyspy"],
+        default=METRICS_PROFILE,
+        help="Perfilar cada etapa (arquivos em data/jobs/<id>/profiles)"
+    )
+    
+    parser.add_argument(
+        "--job-id",
+        help="Identificador do job (diretório data/jobs/<id>); gerado automaticamente se omitido"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        metavar="JOB_ID",
+        help="Retomar um job interrompido a partir da última etapa concluída"
     )
     
     args = parser.parse_args()
     
-    # Configurar diretório de saída personalizado
-    if args.output_dir:
-        global OUTPUT_DIR
-        OUTPUT_DIR = Path(args.output_dir)
-        OUTPUT_DIR.mkdir(exist_ok=True)
+    job_id = args.resume or args.job_id
+    source = args.source
+    output_dir = args.output_dir
+    if args.resume:
+        manifest = JobManifest(JOBS_DIR / args.resume, args.resume)
+        if not manifest.exists:
+            parser.error(f"job não encontrado: {JOBS_DIR / args.resume}")
+        source = source or manifest.data.get('source')
+        output_dir = output_dir or manifest.data.get('output_dir')
+    if not source:
+        parser.error("informe a fonte do vídeo (ou --resume com um job existente)")
     
     # Verificar se as chaves de API estão configuradas
     from config.settings import OPENAI_API_KEY
@@ -171,32 +577,56 @@ def main():
         sys.exit(1)
     
     # Criar instância do gerador
-    generator = ShortsGenerator()
+    generator = ShortsGenerator(
+        save_audio=args.save_audio or SAVE_EXTRACTED_AUDIO,
+        use_cache=USE_TRANSCRIPTION_CACHE and not args.no_cache,
+        use_llm_cache=USE_LLM_CACHE and not args.no_llm_cache,
+        use_prefilter=ACOUSTIC_PREFILTER or args.prefilter,
+        use_vad=USE_VAD and not args.no_vad,
+        two_pass=TWO_PASS_TRANSCRIPTION or args.two_pass,
+        audio_first=AUDIO_FIRST_DOWNLOAD or args.audio_first,
+        job_id=job_id,
+        output_dir=Path(output_dir) if output_dir else None,
+        profile=args.profile
+    )
+    succeeded = False
     
     try:
         # Gerar shorts
-        created_shorts = generator.generate_shorts(
-            source=args.source,
-            create_individual=not args.no_individual,
-            create_compilation=not args.no_compilation
-        )
+        if args.live:
+            created_shorts = generator.generate_live_shorts(source, realtime=args.realtime)
+        elif args.pipeline:
+            created_shorts = generator.generate_shorts_pipelined(
+                source=source,
+                create_individual=not args.no_individual,
+                create_compilation=not args.no_compilation
+            )
+        else:
+            created_shorts = generator.generate_shorts(
+                source=source,
+                create_individual=not args.no_individual,
+                create_compilation=not args.no_compilation
+            )
         
         if created_shorts:
             print(f"\n✅ Sucesso! {len(created_shorts)} shorts criados.")
         else:
             print("\n⚠️  Nenhum short foi criado.")
+        succeeded = True
             
     except KeyboardInterrupt:
         print("\n⏹️  Processo interrompido pelo usuário.")
+        print(f"💡 Para continuar: python src/main.py --resume {generator.job_id}")
         sys.exit(1)
         
     except Exception as e:
         print(f"\n💥 Erro fatal: {str(e)}")
+        print(f"💡 Para continuar: python src/main.py --resume {generator.job_id}")
         sys.exit(1)
         
     finally:
-        # Limpar arquivos temporários
-        if not args.keep_temp:
+        # Limpar arquivos temporários (após uma falha, eles permitem retomar o job)
+        if succeeded and not args.keep_temp:
             generator.cleanup_temp_files()
 
 
@@ -0,0 +1,335 @@
+import json
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+from config.settings import METRICS_PROFILE
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Contadores da etapa em andamento; cada thread/tarefa asyncio enxerga a sua
+_active_counters: ContextVar[Optional["_Counters"]] = ContextVar("shorts_metrics_counters", default=None)
+
+# Bytes por bloco de ru_inblock/ru_oublock
+BLOCK_SIZE = 512
+
+
+class _Counters:
+    """Contadores nomeados (tokens, quadros, segundos de áudio...) de uma etapa."""
+    
+    def __init__(self):
+        self.values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, value: float):
+        with self._lock:
+            self.values[name] = self.values.get(name, 0.0) + value
+
+
+def record(name: str, value: float = 1.0):
+    """
+    Soma value ao contador name da etapa em andamento.
+    
+    Fora de uma etapa medida (ou sem RunMetrics) não faz nada, então os
+    componentes podem registrar contadores sem depender do orquestrador.
+    """
+    counters = _active_counters.get()
+    if counters is not None:
+        counters.add(name, value)
+
+
+@contextmanager
+def capture() -> Iterator[Dict[str, float]]:
+    """
+    Coleta os contadores registrados no bloco em um dicionário.
+    
+    Usado em processos do pool, onde a etapa do processo principal não é
+    visível: o dicionário volta junto com o resultado e é somado com merge().
+    """
+    counters = _Counters()
+    token = _active_counters.set(counters)
+    try:
+        yield counters.values
+    finally:
+        _active_counters.reset(token)
+
+
+def merge(counters: Dict[str, float]):
+    """Soma à etapa em andamento contadores coletados por capture()."""
+    for name, value in counters.items():
+        record(name, value)
+
+
+def _resource_snapshot() -> Dict[str, float]:
+    """CPU, memória e E/S do processo (e dos filhos já finalizados, como o FFmpeg)."""
+    snapshot = {'cpu_seconds': time.process_time()}
+    
+    if resource:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        snapshot.update({
+            'child_cpu_seconds': children.ru_utime + children.ru_stime,
+            'child_read_bytes': children.ru_inblock * BLOCK_SIZE,
+            'child_write_bytes': children.ru_oublock * BLOCK_SIZE,
+            # ru_maxrss em KB no Linux
+            'peak_rss_mb': own.ru_maxrss / 1024,
+            'child_peak_rss_mb': children.ru_maxrss / 1024,
+        })
+    
+    try:
+        with open("/proc/self/io", 'r') as f:
+            io = dict(line.split(": ") for line in f.read().splitlines())
+        snapshot['read_bytes'] = float(io['rchar'])
+        snapshot['write_bytes'] = float(io['wchar'])
+    except (OSError, KeyError, ValueError):
+        pass
+    
+    return snapshot
+
+
+class StageMetrics:
+    """Totais de uma etapa (somados entre todas as vezes em que ela executou)."""
+    
+    # Medidas acumuladas como diferença entre o fim e o início de cada execução
+    DELTAS = ('cpu_seconds', 'child_cpu_seconds', 'read_bytes', 'write_bytes',
+              'child_read_bytes', 'child_write_bytes')
+    # Medidas que são picos do processo (o maior valor visto ao fim da etapa)
+    PEAKS = ('peak_rss_mb', 'child_peak_rss_mb')
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.resources: Dict[str, float] = {}
+        self.counters = _Counters()
+    
+    def add_run(self, wall_seconds: float, before: Dict[str, float], after: Dict[str, float]):
+        self.calls += 1
+        self.wall_seconds += wall_seconds
+        for key in self.DELTAS:
+            if key in after:
+                self.resources[key] = self.resources.get(key, 0.0) + after[key] - before[key]
+        for key in self.PEAKS:
+            if key in after:
+                self.resources[key] = max(self.resources.get(key, 0.0), after[key])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Totais da etapa mais as taxas derivadas dos contadores."""
+        counters = dict(self.counters.values)
+        data = {
+            'calls': self.calls,
+            'wall_seconds': self.wall_seconds,
+            **self.resources,
+            'counters': counters,
+        }
+        
+        if counters.get('audio_seconds') and 'transcription_seconds' in counters:
+            data['real_time_factor'] = counters['transcription_seconds'] / counters['audio_seconds']
+        if counters.get('frames_encoded') and self.wall_seconds:
+            data['fps'] = counters['frames_encoded'] / self.wall_seconds
+        if counters.get('llm_requests'):
+            data['llm_latency_avg_seconds'] = counters.get('llm_latency_seconds', 0.0) / counters['llm_requests']
+        return data
+
+
+class RunMetrics:
+    """
+    Instrumentação de uma execução (job): tempo, recursos e contadores por etapa.
+    
+    O relatório vai para metrics.json e, no formato texto do Prometheus
+    (textfile collector do node_exporter), para metrics.prom. Com profile
+    ('cprofile' ou 'pyspy'), cada etapa também é perfilada em
+    <profile_dir>/<etapa>_<n>.prof / .speedscope.json.
+    
+    O tempo de CPU é do processo inteiro: no modo pipeline, etapas que se
+    sobrepõem dividem a mesma CPU e a soma passa do total da execução.
+    """
+    
+    def __init__(self, run_id: str, profile: Optional[str] = METRICS_PROFILE,
+                 profile_dir: Optional[Path] = None):
+        self.run_id = run_id
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Mede o bloco como uma execução da etapa name."""
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics(name))
+        
+        stop_profiler = self._start_profiler(name, stage.calls + 1)
+        token = _active_counters.set(stage.counters)
+        before = _resource_snapshot()
+        started = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            wall = time.perf_counter() - started
+            after = _resource_snapshot()
+            _active_counters.reset(token)
+            with self._lock:
+                stage.add_run(wall, before, after)
+            stop_profiler()
+    
+    def _start_profiler(self, name: str, call: int) -> Callable[[], None]:
+        """Inicia o profiler da etapa (se pedido) e retorna a função que o encerra."""
+        if not self.profile or not self.profile_dir:
+            return lambda: None
+        
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        output = self.profile_dir / f"{name}_{call}"
+        
+        if self.profile == "cprofile":
+            import cProfile
+            
+            # Perfila a thread que executa a etapa (abrir com pstats ou snakeviz)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: só um cProfile ativo por vez (etapas sobrepostas no pipeline)
+                return lambda: None
+            
+            def stop():
+                profiler.disable()
+                profiler.dump_stats(output.with_suffix(".prof"))
+            return stop
+        
+        if self.profile == "pyspy":
+            py_spy = shutil.which("py-spy")
+            if not py_spy:
+                print("Aviso: py-spy não encontrado no PATH; profiling desativado")
+                self.profile = None
+                return lambda: None
+            
+            # Amostra todas as threads (e subprocessos) sem instrumentar o código
+            process = subprocess.Popen(
+                [py_spy, "record", "--pid", str(os.getpid()), "--subprocesses",
+                 "--format", "speedscope", "--output", str(output.with_suffix(".speedscope.json"))],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            
+            def stop():
+                process.send_signal(signal.SIGINT)
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            return stop
+        
+        print(f"Aviso: profiler desconhecido '{self.profile}' (use cprofile ou pyspy)")
+        self.profile = None
+        return lambda: None
+    
+    def report(self) -> Dict[str, Any]:
+        """Relatório da execução, serializável em JSON."""
+        with self._lock:
+            stages = {name: stage.to_dict() for name, stage in self.stages.items()}
+        
+        peak = _resource_snapshot().get('peak_rss_mb')
+        return {
+            'run_id': self.run_id,
+            'started_at': self.started_at,
+            'wall_seconds': time.perf_counter() - self._started,
+            'peak_rss_mb': peak,
+            'stages': stages,
+        }
+    
+    def write(self, directory: Path) -> Path:
+        """Grava metrics.json e metrics.prom no diretório e retorna o caminho do JSON."""
+        report = self.report()
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        json_path = directory / "metrics.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        
+        with open(directory / "metrics.prom", 'w', encoding='utf-8') as f:
+            f.write(format_prometheus(report['stages'], {'run': self.run_id}))
+        
+        return json_path
+    
+    def print_summary(self):
+        """Mostra uma linha por etapa com os números mais úteis."""
+        report = self.report()
+        if not report['stages']:
+            return
+        
+        print(f"\n📈 Métricas ({report['wall_seconds']:.1f}s, pico de memória "
+              f"{report['peak_rss_mb'] or 0:.0f} MB):")
+        for name, stage in report['stages'].items():
+            details = [f"CPU {stage.get('cpu_seconds', 0):.1f}s"]
+            if stage.get('child_cpu_seconds', 0) >= 0.05:
+                details.append(f"FFmpeg {stage['child_cpu_seconds']:.1f}s")
+            if 'real_time_factor' in stage:
+                details.append(f"RTF {stage['real_time_factor']:.3f}")
+            if stage['counters'].get('llm_requests'):
+                details.append(f"{stage['counters']['llm_requests']:.0f} req, "
+                               f"{stage['counters'].get('tokens_in', 0):.0f}→"
+                               f"{stage['counters'].get('tokens_out', 0):.0f} tokens")
+            if 'fps' in stage:
+                details.append(f"{stage['fps']:.0f} fps")
+            print(f"   {name:<10} {stage['wall_seconds']:7.1f}s  " + ", ".join(details))
+
+
+def accumulate(totals: Dict[str, Dict[str, Any]], stages: Dict[str, Dict[str, Any]]):
+    """
+    Soma os totais por etapa de uma execução (report()['stages']) a totals.
+    
+    Usado pelo serviço para agregar todos os jobs; picos de memória ficam com
+    o maior valor e as taxas derivadas (RTF, fps) não são somadas.
+    """
+    for name, stage in stages.items():
+        total = totals.setdefault(name, {'counters': {}})
+        for key in ('calls', 'wall_seconds') + StageMetrics.DELTAS:
+            if key in stage:
+                total[key] = total.get(key, 0) + stage[key]
+        for key in StageMetrics.PEAKS:
+            if key in stage:
+                total[key] = max(total.get(key, 0.0), stage[key])
+        for counter, value in stage['counters'].items():
+            total['counters'][counter] = total['counters'].get(counter, 0.0) + value
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_prometheus(stages: Dict[str, Dict[str, Any]], labels: Optional[Dict[str, str]] = None,
+                      prefix: str = "shorts_stage") -> str:
+    """
+    Converte os totais por etapa para o formato texto do Prometheus.
+    
+    Cada medida vira uma métrica <prefix>_<medida> com o rótulo stage; os
+    contadores viram <prefix>_<contador>_total.
+    """
+    samples: Dict[str, list] = {}
+    for stage_name, stage in stages.items():
+        stage_labels = {**(labels or {}), 'stage': stage_name}
+        label_text = ",".join(f'{key}="{_escape_label(value)}"' for key, value in stage_labels.items())
+        
+        for key, value in stage.items():
+            if key == 'counters':
+                for counter, counter_value in value.items():
+                    samples.setdefault(f"{prefix}_{counter}_total", []).append((label_text, counter_value))
+            elif isinstance(value, (int, float)):
+                samples.setdefault(f"{prefix}_{key}", []).append((label_text, value))
+    
+    lines = []
+    for metric, values in samples.items():
+        lines.append(f"# TYPE {metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+        lines.extend(f"{metric}{{{label_text}}} {value:.10g}" for label_text, value in values)
+    return "\n".join(lines) + "\n"
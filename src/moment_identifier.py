@@ -1,79 +1,329 @@
 import json
+import time
+import asyncio
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING
 from config.settings import (
-    OPENAI_API_KEY, OPENAI_API_BASE, LLM_MODEL, 
-    LLM_TEMPERATURE, LLM_MAX_TOKENS, MIN_MOMENT_DURATION
+    DATA_DIR, OPENAI_API_KEY, OPENAI_API_BASE, LLM_MODEL, 
+    LLM_TEMPERATURE, LLM_MAX_TOKENS, MIN_MOMENT_DURATION,
+    LLM_WINDOW_DURATION, LLM_WINDOW_OVERLAP, LLM_CONCURRENCY, MOMENT_OVERLAP_THRESHOLD,
+    USE_LLM_CACHE, LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL, ACOUSTIC_CONTEXT_SECONDS,
+    REFINE_BOUNDARIES
 )
+from src import metrics
+from src.disk_cache import DiskCache
+from src.boundary_refiner import BoundaryRefiner
+from src.transcript import Transcript, TranscriptSlice
+from src.transcript_compactor import TranscriptCompactor
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SYSTEM_PROMPT = "Você é um especialista em identificar momentos engraçados e interessantes em transmissões ao vivo e vídeos. Sua tarefa é analisar transcrições e identificar os melhores momentos para criar shorts virais."
 
 
 class MomentIdentifier:
     """Classe responsável por identificar momentos engraçados usando LLM."""
     
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=OPENAI_API_KEY,
-            base_url=OPENAI_API_BASE
+    def __init__(self, use_cache: bool = USE_LLM_CACHE, refine_boundaries: bool = REFINE_BOUNDARIES):
+        self._client = None
+        self.data_dir = DATA_DIR
+        self.cache = DiskCache(
+            LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL, enabled=use_cache
         )
+        self.compactor = TranscriptCompactor()
+        self.token_usage = {'raw': 0, 'compacted': 0}
+        self.boundary_refiner = BoundaryRefiner() if refine_boundaries else None
+    
+    @property
+    def client(self):
+        """Cliente OpenAI, criado (e importado) apenas no primeiro uso."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(
+                api_key=OPENAI_API_KEY,
+                base_url=OPENAI_API_BASE
+            )
+        return self._client
         
-    def analyze_segments(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def analyze_segments(self, segments: Union[Transcript, List[Dict[str, Any]]],
+                         candidate_windows: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """
         Analisa os segmentos de transcrição para identificar momentos engraçados.
         
+        Com candidate_windows (pré-filtro acústico), apenas esses trechos vão ao
+        LLM. Sem eles, transcrições mais longas que LLM_WINDOW_DURATION são
+        divididas em janelas analisadas em paralelo (ver analyze_segments_windowed).
+        
         Args:
-            segments: Lista de segmentos da transcrição
+            segments: Transcrição (Transcript ou lista de segmentos)
+            candidate_windows: Janelas {'start', 'end'} do ExcitementDetector (opcional)
             
         Returns:
             List: Lista de momentos engraçados identificados
         """
+        segments = Transcript.from_segments(segments)
+        
+        if segments and candidate_windows:
+            windows = self._windows_from_candidates(segments, candidate_windows)
+            if windows:
+                covered = sum(window[-1]['end'] - window[0]['start'] for window in windows)
+                total = max(segments.ends) - segments.starts[0]
+                print(f"Pré-filtro acústico: {len(windows)} trechos, "
+                      f"{covered / 60:.1f} de {total / 60:.1f} minutos enviados ao LLM")
+                return self._analyze_windows(segments, windows)
+        
+        if segments and segments[-1]['end'] - segments[0]['start'] > LLM_WINDOW_DURATION:
+            return self.analyze_segments_windowed(segments)
+        
         # Preparar o texto para análise
+        self.token_usage = {'raw': 0, 'compacted': 0}
         full_text = self._prepare_text_for_analysis(segments)
+        self._report_token_usage()
         
         # Criar prompt para o LLM
         prompt = self._create_analysis_prompt(full_text)
         
         try:
             print("Analisando transcrição com LLM...")
-            response = self.client.chat.completions.create(
-                model=LLM_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um especialista em identificar momentos engraçados e interessantes em transmissões ao vivo e vídeos. Sua tarefa é analisar transcrições e identificar os melhores momentos para criar shorts virais."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=LLM_TEMPERATURE,
-                max_tokens=LLM_MAX_TOKENS,
-                response_format={"type": "json_object"}
-            )
-            
-            # Processar resposta
-            analysis_result = json.loads(response.choices[0].message.content)
+            analysis_result = self._complete(prompt)
             
             # Converter para formato interno
             funny_moments = self._process_llm_response(analysis_result, segments)
             
+            self._report_cache_stats()
             print(f"Identificados {len(funny_moments)} momentos engraçados")
             return funny_moments
             
         except Exception as e:
             raise Exception(f"Erro na análise com LLM: {str(e)}")
     
-    def _prepare_text_for_analysis(self, segments: List[Dict[str, Any]]) -> str:
-        """Prepara o texto da transcrição para análise."""
+    def analyze_segments_windowed(self, segments: Transcript) -> List[Dict[str, Any]]:
+        """
+        Analisa a transcrição em janelas de tempo sobrepostas, em paralelo.
+        
+        Cada janela vira um prompt independente (map); os momentos de todas as
+        janelas são unidos e duplicatas na sobreposição são colapsadas (reduce).
+        
+        Args:
+            segments: Transcrição completa
+            
+        Returns:
+            List: Lista de momentos engraçados identificados
+        """
+        return self._analyze_windows(segments, self._split_into_windows(segments))
+    
+    def _analyze_windows(self, segments: Transcript, windows: List[TranscriptSlice]) -> List[Dict[str, Any]]:
+        """Analisa cada janela em um prompt próprio e une os momentos encontrados."""
+        self.token_usage = {'raw': 0, 'compacted': 0}
+        prompts = [
+            self._create_analysis_prompt(self._prepare_text_for_analysis(window))
+            for window in windows
+        ]
+        self._report_token_usage()
+        
+        print(f"Analisando {len(windows)} janelas com LLM ({LLM_CONCURRENCY} em paralelo)...")
+        results = asyncio.run(self._analyze_prompts_async(prompts))
+        
+        funny_moments = []
+        failures = 0
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                failures += 1
+                print(f"Aviso: Erro na análise da janela {i+1}: {result}")
+                continue
+            funny_moments.extend(self._process_llm_response(result, segments))
+        
+        if failures == len(results):
+            raise Exception("Erro na análise com LLM: todas as janelas falharam")
+        
+        self._report_cache_stats()
+        
+        funny_moments = self._merge_moments(funny_moments)
+        print(f"Identificados {len(funny_moments)} momentos engraçados")
+        return funny_moments
+    
+    async def _analyze_prompts_async(self, prompts: List[str]) -> List[Any]:
+        """Envia os prompts com no máximo LLM_CONCURRENCY requisições simultâneas."""
+        from openai import AsyncOpenAI
+        
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_API_BASE)
+        semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+        
+        async def analyze(prompt: str) -> Dict[str, Any]:
+            request = self._build_request(prompt)
+            cache_key = self._cache_key(request)
+            content = self.cache.get(cache_key)
+            
+            if content is None:
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.chat.completions.create(**request)
+                    self._record_response(response, time.perf_counter() - started)
+                content = response.choices[0].message.content
+                analysis_result = json.loads(content)
+                self.cache.set(cache_key, content)
+                return analysis_result
+            
+            metrics.record('llm_cache_hits')
+            return json.loads(content)
+        
+        try:
+            return await asyncio.gather(
+                *(analyze(prompt) for prompt in prompts), return_exceptions=True
+            )
+        finally:
+            await client.close()
+    
+    def _complete(self, prompt: str) -> Dict[str, Any]:
+        """Executa a chamada ao LLM, consultando antes o cache de respostas."""
+        request = self._build_request(prompt)
+        cache_key = self._cache_key(request)
+        content = self.cache.get(cache_key)
+        
+        if content is None:
+            started = time.perf_counter()
+            response = self.client.chat.completions.create(**request)
+            self._record_response(response, time.perf_counter() - started)
+            content = response.choices[0].message.content
+            analysis_result = json.loads(content)
+            # Só respostas válidas (JSON) são armazenadas
+            self.cache.set(cache_key, content)
+            return analysis_result
+        
+        metrics.record('llm_cache_hits')
+        return json.loads(content)
+    
+    @staticmethod
+    def _record_response(response: Any, latency: float):
+        """Registra latência e tokens (usage) de uma resposta do LLM nas métricas."""
+        metrics.record('llm_requests')
+        metrics.record('llm_latency_seconds', latency)
+        usage = getattr(response, 'usage', None)
+        if usage:
+            metrics.record('tokens_in', usage.prompt_tokens or 0)
+            metrics.record('tokens_out', usage.completion_tokens or 0)
+    
+    def _cache_key(self, request: Dict[str, Any]) -> str:
+        """Chave do cache: endpoint + modelo, temperatura, prompts e demais parâmetros."""
+        return DiskCache.make_key(OPENAI_API_BASE, request)
+    
+    def _report_cache_stats(self):
+        """Mostra acertos/falhas do cache de respostas, se estiver ativo."""
+        if self.cache.enabled:
+            stats = self.cache.stats()
+            print(f"Cache LLM: {stats['hits']} acertos, {stats['misses']} falhas")
+    
+    def _build_request(self, prompt: str) -> Dict[str, Any]:
+        """Monta os parâmetros da chamada de chat completion."""
+        return {
+            'model': LLM_MODEL,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'temperature': LLM_TEMPERATURE,
+            'max_tokens': LLM_MAX_TOKENS,
+            'response_format': {"type": "json_object"}
+        }
+    
+    def _split_into_windows(self, segments: Transcript) -> List[TranscriptSlice]:
+        """Divide os segmentos em janelas de LLM_WINDOW_DURATION com LLM_WINDOW_OVERLAP."""
+        step = max(1, LLM_WINDOW_DURATION - LLM_WINDOW_OVERLAP)
+        first_start = segments.starts[0]
+        last_end = max(segments.ends)
+        
+        windows = []
+        window_start = first_start
+        while window_start < last_end:
+            window_end = window_start + LLM_WINDOW_DURATION
+            window = self._find_segments_in_range(segments, window_start, window_end)
+            if window:
+                windows.append(window)
+            window_start += step
+        
+        return windows
+    
+    def _windows_from_candidates(self, segments: Transcript,
+                                 candidate_windows: List[Dict[str, Any]]) -> List[TranscriptSlice]:
+        """Expande as janelas candidatas com ACOUSTIC_CONTEXT_SECONDS e une as sobrepostas."""
+        ranges = sorted(
+            (max(0.0, c['start'] - ACOUSTIC_CONTEXT_SECONDS), c['end'] + ACOUSTIC_CONTEXT_SECONDS)
+            for c in candidate_windows
+        )
+        
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        
+        windows = []
+        for start, end in merged:
+            window = self._find_segments_in_range(segments, start, end)
+            if window:
+                windows.append(window)
+        
+        return windows
+    
+    def _merge_moments(self, moments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Colapsa momentos duplicados vindos de janelas sobrepostas.
+        
+        Dois momentos são o mesmo quando a sobreposição cobre pelo menos
+        MOMENT_OVERLAP_THRESHOLD do mais curto; fica o de maior prioridade.
+        """
+        merged = []
+        
+        for moment in sorted(moments, key=lambda x: x['priority'], reverse=True):
+            is_duplicate = False
+            for kept in merged:
+                overlap = min(moment['end'], kept['end']) - max(moment['start'], kept['start'])
+                shortest = min(moment['duration'], kept['duration'])
+                if shortest > 0 and overlap / shortest >= MOMENT_OVERLAP_THRESHOLD:
+                    is_duplicate = True
+                    break
+            
+            if not is_duplicate:
+                merged.append(moment)
+        
+        return merged
+    
+    def _prepare_text_for_analysis(self, segments: Union[Transcript, TranscriptSlice]) -> str:
+        """
+        Prepara o texto da transcrição para análise.
+        
+        O texto é compactado (blocos de tempo, sem preenchimentos) e ajustado ao
+        orçamento LLM_PROMPT_TOKEN_BUDGET; os timestamps continuam no formato
+        [HH:MM:SS] aceito por _timestamp_to_seconds.
+        """
         text_with_timestamps = []
         
-        for i, segment in enumerate(segments):
+        for segment in segments:
             start_time = self._format_timestamp(segment['start'])
             text_with_timestamps.append(f"[{start_time}] {segment['text']}")
         
-        return "\n".join(text_with_timestamps)
+        raw_text = "\n".join(text_with_timestamps)
+        compacted_text = self.compactor.compact(segments)
+        
+        self.token_usage['raw'] += self.compactor.count_tokens(raw_text)
+        self.token_usage['compacted'] += self.compactor.count_tokens(compacted_text)
+        
+        return compacted_text
+    
+    def _report_token_usage(self):
+        """Mostra os tokens da transcrição antes e depois da compactação."""
+        raw, compacted = self.token_usage['raw'], self.token_usage['compacted']
+        saved = (1 - compacted / raw) * 100 if raw else 0.0
+        print(f"Tokens da transcrição: {raw} → {compacted} ({saved:.0f}% de economia)")
     
     def _create_analysis_prompt(self, text: str) -> str:
         """Cria o prompt para análise do LLM."""
@@ -117,7 +367,7 @@ INSTRUÇÕES:
 }}
 """
     
-    def _process_llm_response(self, analysis_result: Dict[str, Any], segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_llm_response(self, analysis_result: Dict[str, Any], segments: Transcript) -> List[Dict[str, Any]]:
         """Processa a resposta do LLM e converte para formato interno."""
         funny_moments = []
         
@@ -132,7 +382,7 @@ INSTRUÇÕES:
                 if duration < MIN_MOMENT_DURATION:
                     continue
                 
-                # Encontrar segmentos correspondentes
+                # Encontrar segmentos correspondentes (visão, sem cópia)
                 relevant_segments = self._find_segments_in_range(
                     segments, start_seconds, end_seconds
                 )
@@ -160,16 +410,9 @@ INSTRUÇÕES:
         
         return funny_moments
     
-    def _find_segments_in_range(self, segments: List[Dict[str, Any]], start: float, end: float) -> List[Dict[str, Any]]:
-        """Encontra segmentos que estão dentro do range de tempo especificado."""
-        relevant_segments = []
-        
-        for segment in segments:
-            # Verifica se o segmento tem sobreposição com o range
-            if (segment['start'] < end and segment['end'] > start):
-                relevant_segments.append(segment)
-        
-        return relevant_segments
+    def _find_segments_in_range(self, segments: Transcript, start: float, end: float) -> TranscriptSlice:
+        """Encontra segmentos que se sobrepõem ao range de tempo (busca binária)."""
+        return segments.range(start, end)
     
     def _timestamp_to_seconds(self, timestamp: str) -> float:
         """Converte timestamp HH:MM:SS para segundos."""
@@ -194,15 +437,19 @@ INSTRUÇÕES:
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
     
     def save_analysis_results(self, moments: List[Dict[str, Any]], output_path: Optional[Path] = None) -> Path:
-        """Salva os resultados da análise em um arquivo JSON."""
+        """
+        Salva os resultados da análise em um arquivo JSON.
+        
+        Os segmentos de cada momento são gravados como referência ao intervalo
+        da transcrição (segment_range) mais o texto, sem duplicar timestamps.
+        """
         if not output_path:
-            from config.settings import DATA_DIR
-            output_path = DATA_DIR / "funny_moments.json"
+            output_path = self.analysis_path
         
         try:
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump({
-                    'moments': moments,
+                    'moments': [self._serialize_moment(moment) for moment in moments],
                     'total_moments': len(moments),
                     'analysis_timestamp': str(datetime.now())
                 }, f, indent=2, ensure_ascii=False)
@@ -213,17 +460,90 @@ INSTRUÇÕES:
         except Exception as e:
             raise Exception(f"Erro ao salvar análise: {str(e)}")
     
-    def identify_moments(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @property
+    def analysis_path(self) -> Path:
+        """Arquivo onde save_analysis_results grava a análise do job."""
+        return self.data_dir / "funny_moments.json"
+    
+    def load_analysis_results(self, segments: Transcript, input_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Lê uma análise gravada por save_analysis_results (retomada de um job).
+        
+        Args:
+            segments: Transcrição final usada na análise (para reconstruir os segmentos)
+            input_path: Arquivo da análise (padrão: analysis_path)
+            
+        Returns:
+            List: Momentos como retornados por finalize_moments
+        """
+        try:
+            with open(input_path or self.analysis_path, 'r', encoding='utf-8') as f:
+                serialized = json.load(f)['moments']
+        except Exception as e:
+            raise Exception(f"Erro ao ler análise: {str(e)}")
+        
+        moments = []
+        for data in serialized:
+            moment = {key: value for key, value in data.items() if key not in ('segment_range', 'transcript')}
+            if 'segment_range' in data:
+                lo, hi = data['segment_range']
+                moment['segments'] = segments[lo:hi]
+            moments.append(moment)
+        return moments
+    
+    def _serialize_moment(self, moment: Dict[str, Any]) -> Dict[str, Any]:
+        """Converte um momento para JSON, trocando a visão de segmentos pelo intervalo."""
+        serialized = {key: value for key, value in moment.items() if key != 'segments'}
+        segments = moment.get('segments')
+        
+        if isinstance(segments, TranscriptSlice):
+            serialized['segment_range'] = [segments.lo, segments.hi]
+            serialized['transcript'] = segments.text
+        elif segments is not None:
+            serialized['segments'] = list(segments)
+        
+        return serialized
+    
+    def identify_moments(self, segments: Union[Transcript, List[Dict[str, Any]]],
+                         candidate_windows: Optional[List[Dict[str, Any]]] = None,
+                         audio: Optional["np.ndarray"] = None) -> List[Dict[str, Any]]:
         """
         Método principal para identificar momentos engraçados.
         
         Args:
-            segments: Lista de segmentos da transcrição
+            segments: Transcrição (Transcript ou lista de segmentos)
+            candidate_windows: Janelas do pré-filtro acústico (opcional)
+            audio: Amostras a 16 kHz, para ajustar bordas em pausas (opcional)
             
         Returns:
             List: Lista de momentos engraçados identificados
         """
-        moments = self.analyze_segments(segments)
+        segments = Transcript.from_segments(segments)
+        moments = self.analyze_segments(segments, candidate_windows)
+        return self.finalize_moments(moments, segments, audio)
+    
+    def finalize_moments(self, moments: List[Dict[str, Any]], segments: Transcript,
+                         audio: Optional["np.ndarray"] = None) -> List[Dict[str, Any]]:
+        """
+        Ajusta as bordas dos momentos e salva a análise.
+        
+        Separado de identify_moments para que a transcrição possa ser refinada
+        (segunda passada do Whisper) entre a análise e o ajuste das bordas.
+        
+        Args:
+            moments: Momentos retornados por analyze_segments
+            segments: Transcrição final (os momentos passam a apontar para ela)
+            audio: Amostras a 16 kHz, para ajustar bordas em pausas (opcional)
+            
+        Returns:
+            List: Os mesmos momentos, ajustados
+        """
+        # Cortar em fronteiras de palavras/pausas em vez de segundos inteiros
+        if self.boundary_refiner:
+            self.boundary_refiner.refine(moments, segments, audio)
+        else:
+            for moment in moments:
+                moment['segments'] = self._find_segments_in_range(segments, moment['start'], moment['end'])
         
         # Salvar resultados
         self.save_analysis_results(moments)
@@ -0,0 +1,471 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from config.settings import (
+    CHUNK_OVERLAP, LLM_WINDOW_DURATION, LLM_WINDOW_OVERLAP,
+    MOMENT_OVERLAP_THRESHOLD, MAX_INDIVIDUAL_SHORTS, PIPELINE_CHUNK_SECONDS, PIPELINE_QUEUE_SIZE
+)
+from src.transcript import Transcript
+
+# numpy é importado sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    import numpy as np
+    from src.main import ShortsGenerator
+
+SAMPLE_RATE = 16000  # Mesma taxa do áudio decodificado pelo AudioProcessor
+STAGES = ("download", "audio", "transcribe", "analyze", "render")
+
+# Marca o fim do fluxo em uma fila
+_END = object()
+
+
+class _AudioBuffer:
+    """Áudio decodificado até agora, em um array que cresce por duplicação."""
+    
+    def __init__(self):
+        import numpy as np
+        
+        self._data = np.empty(SAMPLE_RATE * 60, dtype=np.float32)
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, samples: "np.ndarray"):
+        import numpy as np
+        
+        with self._lock:
+            needed = self._size + len(samples)
+            if needed > len(self._data):
+                grown = np.empty(max(needed, 2 * len(self._data)), dtype=np.float32)
+                grown[:self._size] = self._data[:self._size]
+                self._data = grown
+            self._data[self._size:needed] = samples
+            self._size = needed
+    
+    def view(self, start: int = 0, end: Optional[int] = None) -> "np.ndarray":
+        """Amostras [start:end] (sem cópia; continuam válidas se o buffer crescer)."""
+        with self._lock:
+            end = self._size if end is None else min(end, self._size)
+            return self._data[start:end]
+
+
+class ShortsPipeline:
+    """
+    Executa as etapas do ShortsGenerator em paralelo, ligadas por filas limitadas.
+    
+    - download: baixa o vídeo (URLs) enquanto o áudio já é transcrito
+    - audio: o FFmpeg decodifica o áudio em blocos direto da fonte
+    - transcribe: transcreve cada PIPELINE_CHUNK_SECONDS assim que decodificados
+    - analyze: envia ao LLM cada janela de LLM_WINDOW_DURATION já transcrita
+    - render: renderiza cada momento assim que ele é confirmado
+    
+    Com audio_first, não há download completo: a renderização baixa só o
+    trecho de cada momento. O pré-filtro acústico não se aplica (ele precisa
+    do áudio inteiro); os shorts individuais seguem a ordem em que os
+    momentos são confirmados, e não a prioridade global.
+    """
+    
+    def __init__(self, generator: "ShortsGenerator", chunk_seconds: float = PIPELINE_CHUNK_SECONDS,
+                 queue_size: int = PIPELINE_QUEUE_SIZE):
+        self.generator = generator
+        self.chunk_seconds = chunk_seconds
+        self.queue_size = queue_size
+        
+        self.transcript = Transcript()
+        self.moments: List[Dict[str, Any]] = []
+        self.stage_stats = {name: {'busy': 0.0, 'items': 0} for name in STAGES}
+        self.report: Dict[str, Any] = {}
+        
+        self._audio: Optional[_AudioBuffer] = None
+        self._transcript_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._abort = threading.Event()
+        self._errors: List[BaseException] = []
+    
+    def run(self, source: str, create_individual: bool = True,
+            create_compilation: bool = True) -> List[Path]:
+        """
+        Gera os shorts com as etapas sobrepostas.
+        
+        Args:
+            source: URL ou caminho para arquivo de vídeo
+            create_individual: Se deve criar shorts individuais
+            create_compilation: Se deve criar short de compilação
+        
+        Returns:
+            List[Path]: Lista de caminhos para os shorts criados
+        """
+        ingestion = self.generator.video_ingestion
+        is_url = ingestion.is_url(source)
+        audio_first = self.generator.audio_first and is_url
+        started = time.perf_counter()
+        
+        self._audio = _AudioBuffer()
+        chunk_queue: queue.Queue = queue.Queue(self.queue_size)
+        transcript_queue: queue.Queue = queue.Queue(self.queue_size)
+        moment_queue: queue.Queue = queue.Queue()
+        
+        # O download completo roda em paralelo a todo o resto; a renderização espera por ele
+        download_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-download")
+        video_future = None if audio_first else download_executor.submit(self._download, source)
+        audio_source = ingestion.resolve_stream_url(source, 'bestaudio/best') if is_url else source
+        
+        rendered: List[tuple] = []
+        threads = [
+            threading.Thread(target=self._guard, name="pipeline-audio", daemon=True,
+                             args=(self._decode_stage, audio_source, chunk_queue)),
+            threading.Thread(target=self._guard, name="pipeline-transcribe", daemon=True,
+                             args=(self._transcribe_stage, chunk_queue, transcript_queue)),
+            threading.Thread(target=self._guard, name="pipeline-analyze", daemon=True,
+                             args=(self._analyze_stage, transcript_queue, moment_queue)),
+            threading.Thread(target=self._guard, name="pipeline-render", daemon=True,
+                             args=(self._render_stage, moment_queue, source, video_future,
+                                   create_individual, rendered)),
+        ]
+        
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self._abort.set()
+            raise
+        finally:
+            download_executor.shutdown(wait=True)
+        
+        if self._errors:
+            raise self._errors[0]
+        
+        self.generator.audio_processor.save_transcription(self.transcript)
+        created_shorts = [path for _, path in rendered]
+        if not self.moments:
+            print("❌ Nenhum momento engraçado foi identificado.")
+        else:
+            created_shorts += self._finish(source, video_future, create_compilation, rendered)
+        
+        self._report(time.perf_counter() - started)
+        return created_shorts
+    
+    def _guard(self, stage, *args):
+        """Executa um estágio; um erro interrompe os demais (que drenam as filas)."""
+        try:
+            stage(*args)
+        except InterruptedError:
+            # Outro estágio falhou (ou Ctrl+C): o erro original já foi registrado
+            pass
+        except BaseException as e:
+            self._errors.append(e)
+            self._abort.set()
+    
+    @contextmanager
+    def _busy(self, stage: str):
+        """Contabiliza o tempo em que o estágio está trabalhando (fora das filas)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._stats_lock:
+                self.stage_stats[stage]['busy'] += time.perf_counter() - started
+                self.stage_stats[stage]['items'] += 1
+    
+    def _put(self, target: queue.Queue, item):
+        """Enfileira esperando por espaço, mas desiste se o pipeline foi interrompido."""
+        while not self._abort.is_set():
+            try:
+                target.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+        raise InterruptedError("Pipeline interrompido")
+    
+    def _close(self, target: queue.Queue):
+        """Sinaliza o fim do fluxo para o estágio seguinte."""
+        try:
+            self._put(target, _END)
+        except InterruptedError:
+            pass
+    
+    def _get(self, source: queue.Queue):
+        """Retira um item da fila; retorna _END se o pipeline foi interrompido."""
+        while not self._abort.is_set():
+            try:
+                return source.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _END
+    
+    def _download(self, source: str) -> tuple:
+        with self.generator._stage("ingest"), self._busy("download"):
+            return self.generator.video_ingestion.ingest_video(source)
+    
+    def _decode_stage(self, audio_source: str, chunk_queue: queue.Queue):
+        """Decodifica o áudio e entrega chunks com CHUNK_OVERLAP de contexto de cada lado."""
+        chunk_samples = int(self.chunk_seconds * SAMPLE_RATE)
+        overlap_samples = int(CHUNK_OVERLAP * SAMPLE_RATE)
+        nominal_start = 0
+        blocks = self.generator.audio_processor.stream_audio(audio_source)
+        
+        try:
+            while True:
+                with self._busy("audio"):
+                    block = next(blocks, None)
+                    if block is not None:
+                        self._audio.append(block)
+                if block is None:
+                    break
+                
+                # Só entrega o chunk quando o contexto depois dele também chegou
+                while len(self._audio) >= nominal_start + chunk_samples + overlap_samples:
+                    self._emit_chunk(chunk_queue, nominal_start, chunk_samples, overlap_samples)
+                    nominal_start += chunk_samples
+            
+            while nominal_start < len(self._audio):
+                self._emit_chunk(chunk_queue, nominal_start, chunk_samples, overlap_samples)
+                nominal_start += chunk_samples
+        
+        finally:
+            blocks.close()
+            self._close(chunk_queue)
+    
+    def _emit_chunk(self, chunk_queue: queue.Queue, nominal_start: int, chunk_samples: int,
+                    overlap_samples: int):
+        start = max(0, nominal_start - overlap_samples)
+        end = nominal_start + chunk_samples + overlap_samples
+        nominal_end = nominal_start + chunk_samples
+        is_last = nominal_end >= len(self._audio)
+        self._put(chunk_queue, {
+            'audio': self._audio.view(start, end),
+            'offset': start / SAMPLE_RATE,
+            'nominal_start': nominal_start / SAMPLE_RATE,
+            'nominal_end': float('inf') if is_last else nominal_end / SAMPLE_RATE,
+        })
+    
+    def _transcribe_stage(self, chunk_queue: queue.Queue, transcript_queue: queue.Queue):
+        """Transcreve cada chunk e anexa à transcrição só o trecho nominal dele."""
+        audio_processor = self.generator.audio_processor
+        
+        try:
+            while (chunk := self._get(chunk_queue)) is not _END:
+                with self.generator._stage("asr"), self._busy("transcribe"):
+                    chunk_transcript = audio_processor.transcribe_chunk(chunk['audio'], chunk['offset'])
+                    piece = self._nominal_part(chunk_transcript, chunk['nominal_start'], chunk['nominal_end'])
+                    
+                    with self._transcript_lock:
+                        end = len(self.transcript)
+                        self.transcript = self.transcript.replace_ranges([(end, end, piece)])
+                
+                transcribed_until = chunk['offset'] + len(chunk['audio']) / SAMPLE_RATE
+                self._put(transcript_queue, min(transcribed_until, chunk['nominal_end']))
+        
+        finally:
+            self._close(transcript_queue)
+    
+    def _nominal_part(self, chunk_transcript: Transcript, nominal_start: float,
+                      nominal_end: float) -> Transcript:
+        """
+        Segmentos que tocam o intervalo nominal do chunk e começam antes do fim dele.
+        
+        Como em AudioProcessor._stitch_chunks, o começo do chunk é recortado até
+        o fim do último segmento já aceito e um segmento repetido na junção com
+        o chunk anterior é descartado.
+        """
+        from bisect import bisect_left
+        
+        audio_processor = self.generator.audio_processor
+        piece = chunk_transcript.range(nominal_start, nominal_end).copy()
+        if not len(piece) or not len(self.transcript):
+            return piece
+        
+        last = len(self.transcript) - 1
+        covered_until = self.transcript.ends[last]
+        overlapping = bisect_left(piece.starts, covered_until)
+        if overlapping:
+            head = []
+            for i in range(overlapping):
+                segment = piece.segment(i)
+                if piece.has_words:
+                    segment['words'] = piece.words_of(i)
+                segment = audio_processor._trim_overlap(segment, covered_until)
+                if segment is not None:
+                    head.append(segment)
+            piece = piece.replace_ranges([(0, overlapping, Transcript.from_segments(head))])
+        
+        normalize = audio_processor._normalize_text
+        if len(piece) and normalize(self.transcript.text_at(last)) == normalize(piece.text_at(0)):
+            if piece.starts[0] - covered_until < CHUNK_OVERLAP:
+                piece = piece[1:].copy()
+        return piece
+    
+    def _analyze_stage(self, transcript_queue: queue.Queue, moment_queue: queue.Queue):
+        """Analisa cada janela de LLM_WINDOW_DURATION assim que ela foi transcrita."""
+        step = max(1, LLM_WINDOW_DURATION - LLM_WINDOW_OVERLAP)
+        window_start = 0.0
+        analyzed_until = 0.0
+        transcribed_until = 0.0
+        finished = False
+        
+        try:
+            while not finished:
+                item = self._get(transcript_queue)
+                if item is _END:
+                    if self._abort.is_set():
+                        return
+                    finished = True
+                else:
+                    transcribed_until = item
+                
+                # No fim, a última janela vai até onde houver transcrição
+                while analyzed_until < transcribed_until and (
+                        finished or window_start + LLM_WINDOW_DURATION <= transcribed_until):
+                    window_end = min(window_start + LLM_WINDOW_DURATION, transcribed_until)
+                    with self.generator._stage("llm"), self._busy("analyze"):
+                        confirmed = self._analyze_window(window_start, window_end)
+                    for moment in confirmed:
+                        self._put(moment_queue, moment)
+                    analyzed_until = window_end
+                    window_start += step
+        
+        finally:
+            self._close(moment_queue)
+    
+    def _analyze_window(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Envia uma janela ao LLM, descarta repetidos e ajusta os momentos novos."""
+        generator = self.generator
+        with self._transcript_lock:
+            transcript = self.transcript
+        
+        window = transcript.range(start, end)
+        if not window:
+            return []
+        
+        moments = [
+            moment for moment in generator.moment_identifier.analyze_segments(window)
+            if not self._is_duplicate(moment)
+        ]
+        if not moments:
+            return []
+        
+        # Segunda passada do Whisper só nos trechos dos momentos novos, fora do
+        # lock: enquanto isso a transcrição só cresce no fim (transcribe), então
+        # os índices do snapshot continuam valendo para as trocas
+        audio = self._audio.view()
+        replacements = generator.audio_processor.refine_replacements(audio, transcript, moments)
+        if replacements:
+            with self._transcript_lock:
+                self.transcript = self.transcript.replace_ranges(replacements)
+                transcript = self.transcript
+        
+        refiner = generator.moment_identifier.boundary_refiner
+        if refiner:
+            refiner.refine(moments, transcript, audio)
+        else:
+            for moment in moments:
+                moment['segments'] = transcript.range(moment['start'], moment['end'])
+        
+        self.moments.extend(moments)
+        return moments
+    
+    def _is_duplicate(self, moment: Dict[str, Any]) -> bool:
+        """Verifica se o momento já foi confirmado por uma janela anterior (sobreposta)."""
+        for kept in self.moments:
+            overlap = min(moment['end'], kept['end']) - max(moment['start'], kept['start'])
+            shortest = min(moment['duration'], kept['duration'])
+            if shortest > 0 and overlap / shortest >= MOMENT_OVERLAP_THRESHOLD:
+                return True
+        return False
+    
+    def _render_stage(self, moment_queue: queue.Queue, source: str, video_future: Optional[Future],
+                      create_individual: bool, rendered: List[tuple]):
+        """Renderiza um short por momento confirmado, até MAX_INDIVIDUAL_SHORTS."""
+        generator = self.generator
+        
+        while (moment := self._get(moment_queue)) is not _END:
+            if not create_individual or len(rendered) >= MAX_INDIVIDUAL_SHORTS:
+                continue
+            
+            video_path = self._video_path(video_future, source, moment)
+            filename = f"short_{len(rendered) + 1:02d}.mp4"
+            with generator._stage("render"):
+                try:
+                    with self._busy("render"):
+                        short_path = generator.video_editor.create_short_from_moment(
+                            video_path, moment, filename
+                        )
+                    rendered.append((moment, short_path))
+                except Exception as e:
+                    print(f"Erro ao criar short {len(rendered) + 1}: {e}")
+    
+    def _video_path(self, video_future: Optional[Future], source: str,
+                    moment: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+        """Vídeo completo (esperando o download) ou, com audio_first, o trecho do momento."""
+        if video_future is not None:
+            return video_future.result()[0]
+        
+        if moment is not None and not moment.get('source_path'):
+            with self.generator._stage("ingest"), self._busy("download"):
+                self.generator.video_ingestion.download_sections(source, [moment])
+        return None
+    
+    def _finish(self, source: str, video_future: Optional[Future], create_compilation: bool,
+                rendered: List[tuple]) -> List[Path]:
+        """Salva a análise e cria a compilação a partir dos shorts já renderizados."""
+        generator = self.generator
+        self.moments.sort(key=lambda x: x['priority'], reverse=True)
+        generator.moment_identifier.save_analysis_results(self.moments)
+        
+        created = []
+        try:
+            if create_compilation and len(self.moments) > 1:
+                for moment in self.moments:
+                    self._video_path(video_future, source, moment)
+                video_path = self._video_path(video_future, source)
+                rendered_shorts = {
+                    generator.video_editor.moment_key(moment): path for moment, path in rendered
+                }
+                with generator._stage("render"):
+                    try:
+                        with self._busy("render"):
+                            created.append(generator.video_editor.create_compilation_short(
+                                video_path, self.moments, rendered_shorts=rendered_shorts
+                            ))
+                    except Exception as e:
+                        print(f"Erro ao criar compilação: {e}")
+        finally:
+            generator.video_editor.close()
+        
+        return created
+    
+    def _report(self, wall: float):
+        """
+        Mostra a utilização de cada estágio e a economia estimada sobre a execução sequencial.
+        
+        A referência sequencial não é medida: é a soma do tempo ocupado dos
+        estágios, que também inclui a disputa por CPU/GPU entre eles.
+        """
+        sequential = sum(stats['busy'] for stats in self.stage_stats.values())
+        saved = max(0.0, sequential - wall)
+        self.report = {
+            'wall_seconds': wall,
+            'sequential_estimate_seconds': sequential,
+            'saved_estimate_seconds': saved,
+            'stages': {
+                name: {**stats, 'utilization': stats['busy'] / wall if wall else 0.0}
+                for name, stats in self.stage_stats.items()
+            },
+        }
+        
+        print(f"\n⏱️  Pipeline: {wall:.1f}s (estimativa sequencial, soma do tempo ocupado dos estágios: "
+              f"{sequential:.1f}s; economia estimada de {saved:.1f}s / "
+              f"{saved / sequential if sequential else 0:.0%})")
+        for name, stats in self.report['stages'].items():
+            if stats['items']:
+                print(f"   {name:<10} {stats['busy']:7.1f}s ocupado  {stats['utilization']:4.0%}  "
+                      f"({stats['items']} itens)")
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Serviço de geração de shorts - processo de longa duração com fila de jobs
+
+Mantém o Whisper carregado entre os jobs, persiste a fila em SQLite e expõe
+uma API HTTP local (TCP ou socket Unix):
+    
+    POST /jobs                 {"source": "...", "create_compilation": false}
+    GET  /jobs                 lista os jobs mais recentes
+    GET  /jobs/<id>            status, etapa atual e resultado
+    POST /jobs/<id>/cancel     cancela (na fila: imediato; em execução: na próxima etapa)
+    GET  /health               workers, modelos residentes e vazão (VODs por hora)
+    GET  /metrics              métricas por etapa no formato texto do Prometheus
+"""
+
+import argparse
+import json
+import shutil
+import socketserver
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Adicionar o diretório pai ao path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Carregar variáveis do arquivo .env
+load_dotenv()
+
+from src.main import ShortsGenerator
+from src.audio_processor import AudioProcessor
+from src import metrics
+from config.settings import (
+    JOBS_DIR, SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_DB_PATH,
+    SERVICE_POLL_INTERVAL, SERVICE_STAGE_LIMITS, ensure_directories
+)
+
+# Opções de ShortsGenerator/generate_shorts aceitas no corpo de POST /jobs
+JOB_OPTIONS = {
+    'create_individual': True,
+    'create_compilation': True,
+    'audio_first': False,
+    'pipeline': False,
+}
+
+
+class JobCancelled(Exception):
+    """Levantada no início de uma etapa quando o job teve o cancelamento pedido."""
+
+
+class JobStore:
+    """
+    Fila de jobs persistida em SQLite.
+    
+    Cada operação abre a sua própria conexão, então a mesma instância pode ser
+    usada pelas threads da API e dos workers (e por mais de um processo).
+    """
+    
+    def __init__(self, db_path: Path = SERVICE_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(sql, params)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+    
+    def create(self, source: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Enfileira um job e retorna o seu registro."""
+        job_id = uuid.uuid4().hex[:12]
+        self._execute(
+            "INSERT INTO jobs (id, source, options, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+            (job_id, source, json.dumps(options), time.time())
+        )
+        return self.get(job_id)
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            return self._to_dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+        finally:
+            conn.close()
+    
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+            return [self._to_dict(row) for row in rows]
+        finally:
+            conn.close()
+    
+    def counts(self) -> Dict[str, int]:
+        """Quantidade de jobs em cada status."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+            return {status: count for status, count in rows}
+        finally:
+            conn.close()
+    
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Marca o job mais antigo da fila como em execução e o retorna (atômico)."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                (time.time(), row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return self.get(row['id'])
+    
+    def set_stage(self, job_id: str, stage: str):
+        self._execute("UPDATE jobs SET stage = ? WHERE id = ?", (stage, job_id))
+    
+    def finish(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+               error: Optional[str] = None):
+        """Registra o fim do job: done, failed ou cancelled."""
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+            (status, time.time(), json.dumps(result) if result is not None else None, error, job_id)
+        )
+    
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancela um job na fila ou pede o cancelamento de um job em execução."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,)
+            )
+        finally:
+            conn.close()
+        return self.get(job_id)
+    
+    def cancel_requested(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        return bool(job and job['cancel_requested'])
+    
+    def recover(self) -> int:
+        """Devolve à fila os jobs que estavam em execução quando o serviço parou."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', stage = NULL, started_at = NULL "
+                "WHERE status = 'running' AND cancel_requested = 0"
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE status = 'running' AND cancel_requested = 1",
+                (time.time(),)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+
+class ShortsService:
+    """
+    Processa a fila de jobs com SERVICE_WORKERS threads e modelos residentes.
+    
+    Cada job tem o seu próprio ShortsGenerator (diretórios de trabalho e saída
+    separados), mas todos compartilham os modelos do Whisper já carregados e
+    os semáforos de SERVICE_STAGE_LIMITS: enquanto um job transcreve, outros
+    baixam vídeo, consultam o LLM ou renderizam. O objetivo é vazão (VODs
+    por hora), não a latência de um job isolado.
+    """
+    
+    def __init__(self, store: JobStore, workers: int = SERVICE_WORKERS,
+                 stage_limits: Dict[str, int] = SERVICE_STAGE_LIMITS,
+                 poll_interval: float = SERVICE_POLL_INTERVAL):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.stage_limits = dict(stage_limits)
+        self.stage_semaphores = {
+            stage: threading.BoundedSemaphore(limit) for stage, limit in self.stage_limits.items()
+        }
+        self.models: Dict[str, Any] = {}
+        self.started_at = time.time()
+        self.completed: List[float] = []  # Duração de cada job concluído nesta execução
+        self.stage_totals: Dict[str, Dict[str, Any]] = {}  # Métricas por etapa somadas entre os jobs
+        
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+    
+    def start(self, preload: bool = True):
+        """Recupera jobs interrompidos, carrega os modelos e inicia os workers."""
+        ensure_directories()
+        recovered = self.store.recover()
+        if recovered:
+            print(f"🔁 {recovered} jobs interrompidos voltaram para a fila")
+        
+        if preload:
+            self._preload_models()
+        
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"service-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self):
+        """Para de pegar jobs novos e aguarda os que estão em execução."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+    
+    def _preload_models(self):
+        """Carrega os modelos do Whisper antes do primeiro job."""
+        audio_processor = AudioProcessor(models=self.models)
+        for model_name in dict.fromkeys([audio_processor.discovery_model_name, audio_processor.model_name]):
+            audio_processor.load_model(model_name)
+    
+    def _new_generator(self, job_id: str, options: Dict[str, Any], on_stage=None) -> ShortsGenerator:
+        return ShortsGenerator(
+            audio_first=options['audio_first'],
+            job_id=job_id,
+            models=self.models,
+            stage_limits=self.stage_semaphores,
+            on_stage=on_stage
+        )
+    
+    def submit(self, source: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Enfileira um job; opções desconhecidas são rejeitadas."""
+        options = options or {}
+        unknown = set(options) - set(JOB_OPTIONS)
+        if unknown:
+            raise ValueError(f"Opções desconhecidas: {', '.join(sorted(unknown))}")
+        
+        job = self.store.create(source, {**JOB_OPTIONS, **options})
+        self._wakeup.set()
+        return job
+    
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.request_cancel(job_id)
+    
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            job = self.store.claim_next()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run_job(job)
+    
+    def _run_job(self, job: Dict[str, Any]):
+        """
+        Executa um job em diretórios próprios e registra o resultado.
+        
+        O diretório do job só é removido quando o job termina (concluído ou
+        cancelado), depois de copiar os relatórios de métricas para o
+        diretório de saída. Jobs que falham mantêm o diretório com os
+        checkpoints (retomáveis com `main.py --resume <id>`), e um job
+        devolvido à fila por recover() retoma das etapas com checkpoint.
+        """
+        job_id = job['id']
+        options = job['options']
+        work_dir = JOBS_DIR / job_id
+        started = time.perf_counter()
+        print(f"▶️  Job {job_id}: {job['source']}")
+        
+        def on_stage(stage: str):
+            if self.store.cancel_requested(job_id):
+                raise JobCancelled(f"Job {job_id} cancelado")
+            self.store.set_stage(job_id, stage)
+        
+        generator = None
+        status = 'failed'
+        try:
+            generator = self._new_generator(job_id, options, on_stage)
+            generate = generator.generate_shorts_pipelined if options['pipeline'] else generator.generate_shorts
+            created_shorts = generate(
+                job['source'],
+                create_individual=options['create_individual'],
+                create_compilation=options['create_compilation']
+            )
+            
+            elapsed = time.perf_counter() - started
+            self.store.finish(job_id, 'done', result={
+                'shorts': [str(path) for path in created_shorts],
+                'output_dir': str(generator.output_dir),
+                'seconds': elapsed,
+                'metrics': generator.metrics.report()['stages'],
+            })
+            status = 'done'
+            with self._lock:
+                self.completed.append(elapsed)
+            print(f"✅ Job {job_id}: {len(created_shorts)} shorts em {elapsed:.1f}s "
+                  f"({self.throughput():.1f} VODs/hora)")
+        
+        except JobCancelled as e:
+            self.store.finish(job_id, 'cancelled', error=str(e))
+            status = 'cancelled'
+            print(f"⏹️  Job {job_id} cancelado")
+        
+        except Exception as e:
+            self.store.finish(job_id, 'failed', error=str(e))
+            print(f"❌ Job {job_id} falhou: {e}")
+            print(f"   Checkpoints mantidos em {work_dir} (retome com: python src/main.py --resume {job_id})")
+        
+        finally:
+            if generator is not None:
+                with self._lock:
+                    metrics.accumulate(self.stage_totals, generator.metrics.report()['stages'])
+            if status != 'failed':
+                if generator is not None:
+                    self._keep_reports(work_dir, generator.output_dir)
+                shutil.rmtree(work_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _keep_reports(work_dir: Path, output_dir: Path):
+        """Copia metrics.json/metrics.prom do diretório do job para junto dos shorts."""
+        for name in ("metrics.json", "metrics.prom"):
+            report = work_dir / name
+            if report.exists():
+                try:
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(report, output_dir / name)
+                except OSError as e:
+                    print(f"Aviso: Erro ao copiar {name}: {e}")
+    
+    def throughput(self) -> float:
+        """Jobs concluídos por hora desde que o serviço iniciou."""
+        hours = (time.time() - self.started_at) / 3600
+        return len(self.completed) / hours if hours else 0.0
+    
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = list(self.completed)
+        return {
+            'workers': self.workers,
+            'stage_limits': dict(self.stage_limits),
+            'models_loaded': sorted(self.models),
+            'uptime_seconds': time.time() - self.started_at,
+            'jobs': self.store.counts(),
+            'completed_this_run': len(completed),
+            'average_job_seconds': sum(completed) / len(completed) if completed else None,
+            'vods_per_hour': self.throughput(),
+        }
+    
+    def prometheus(self) -> str:
+        """Métricas do serviço e das etapas (somadas entre os jobs) no formato do Prometheus."""
+        with self._lock:
+            stage_totals = json.loads(json.dumps(self.stage_totals))
+        
+        lines = ["# TYPE shorts_service_jobs gauge"]
+        lines += [f'shorts_service_jobs{{status="{status}"}} {count}' for status, count in self.store.counts().items()]
+        lines += [
+            "# TYPE shorts_service_vods_per_hour gauge",
+            f"shorts_service_vods_per_hour {self.throughput():.6g}",
+            "# TYPE shorts_service_uptime_seconds gauge",
+            f"shorts_service_uptime_seconds {time.time() - self.started_at:.1f}",
+        ]
+        return "\n".join(lines) + "\n" + metrics.format_prometheus(stage_totals)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """API JSON do serviço (a instância de ShortsService fica em server.service)."""
+    
+    def address_string(self) -> str:
+        # Em sockets Unix o endereço do cliente é vazio
+        return self.client_address[0] if self.client_address else "unix"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+    
+    def do_GET(self):
+        service: ShortsService = self.server.service
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        
+        if parts == ['health']:
+            self._send_json(200, service.health())
+        elif parts == ['metrics']:
+            body = service.prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif parts == ['jobs']:
+            self._send_json(200, {'jobs': service.store.list()})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = service.store.get(parts[1])
+            self._send_json(200 if job else 404, job or {'error': "Job não encontrado"})
+        else:
+            self._send_json(404, {'error': "Rota não encontrada"})
+    
+    def do_POST(self):
+        service: ShortsService = self.server.service
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        
+        if parts == ['jobs']:
+            try:
+                body = self._read_json()
+                source = body.pop('source', None)
+                if not source:
+                    raise ValueError("Campo 'source' obrigatório")
+                self._send_json(201, service.submit(source, body))
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {'error': str(e)})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            job = service.cancel(parts[1])
+            self._send_json(200 if job else 404, job or {'error': "Job não encontrado"})
+        else:
+            self._send_json(404, {'error': "Rota não encontrada"})
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Mesma API servida em um socket Unix."""
+    
+    daemon_threads = True
+
+
+def start_api_server(service: ShortsService, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                     socket_path: Optional[Path] = None):
+    """Inicia a API em uma thread e retorna o servidor."""
+    if socket_path:
+        Path(socket_path).unlink(missing_ok=True)
+        server = ThreadingUnixHTTPServer(str(socket_path), ServiceRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = service
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Função principal do serviço."""
+    parser = argparse.ArgumentParser(description="Serviço de geração de shorts com fila de jobs")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--socket", type=Path, help="Servir a API em um socket Unix em vez de TCP")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Jobs processados ao mesmo tempo")
+    parser.add_argument("--db", type=Path, default=SERVICE_DB_PATH, help="Banco SQLite da fila")
+    parser.add_argument("--no-preload", action="store_true", help="Carregar o Whisper só no primeiro job")
+    args = parser.parse_args()
+    
+    from config.settings import OPENAI_API_KEY
+    if not OPENAI_API_KEY:
+        print("❌ Erro: OPENAI_API_KEY não configurada.")
+        sys.exit(1)
+    
+    service = ShortsService(JobStore(args.db), workers=args.workers)
+    service.start(preload=not args.no_preload)
+    server = start_api_server(service, args.host, args.port, args.socket)
+    
+    address = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"🚀 Serviço pronto em {address} ({args.workers} workers, limites {SERVICE_STAGE_LIMITS})")
+    
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print("\n⏹️  Encerrando: aguardando os jobs em execução...")
+    finally:
+        server.shutdown()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
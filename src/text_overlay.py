@@ -0,0 +1,237 @@
+import io
+import math
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple, TYPE_CHECKING
+from config.settings import (
+    OVERLAY_FONT_FILE, OVERLAY_FONT_SIZE, OVERLAY_STROKE_WIDTH, OVERLAY_MARGIN,
+    OVERLAY_CACHE_DIR, OVERLAY_CACHE_MAX_BYTES, OVERLAY_MEMORY_ITEMS
+)
+from src import metrics
+from src.disk_cache import DiskCache
+
+# Pillow e numpy são importados sob demanda, como no restante do projeto
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image, ImageFont
+
+# Procuradas nos diretórios de fontes do sistema quando OVERLAY_FONT_FILE não é definido
+FONT_CANDIDATES = ("arialbd.ttf", "Arial Bold.ttf", "Arial-Bold.ttf",
+                   "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf")
+
+
+class TextOverlayRenderer:
+    """
+    Títulos dos shorts rasterizados uma única vez em imagens RGBA com Pillow.
+    
+    Cada combinação (texto, fonte, tamanho, contorno, largura do quadro) vira
+    um PNG em OVERLAY_CACHE_DIR, compartilhado entre os processos de
+    renderização e entre execuções, e as mais usadas ficam também em memória
+    (LRU). O FFmpeg recebe o PNG no filtro overlay; no MoviePy o título é
+    misturado com NumPy apenas na região que ele ocupa, sem compor o quadro
+    inteiro.
+    """
+    
+    def __init__(self, font_file: Optional[str] = OVERLAY_FONT_FILE, font_size: int = OVERLAY_FONT_SIZE,
+                 stroke_width: int = OVERLAY_STROKE_WIDTH, margin: int = OVERLAY_MARGIN,
+                 cache_dir: Path = OVERLAY_CACHE_DIR, max_bytes: int = OVERLAY_CACHE_MAX_BYTES,
+                 memory_items: int = OVERLAY_MEMORY_ITEMS):
+        self.font_file = font_file
+        self.font_size = font_size
+        self.stroke_width = stroke_width
+        self.margin = margin
+        self.memory_items = max(1, memory_items)
+        self.cache = DiskCache(cache_dir, max_bytes, suffix=".png")
+        self._font: Optional[Tuple["ImageFont.FreeTypeFont", str]] = None
+        self._images: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _load_font(self) -> Tuple["ImageFont.FreeTypeFont", str]:
+        """Carrega (uma vez) a fonte do título e retorna (fonte, nome usado na chave do cache)."""
+        if self._font is None:
+            from PIL import ImageFont
+            
+            candidates = ((self.font_file,) if self.font_file else ()) + FONT_CANDIDATES
+            for candidate in candidates:
+                try:
+                    self._font = (ImageFont.truetype(candidate, self.font_size), candidate)
+                    break
+                except OSError:
+                    if candidate == self.font_file:
+                        print(f"Aviso: Fonte '{candidate}' não encontrada, usando uma fonte do sistema")
+            else:
+                self._font = (ImageFont.load_default(self.font_size), "default")
+        
+        return self._font
+    
+    def cache_key(self, text: str, width: int) -> str:
+        """Chave do título: texto, fonte, tamanho, contorno e largura do quadro."""
+        _, font_name = self._load_font()
+        return DiskCache.make_key(text, font_name, self.font_size, self.stroke_width, width, self.margin)
+    
+    def _wrap(self, text: str, font: "ImageFont.FreeTypeFont", max_width: int) -> str:
+        """Quebra o texto em linhas que caibam em max_width pixels."""
+        lines = []
+        for word in text.split():
+            candidate = f"{lines[-1]} {word}" if lines else word
+            if lines and font.getlength(candidate) + 2 * self.stroke_width <= max_width:
+                lines[-1] = candidate
+            else:
+                lines.append(word)
+        return "\n".join(lines)
+    
+    def rasterize(self, text: str, width: int) -> "Image.Image":
+        """
+        Desenha o título (branco com contorno preto) recortado ao seu bounding box.
+        
+        Args:
+            text: Texto do título
+            width: Largura do quadro em que ele será aplicado
+        
+        Returns:
+            Image: Imagem RGBA do tamanho do texto
+        """
+        from PIL import Image, ImageDraw
+        
+        font, _ = self._load_font()
+        text = self._wrap(text, font, width - 2 * self.margin)
+        
+        probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+        left, top, right, bottom = probe.multiline_textbbox(
+            (0, 0), text, font=font, stroke_width=self.stroke_width, align="center"
+        )
+        left, top = math.floor(left), math.floor(top)
+        size = (max(1, math.ceil(right) - left), max(1, math.ceil(bottom) - top))
+        
+        image = Image.new("RGBA", size, (0, 0, 0, 0))
+        ImageDraw.Draw(image).multiline_text(
+            (-left, -top), text, font=font, fill="white",
+            stroke_width=self.stroke_width, stroke_fill="black", align="center"
+        )
+        metrics.record('overlays_rasterized')
+        return image
+    
+    def overlay_path(self, text: str, width: int) -> Path:
+        """
+        PNG do título no cache em disco (rasterizado só na primeira vez).
+        
+        Args:
+            text: Texto do título
+            width: Largura do quadro
+        
+        Returns:
+            Path: Caminho do PNG RGBA
+        """
+        key = self.cache_key(text, width)
+        path = self.cache.get_path(key)
+        if path is None:
+            buffer = io.BytesIO()
+            self.rasterize(text, width).save(buffer, format="PNG")
+            path = self.cache.set_bytes(key, buffer.getvalue())
+            if path is None:
+                raise Exception("Erro ao gravar o título no cache")
+        return path
+    
+    def overlay_image(self, text: str, width: int) -> "np.ndarray":
+        """
+        Título como array RGBA (altura, largura, 4), servido pela LRU em memória.
+        
+        Args:
+            text: Texto do título
+            width: Largura do quadro
+        
+        Returns:
+            np.ndarray: Pixels RGBA em uint8
+        """
+        import numpy as np
+        from PIL import Image
+        
+        key = self.cache_key(text, width)
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                return self._images[key]
+        
+        path = self.cache.get_path(key)
+        if path is not None:
+            with Image.open(path) as png:
+                image = np.asarray(png.convert("RGBA"))
+        else:
+            rendered = self.rasterize(text, width)
+            buffer = io.BytesIO()
+            rendered.save(buffer, format="PNG")
+            self.cache.set_bytes(key, buffer.getvalue())
+            image = np.asarray(rendered)
+        
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.memory_items:
+                self._images.popitem(last=False)
+        return image
+    
+    @staticmethod
+    def position(frame_size: Tuple[int, int], overlay_size: Tuple[int, int], position: str) -> Tuple[int, int]:
+        """
+        Canto superior esquerdo do título centralizado horizontalmente.
+        
+        Args:
+            frame_size: (largura, altura) do quadro
+            overlay_size: (largura, altura) do título
+            position: 'top', 'bottom' ou 'center'
+        
+        Returns:
+            tuple: (x, y) em pixels
+        """
+        frame_w, frame_h = frame_size
+        overlay_w, overlay_h = overlay_size
+        if position == 'top':
+            y = 50
+        elif position == 'bottom':
+            y = frame_h - 100
+        else:  # center
+            y = (frame_h - overlay_h) // 2
+        return (frame_w - overlay_w) // 2, y
+    
+    @staticmethod
+    def make_blender(overlay: "np.ndarray", x: int, y: int) -> Callable[["np.ndarray"], "np.ndarray"]:
+        """
+        Função que mistura o título RGBA em um quadro RGB na posição (x, y).
+        
+        A cor pré-multiplicada e o alfa inverso são calculados uma vez; por
+        quadro só a região coberta pelo título é lida e escrita.
+        
+        Args:
+            overlay: Título RGBA (altura, largura, 4) em uint8
+            x: Coluna do canto superior esquerdo
+            y: Linha do canto superior esquerdo
+        
+        Returns:
+            Callable: quadro -> quadro com o título (para clip.fl_image)
+        """
+        import numpy as np
+        
+        alpha = overlay[..., 3:4].astype(np.uint16)
+        premultiplied = overlay[..., :3].astype(np.uint16) * alpha
+        inverse_alpha = 255 - alpha
+        overlay_h, overlay_w = overlay.shape[:2]
+        
+        def blend(frame: "np.ndarray") -> "np.ndarray":
+            frame_h, frame_w = frame.shape[:2]
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + overlay_w, frame_w), min(y + overlay_h, frame_h)
+            if x0 >= x1 or y0 >= y1:
+                return frame
+            
+            if not frame.flags.writeable:
+                frame = frame.copy()
+            
+            # Parte do título que cabe no quadro
+            rows = slice(y0 - y, y1 - y)
+            cols = slice(x0 - x, x1 - x)
+            region = frame[y0:y1, x0:x1]
+            mixed = premultiplied[rows, cols] + region * inverse_alpha[rows, cols]
+            region[...] = (mixed + 127) // 255
+            return frame
+        
+        return blend
@@ -0,0 +1,344 @@
+import sys
+import base64
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
+
+
+def _encode_array(values: array) -> str:
+    """Serializa um array numérico em base64 (little-endian)."""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _decode_array(typecode: str, data: str) -> array:
+    """Reconstrói um array serializado por _encode_array."""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(data))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+class Transcript:
+    """
+    Transcrição em formato colunar.
+    
+    Os segmentos ficam em arrays paralelos (início, fim, deslocamento do texto)
+    e o texto de todos eles em uma única string, o que ocupa uma fração da
+    memória de uma lista de dicionários. Palavras com timestamps são opcionais
+    e seguem o mesmo formato.
+    
+    Consultas por intervalo de tempo usam busca binária (O(log n)) e devolvem
+    um TranscriptSlice, uma visão sem cópia. Iterar ou indexar com um inteiro
+    produz dicionários no formato antigo ({'start', 'end', 'text', 'duration'}),
+    então o código que espera uma lista de segmentos continua funcionando.
+    As palavras ficam fora desses dicionários: use words_of() ou as colunas
+    word_starts/word_ends.
+    """
+    
+    def __init__(self, starts: Iterable[float] = (), ends: Iterable[float] = (),
+                 texts: Iterable[str] = (), words: Optional[Iterable[Iterable[Dict[str, Any]]]] = None):
+        self.starts = array('d', starts)
+        self.ends = array('d', ends)
+        
+        texts = list(texts)
+        self.text_offsets = array('q', [0])
+        for text in texts:
+            self.text_offsets.append(self.text_offsets[-1] + len(text))
+        self._text = "".join(texts)
+        
+        # Palavras (opcional): colunas próprias + índice da primeira palavra de cada segmento
+        self.word_starts = array('d')
+        self.word_ends = array('d')
+        self.word_text_offsets = array('q', [0])
+        self.segment_word_offsets = array('q', [0])
+        self._word_text = ""
+        self.has_words = words is not None
+        if words is not None:
+            self._set_words(words)
+        
+        self._build_index()
+    
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> "Transcript":
+        """Cria a transcrição a partir de uma lista de segmentos (dicionários)."""
+        if isinstance(segments, Transcript):
+            return segments
+        if isinstance(segments, TranscriptSlice):
+            return segments.copy()
+        
+        segments = list(segments)
+        has_words = any('words' in segment for segment in segments)
+        return cls(
+            (segment['start'] for segment in segments),
+            (segment['end'] for segment in segments),
+            (segment['text'] for segment in segments),
+            [segment.get('words', []) for segment in segments] if has_words else None
+        )
+    
+    def _set_words(self, words_per_segment: Iterable[Iterable[Dict[str, Any]]]):
+        word_texts = []
+        for words in words_per_segment:
+            for word in words:
+                self.word_starts.append(word['start'])
+                self.word_ends.append(word['end'])
+                word_texts.append(word['word'])
+                self.word_text_offsets.append(self.word_text_offsets[-1] + len(word['word']))
+            self.segment_word_offsets.append(len(self.word_starts))
+        self._word_text = "".join(word_texts)
+    
+    def _build_index(self):
+        """Máximo acumulado dos fins: monotônico mesmo com segmentos sobrepostos."""
+        self._max_ends = array('d')
+        current = float('-inf')
+        for end in self.ends:
+            current = max(current, end)
+            self._max_ends.append(current)
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.segment(i)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "TranscriptSlice"]:
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Transcript não suporta fatias com passo")
+            return TranscriptSlice(self, lo, max(lo, hi))
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de segmento fora do intervalo")
+        return self.segment(index)
+    
+    def text_at(self, index: int) -> str:
+        """Texto do segmento, sem montar o dicionário completo."""
+        return self._text[self.text_offsets[index]:self.text_offsets[index + 1]]
+    
+    def segment(self, index: int) -> Dict[str, Any]:
+        """Monta o dicionário de um segmento."""
+        start, end = self.starts[index], self.ends[index]
+        segment = {
+            'start': start,
+            'end': end,
+            'text': self.text_at(index),
+            'duration': end - start
+        }
+        return segment
+    
+    def words_of(self, index: int) -> List[Dict[str, Any]]:
+        """Palavras (com timestamps) de um segmento."""
+        if not self.has_words:
+            return []
+        
+        words = []
+        for w in range(self.segment_word_offsets[index], self.segment_word_offsets[index + 1]):
+            words.append({
+                'start': self.word_starts[w],
+                'end': self.word_ends[w],
+                'word': self._word_text[self.word_text_offsets[w]:self.word_text_offsets[w + 1]]
+            })
+        return words
+    
+    def index_range(self, start: float, end: float) -> tuple:
+        """
+        Índices [lo, hi) dos segmentos que podem sobrepor o intervalo.
+        
+        Todo segmento i com starts[i] < end e ends[i] > start está em [lo, hi).
+        """
+        hi = bisect_left(self.starts, end)
+        lo = bisect_right(self._max_ends, start, 0, hi)
+        return lo, hi
+    
+    def range(self, start: float, end: float) -> "TranscriptSlice":
+        """
+        Segmentos que se sobrepõem ao intervalo [start, end), sem cópia.
+        
+        Args:
+            start: Início do intervalo em segundos
+            end: Fim do intervalo em segundos
+        
+        Returns:
+            TranscriptSlice: Visão dos segmentos do intervalo
+        """
+        lo, hi = self.index_range(start, end)
+        
+        # Segmentos sobrepostos podem deixar algum que termina antes de start nas bordas
+        while lo < hi and self.ends[lo] <= start:
+            lo += 1
+        
+        return TranscriptSlice(self, lo, hi)
+    
+    def shifted(self, offset: float) -> "Transcript":
+        """Cópia com todos os timestamps (segmentos e palavras) deslocados de offset."""
+        transcript = Transcript()
+        transcript.starts = array('d', (t + offset for t in self.starts))
+        transcript.ends = array('d', (t + offset for t in self.ends))
+        transcript.text_offsets = array('q', self.text_offsets)
+        transcript._text = self._text
+        
+        transcript.has_words = self.has_words
+        transcript.word_starts = array('d', (t + offset for t in self.word_starts))
+        transcript.word_ends = array('d', (t + offset for t in self.word_ends))
+        transcript.word_text_offsets = array('q', self.word_text_offsets)
+        transcript.segment_word_offsets = array('q', self.segment_word_offsets)
+        transcript._word_text = self._word_text
+        
+        transcript._build_index()
+        return transcript
+    
+    def replace_ranges(self, replacements: List[tuple]) -> "Transcript":
+        """
+        Cria uma nova transcrição trocando intervalos de segmentos.
+        
+        Args:
+            replacements: Tuplas (lo, hi, Transcript) que substituem os segmentos
+                [lo, hi) desta transcrição; os intervalos não podem se sobrepor
+        
+        Returns:
+            Transcript: Nova transcrição, em ordem de tempo
+        """
+        starts, ends, texts, words = [], [], [], []
+        
+        def take(source: Transcript, lo: int, hi: int):
+            starts.extend(source.starts[lo:hi])
+            ends.extend(source.ends[lo:hi])
+            texts.extend(source.text_at(i) for i in range(lo, hi))
+            words.extend(source.words_of(i) for i in range(lo, hi))
+        
+        position = 0
+        for lo, hi, replacement in sorted(replacements, key=lambda item: item[0]):
+            take(self, position, lo)
+            take(replacement, 0, len(replacement))
+            position = hi
+        take(self, position, len(self))
+        
+        has_words = self.has_words or any(item[2].has_words for item in replacements)
+        return Transcript(starts, ends, texts, words if has_words else None)
+    
+    @property
+    def text(self) -> str:
+        """Texto completo, com os segmentos separados por espaço."""
+        return " ".join(self.text_at(i) for i in range(len(self)))
+    
+    def to_segments(self) -> List[Dict[str, Any]]:
+        """Converte para a lista de dicionários usada anteriormente."""
+        return list(self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialização compacta (arrays em base64), adequada para JSON."""
+        data = {
+            'version': 1,
+            'starts': _encode_array(self.starts),
+            'ends': _encode_array(self.ends),
+            'text_offsets': _encode_array(self.text_offsets),
+            'text': self._text,
+        }
+        if self.has_words:
+            data['words'] = {
+                'starts': _encode_array(self.word_starts),
+                'ends': _encode_array(self.word_ends),
+                'text_offsets': _encode_array(self.word_text_offsets),
+                'segment_offsets': _encode_array(self.segment_word_offsets),
+                'text': self._word_text,
+            }
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Transcript":
+        """Reconstrói uma transcrição serializada por to_dict."""
+        transcript = cls()
+        transcript.starts = _decode_array('d', data['starts'])
+        transcript.ends = _decode_array('d', data['ends'])
+        transcript.text_offsets = _decode_array('q', data['text_offsets'])
+        transcript._text = data['text']
+        
+        words = data.get('words')
+        if words is not None:
+            transcript.has_words = True
+            transcript.word_starts = _decode_array('d', words['starts'])
+            transcript.word_ends = _decode_array('d', words['ends'])
+            transcript.word_text_offsets = _decode_array('q', words['text_offsets'])
+            transcript.segment_word_offsets = _decode_array('q', words['segment_offsets'])
+            transcript._word_text = words['text']
+        
+        transcript._build_index()
+        return transcript
+
+
+class TranscriptSlice:
+    """Visão de um intervalo contíguo de segmentos de uma Transcript, sem cópia."""
+    
+    def __init__(self, transcript: Transcript, lo: int, hi: int):
+        self.transcript = transcript
+        self.lo = lo
+        self.hi = hi
+    
+    def __len__(self) -> int:
+        return self.hi - self.lo
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.lo, self.hi):
+            yield self.transcript.segment(i)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "TranscriptSlice"]:
+        if isinstance(index, slice):
+            lo, hi, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TranscriptSlice não suporta fatias com passo")
+            return TranscriptSlice(self.transcript, self.lo + lo, self.lo + max(lo, hi))
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice de segmento fora do intervalo")
+        return self.transcript.segment(self.lo + index)
+    
+    @property
+    def starts(self) -> memoryview:
+        return memoryview(self.transcript.starts)[self.lo:self.hi]
+    
+    @property
+    def ends(self) -> memoryview:
+        return memoryview(self.transcript.ends)[self.lo:self.hi]
+    
+    @property
+    def text(self) -> str:
+        """Texto dos segmentos do intervalo, separados por espaço."""
+        return " ".join(self.transcript.text_at(i) for i in range(self.lo, self.hi))
+    
+    def range(self, start: float, end: float) -> "TranscriptSlice":
+        """Segmentos deste intervalo que se sobrepõem a [start, end)."""
+        inner = self.transcript.range(start, end)
+        # Consultas fora da fatia resultam em uma fatia vazia (lo == hi), como em Transcript.range
+        lo = min(self.hi, max(self.lo, inner.lo))
+        hi = max(lo, min(self.hi, inner.hi))
+        return TranscriptSlice(self.transcript, lo, hi)
+    
+    def copy(self) -> Transcript:
+        """Cria uma Transcript independente apenas com estes segmentos."""
+        transcript = self.transcript
+        return Transcript(
+            transcript.starts[self.lo:self.hi],
+            transcript.ends[self.lo:self.hi],
+            (transcript.text_at(i) for i in range(self.lo, self.hi)),
+            [transcript.words_of(i) for i in range(self.lo, self.hi)] if transcript.has_words else None
+        )
+    
+    def to_segments(self) -> List[Dict[str, Any]]:
+        return list(self)
+    
+    def __reduce__(self):
+        # Ao enviar para outro processo, copiar só o intervalo e não a transcrição inteira
+        return (_rebuild_slice, (self.copy(),))
+
+
+def _rebuild_slice(transcript: Transcript) -> TranscriptSlice:
+    return TranscriptSlice(transcript, 0, len(transcript))
@@ -0,0 +1,143 @@
+import re
+from typing import List, Dict, Any, Optional
+from config.settings import LLM_BUCKET_SECONDS, LLM_PROMPT_TOKEN_BUDGET, FILLER_WORDS
+
+WORD_PATTERN = re.compile(r"\S+")
+NON_WORD_PATTERN = re.compile(r"[^\w]+")
+
+# Limite de agrupamento antes de recorrer ao corte de texto
+MAX_BUCKET_SECONDS = 120
+# Texto mínimo mantido em cada bloco ao cortar
+MIN_LINE_CHARS = 20
+
+
+class TranscriptCompactor:
+    """
+    Compacta a transcrição antes de enviá-la ao LLM.
+    
+    Segmentos adjacentes são agrupados em blocos de tempo com um único
+    timestamp [HH:MM:SS], palavras de preenchimento e repetições são
+    removidas e o resultado é ajustado a um orçamento de tokens.
+    """
+    
+    def __init__(self, bucket_seconds: float = LLM_BUCKET_SECONDS,
+                 token_budget: int = LLM_PROMPT_TOKEN_BUDGET):
+        self.bucket_seconds = bucket_seconds
+        self.token_budget = token_budget
+        self._encoding = None
+        self._encoding_loaded = False
+    
+    def compact(self, segments: List[Dict[str, Any]]) -> str:
+        """
+        Gera o texto compactado da transcrição.
+        
+        Args:
+            segments: Lista de segmentos da transcrição
+        
+        Returns:
+            str: Linhas "[HH:MM:SS] texto", dentro do orçamento de tokens
+        """
+        cleaned = [(segment['start'], self._clean_text(segment['text'])) for segment in segments]
+        cleaned = [(start, text) for start, text in cleaned if text]
+        
+        bucket_seconds = self.bucket_seconds
+        lines = self._bucket(cleaned, bucket_seconds)
+        tokens = self.count_tokens("\n".join(lines))
+        
+        # Blocos maiores economizam timestamps; dobrar até caber ou atingir o limite
+        while tokens > self.token_budget and bucket_seconds < MAX_BUCKET_SECONDS:
+            bucket_seconds = min(bucket_seconds * 2, MAX_BUCKET_SECONDS)
+            lines = self._bucket(cleaned, bucket_seconds)
+            tokens = self.count_tokens("\n".join(lines))
+        
+        if tokens > self.token_budget:
+            lines = self._truncate_lines(lines, self.token_budget / tokens)
+            tokens = self.count_tokens("\n".join(lines))
+        
+        # O mínimo de caracteres por bloco ainda pode estourar o orçamento
+        if tokens > self.token_budget:
+            lines = self._drop_lines(lines, tokens)
+        
+        return "\n".join(lines)
+    
+    def count_tokens(self, text: str) -> int:
+        """Estima tokens com o tiktoken, se instalado, ou ~4 caracteres por token."""
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return (len(text) + 3) // 4
+    
+    def _get_encoding(self):
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            try:
+                import tiktoken
+                self._encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                self._encoding = None
+        return self._encoding
+    
+    def _clean_text(self, text: str) -> str:
+        """Remove palavras de preenchimento e repetições consecutivas."""
+        words = []
+        previous: Optional[str] = None
+        
+        for word in WORD_PATTERN.findall(text):
+            normalized = NON_WORD_PATTERN.sub("", word.lower())
+            if not normalized or normalized in FILLER_WORDS:
+                continue
+            if normalized == previous:
+                continue
+            words.append(word)
+            previous = normalized
+        
+        return " ".join(words)
+    
+    def _bucket(self, cleaned: List[tuple], bucket_seconds: float) -> List[str]:
+        """Agrupa segmentos consecutivos em blocos de até bucket_seconds."""
+        lines = []
+        bucket_start = None
+        bucket_texts = []
+        
+        for start, text in cleaned:
+            if bucket_start is None or start >= bucket_start + bucket_seconds:
+                if bucket_texts:
+                    lines.append(f"[{self._format_timestamp(bucket_start)}] {' '.join(bucket_texts)}")
+                bucket_start = start
+                bucket_texts = []
+            bucket_texts.append(text)
+        
+        if bucket_texts:
+            lines.append(f"[{self._format_timestamp(bucket_start)}] {' '.join(bucket_texts)}")
+        
+        return lines
+    
+    def _truncate_lines(self, lines: List[str], ratio: float) -> List[str]:
+        """Corta o texto de cada bloco proporcionalmente, mantendo os timestamps."""
+        truncated = []
+        
+        for line in lines:
+            timestamp, _, text = line.partition("] ")
+            max_chars = max(MIN_LINE_CHARS, int(len(text) * ratio))
+            if len(text) > max_chars:
+                text = text[:max_chars].rsplit(" ", 1)[0] + "…"
+            truncated.append(f"{timestamp}] {text}")
+        
+        return truncated
+    
+    def _drop_lines(self, lines: List[str], tokens: int) -> List[str]:
+        """Descarta blocos espalhados pela janela (não só o fim) até caber no orçamento."""
+        keep = min(len(lines) - 1, len(lines) * self.token_budget // tokens)
+        while keep > 1:
+            kept = [lines[i * len(lines) // keep] for i in range(keep)]
+            if self.count_tokens("\n".join(kept)) <= self.token_budget:
+                return kept
+            keep -= 1
+        return lines[:1]
+    
+    def _format_timestamp(self, seconds: float) -> str:
+        """Formata timestamp em formato HH:MM:SS."""
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        secs = int(seconds % 60)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
@@ -0,0 +1,205 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Tuple, TYPE_CHECKING
+from config.settings import (
+    VAD_FRAME_MS, VAD_THRESHOLD_DB, VAD_MIN_SPEECH, VAD_MIN_SILENCE, VAD_PADDING
+)
+
+# numpy é importado sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000  # Mesma taxa do áudio decodificado pelo AudioProcessor
+BLOCK_FRAMES = 65536  # Frames processados por bloco (limita a memória)
+NOISE_PERCENTILE = 10  # Percentil de energia usado como piso de ruído
+ABSOLUTE_FLOOR_DB = -55.0  # Abaixo disso é sempre silêncio
+SPEECH_PERCENTILE = 90  # Percentil de energia usado como nível típico da fala
+UNVOICED_ZCR = 0.25  # Taxa de cruzamentos por zero típica de fricativas (s, f, x)
+UNVOICED_MARGIN_DB = 6.0  # Fricativas podem ficar até esta margem abaixo do limiar
+
+
+class VoiceActivityDetector:
+    """
+    Detector de voz baseado em energia e taxa de cruzamentos por zero (CPU).
+    
+    O limiar é relativo ao piso de ruído do próprio áudio: frames acima de
+    piso + VAD_THRESHOLD_DB são fala, assim como frames um pouco mais fracos
+    com muitos cruzamentos por zero (consoantes surdas). Se a relação
+    sinal-ruído (percentil 90 contra percentil 10) for menor que essa margem,
+    o áudio não tem pausas distinguíveis (fala contínua sobre música ou som
+    de jogo) e só o silêncio absoluto é descartado. Trechos de fala
+    próximos são unidos, trechos curtos demais descartados e cada região
+    recebe uma margem, para não cortar o começo e o fim das palavras.
+    """
+    
+    def __init__(self, frame_ms: float = VAD_FRAME_MS, threshold_db: float = VAD_THRESHOLD_DB,
+                 min_speech: float = VAD_MIN_SPEECH, min_silence: float = VAD_MIN_SILENCE,
+                 padding: float = VAD_PADDING, sample_rate: int = SAMPLE_RATE):
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.min_speech = min_speech
+        self.min_silence = min_silence
+        self.padding = padding
+        self.sample_rate = sample_rate
+    
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Parâmetros que alteram o resultado (usados na chave do cache)."""
+        return {
+            # Muda quando o algoritmo muda, para não reaproveitar transcrições antigas
+            'version': 2,
+            'frame_size': self.frame_size,
+            'threshold_db': self.threshold_db,
+            'min_speech': self.min_speech,
+            'min_silence': self.min_silence,
+            'padding': self.padding,
+        }
+    
+    def detect(self, audio: "np.ndarray") -> List[Tuple[float, float]]:
+        """
+        Encontra as regiões com fala.
+        
+        Args:
+            audio: Amostras mono float32 em [-1, 1]
+        
+        Returns:
+            List: Regiões (início, fim) em segundos, ordenadas e sem sobreposição
+        """
+        import numpy as np
+        
+        n_frames = len(audio) // self.frame_size
+        if n_frames == 0:
+            return []
+        
+        frames = audio[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        energy_db = np.empty(n_frames, np.float32)
+        zcr = np.empty(n_frames, np.float32)
+        
+        for block_start in range(0, n_frames, BLOCK_FRAMES):
+            block = frames[block_start:block_start + BLOCK_FRAMES]
+            block_slice = slice(block_start, block_start + len(block))
+            rms = np.sqrt(np.mean(np.square(block, dtype=np.float32), axis=1))
+            energy_db[block_slice] = 20 * np.log10(rms + 1e-6)
+            zcr[block_slice] = np.mean(np.signbit(block[:, 1:]) != np.signbit(block[:, :-1]), axis=1)
+        
+        noise_floor, speech_level = np.percentile(energy_db, [NOISE_PERCENTILE, SPEECH_PERCENTILE])
+        if speech_level - noise_floor < self.threshold_db:
+            # Sem contraste entre pausas e fala: o piso relativo descartaria tudo
+            threshold = ABSOLUTE_FLOOR_DB
+        else:
+            threshold = max(noise_floor + self.threshold_db, ABSOLUTE_FLOOR_DB)
+        
+        voiced = energy_db > threshold
+        unvoiced = (zcr > UNVOICED_ZCR) & (energy_db > max(threshold - UNVOICED_MARGIN_DB, ABSOLUTE_FLOOR_DB))
+        speech = voiced | unvoiced
+        
+        # Bordas das sequências de frames com fala
+        edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        frame_seconds = self.frame_size / self.sample_rate
+        return self._smooth(starts * frame_seconds, ends * frame_seconds, len(audio) / self.sample_rate)
+    
+    def is_silent(self, audio: "np.ndarray") -> bool:
+        """Se o áudio inteiro está abaixo de ABSOLUTE_FLOOR_DB (silêncio digital)."""
+        import numpy as np
+        
+        if len(audio) == 0:
+            return True
+        rms = np.sqrt(np.mean(np.square(audio, dtype=np.float32)))
+        return bool(20 * np.log10(rms + 1e-6) <= ABSOLUTE_FLOOR_DB)
+    
+    def _smooth(self, starts: "np.ndarray", ends: "np.ndarray", duration: float) -> List[Tuple[float, float]]:
+        """Une pausas curtas, descarta falas curtas e aplica a margem."""
+        regions: List[List[float]] = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if regions and start - regions[-1][1] < self.min_silence:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+        
+        padded: List[Tuple[float, float]] = []
+        for start, end in regions:
+            if end - start < self.min_speech:
+                continue
+            start = max(0.0, start - self.padding)
+            end = min(duration, end + self.padding)
+            if padded and start <= padded[-1][1]:
+                padded[-1] = (padded[-1][0], end)
+            else:
+                padded.append((start, end))
+        
+        return padded
+    
+    def extract_speech(self, audio: "np.ndarray") -> Tuple["np.ndarray", "SpeechTimeline"]:
+        """
+        Concatena só as regiões com fala.
+        
+        Args:
+            audio: Amostras mono float32 em [-1, 1]
+        
+        Returns:
+            tuple: (amostras_com_fala, linha_do_tempo para remapear timestamps)
+        """
+        import numpy as np
+        
+        regions = self.detect(audio)
+        pieces = []
+        compact_samples = 0
+        timeline = SpeechTimeline(len(audio) / self.sample_rate)
+        
+        for start, end in regions:
+            first, last = int(start * self.sample_rate), int(end * self.sample_rate)
+            timeline.add(compact_samples / self.sample_rate, first / self.sample_rate, last / self.sample_rate)
+            pieces.append(audio[first:last])
+            compact_samples += last - first
+        
+        speech = np.concatenate(pieces) if pieces else np.zeros(0, dtype=audio.dtype)
+        return speech, timeline
+
+
+class SpeechTimeline:
+    """Mapeia tempos do áudio só com fala de volta para o áudio original."""
+    
+    def __init__(self, original_duration: float):
+        self.original_duration = original_duration
+        self.compact_starts: List[float] = []
+        self.original_starts: List[float] = []
+        self.compact_duration = 0.0
+    
+    def __len__(self) -> int:
+        return len(self.compact_starts)
+    
+    def add(self, compact_start: float, original_start: float, original_end: float):
+        """Registra uma região de fala colocada em compact_start no áudio compacto."""
+        self.compact_starts.append(compact_start)
+        self.original_starts.append(original_start)
+        self.compact_duration = compact_start + (original_end - original_start)
+    
+    @property
+    def skipped_fraction(self) -> float:
+        """Fração do áudio original que não foi transcrita."""
+        if not self.original_duration:
+            return 0.0
+        return 1.0 - self.compact_duration / self.original_duration
+    
+    def to_original(self, seconds: float, is_end: bool = False) -> float:
+        """
+        Converte um tempo do áudio compacto para o áudio original.
+        
+        Um fim exatamente na junção de duas regiões pertence à região anterior.
+        """
+        if not self.compact_starts:
+            return seconds
+        search = bisect_left if is_end else bisect_right
+        region = max(0, search(self.compact_starts, seconds) - 1)
+        return self.original_starts[region] + (seconds - self.compact_starts[region])
+    
+    def remap_segments(self, segments: List[Dict[str, Any]]):
+        """Remapeia (in place) os timestamps de segmentos e palavras do Whisper."""
+        for segment in segments:
+            segment['start'] = self.to_original(segment['start'])
+            segment['end'] = self.to_original(segment['end'], is_end=True)
+            for word in segment.get('words', []):
+                word['start'] = self.to_original(word['start'])
+                word['end'] = self.to_original(word['end'], is_end=True)
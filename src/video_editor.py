@@ -1,21 +1,71 @@
+import json
+import os
 import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from moviepy.editor import VideoFileClip, concatenate_videoclips, CompositeVideoClip, TextClip
-from config.settings import DATA_DIR, OUTPUT_DIR, FFMPEG_PATH, SHORT_DURATION
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from config.settings import (
+    DATA_DIR, OUTPUT_DIR, FFMPEG_PATH, SHORT_DURATION, SHORT_RESOLUTION, RENDER_BACKEND,
+    MAX_INDIVIDUAL_SHORTS, RENDER_WORKERS, RENDER_THREADS_PER_JOB
+)
+from src import metrics
+from src.ffmpeg_renderer import FFmpegRenderer
+from src.clip_pool import VideoReaderPool
+from src.text_overlay import TextOverlayRenderer
+
+# moviepy.editor é importado sob demanda para manter a inicialização da CLI rápida
+if TYPE_CHECKING:
+    from moviepy.editor import VideoFileClip
+
+COMPILATION_FILENAME = "compilation_short.mp4"
+
+
+def _render_short_job(render_backend: str, output_dir: Path, data_dir: Path, threads: int,
+                      video_path: Path, moment: Dict[str, Any], output_filename: str) -> tuple:
+    """
+    Renderiza um short em um processo do pool de renderização.
+    
+    O editor do processo usa os diretórios do job que o criou: temporários
+    (ex.: o áudio do MoviePy) não podem cair no data/ compartilhado.
+    
+    Returns:
+        tuple: (caminho_do_short, contadores de métricas do processo)
+    """
+    editor = VideoEditor(render_backend=render_backend, render_threads=threads)
+    editor.output_dir = output_dir
+    editor.data_dir = data_dir
+    try:
+        with metrics.capture() as counters:
+            short_path = editor.create_short_from_moment(video_path, moment, output_filename)
+        return short_path, counters
+    finally:
+        editor.close()
 
 
 class VideoEditor:
     """Classe responsável por editar e criar os shorts de vídeo."""
     
-    def __init__(self):
+    def __init__(self, render_backend: str = RENDER_BACKEND, render_threads: Optional[int] = None):
         self.data_dir = DATA_DIR
         self.output_dir = OUTPUT_DIR
+        self.render_backend = render_backend
+        self.render_threads = render_threads
+        self.text_overlay = TextOverlayRenderer()
+        self.ffmpeg_renderer = FFmpegRenderer(text_overlay=self.text_overlay)
+        self.reader_pool = VideoReaderPool()
+    
+    def close(self):
+        """Fecha os leitores de vídeo mantidos pelo pool."""
+        self.reader_pool.close_all()
         
-    def extract_video_segment(self, video_path: Path, start_time: float, end_time: float) -> VideoFileClip:
+    def extract_video_segment(self, video_path: Path, start_time: float, end_time: float) -> "VideoFileClip":
         """
         Extrai um segmento específico do vídeo.
         
+        O segmento é servido pelo leitor compartilhado do VideoReaderPool; ele
+        continua válido até o pool liberar o arquivo (close()).
+        
         Args:
             video_path: Caminho para o arquivo de vídeo
             start_time: Tempo de início em segundos
@@ -25,53 +75,36 @@ class VideoEditor:
             VideoFileClip: Clipe do segmento extraído
         """
         try:
-            clip = VideoFileClip(str(video_path))
-            segment = clip.subclip(start_time, end_time)
-            return segment
+            return self.reader_pool.subclip(video_path, start_time, end_time)
             
         except Exception as e:
             raise Exception(f"Erro ao extrair segmento: {str(e)}")
     
-    def add_text_overlay(self, clip: VideoFileClip, text: str, position: str = 'bottom') -> CompositeVideoClip:
+    def add_text_overlay(self, clip: "VideoFileClip", text: str, position: str = 'bottom') -> "VideoFileClip":
         """
         Adiciona texto sobreposto ao vídeo.
         
+        O título vem já rasterizado do TextOverlayRenderer e é misturado em
+        cada quadro apenas na região que ocupa.
+        
         Args:
             clip: Clipe de vídeo
             text: Texto a ser adicionado
             position: Posição do texto ('top', 'bottom', 'center')
             
         Returns:
-            CompositeVideoClip: Clipe com texto sobreposto
+            VideoFileClip: Clipe com texto sobreposto
         """
         try:
-            # Configurações do texto
-            txt_clip = TextClip(
-                text,
-                fontsize=50,
-                color='white',
-                font='Arial-Bold',
-                stroke_color='black',
-                stroke_width=2
-            ).set_duration(clip.duration)
-            
-            # Posicionamento
-            if position == 'top':
-                txt_clip = txt_clip.set_position(('center', 50))
-            elif position == 'bottom':
-                txt_clip = txt_clip.set_position(('center', clip.h - 100))
-            else:  # center
-                txt_clip = txt_clip.set_position('center')
-            
-            # Compor vídeo com texto
-            final_clip = CompositeVideoClip([clip, txt_clip])
-            return final_clip
+            overlay = self.text_overlay.overlay_image(text, clip.w)
+            x, y = self.text_overlay.position(clip.size, (overlay.shape[1], overlay.shape[0]), position)
+            return clip.fl_image(self.text_overlay.make_blender(overlay, x, y))
             
         except Exception as e:
             print(f"Aviso: Erro ao adicionar texto: {str(e)}")
             return clip  # Retorna o clipe original se falhar
     
-    def resize_for_shorts(self, clip: VideoFileClip, target_resolution: tuple = (1080, 1920)) -> VideoFileClip:
+    def resize_for_shorts(self, clip: "VideoFileClip", target_resolution: tuple = (1080, 1920)) -> "VideoFileClip":
         """
         Redimensiona o vídeo para formato de shorts (vertical).
         
@@ -110,6 +143,9 @@ class VideoEditor:
         """
         Cria um short a partir de um momento identificado.
         
+        Usa o backend configurado em RENDER_BACKEND; se o FFmpeg falhar,
+        o short é renderizado novamente pelo MoviePy.
+        
         Args:
             video_path: Caminho para o vídeo original
             moment: Dicionário com informações do momento
@@ -123,7 +159,42 @@ class VideoEditor:
             output_filename = f"short_{safe_title[:30]}.mp4"
         
         output_path = self.output_dir / output_filename
+        print(f"Criando short: {output_filename}")
         
+        # Renderizar com outro nome e renomear no fim: se o short existe, está completo
+        partial_path = output_path.with_name(f"{output_path.stem}.partial{output_path.suffix}")
+        try:
+            self._render_segment(video_path, moment, partial_path)
+            os.replace(partial_path, output_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+        
+        metrics.record('shorts_rendered')
+        metrics.record('rendered_seconds', min(moment['end'] - moment['start'], SHORT_DURATION))
+        
+        print(f"Short criado: {output_path}")
+        return output_path
+    
+    def _render_segment(self, video_path: Path, moment: Dict[str, Any], output_path: Path) -> Path:
+        """Renderiza o momento com o backend configurado (MoviePy como fallback)."""
+        video_path, moment = self._moment_source(video_path, moment)
+        
+        if self.render_backend == "ffmpeg":
+            try:
+                end = min(moment['end'], moment['start'] + SHORT_DURATION)
+                self.ffmpeg_renderer.render(
+                    video_path, moment['start'], end, output_path, moment.get('title'), 'top',
+                    threads=self.render_threads
+                )
+                return output_path
+                
+            except Exception as e:
+                print(f"Aviso: {e}. Usando MoviePy como fallback.")
+        
+        return self._render_short_moviepy(video_path, moment, output_path)
+    
+    def _render_short_moviepy(self, video_path: Path, moment: Dict[str, Any], output_path: Path) -> Path:
+        """Renderiza um short decodificando os quadros com MoviePy."""
         try:
             # Extrair segmento
             clip = self.extract_video_segment(
@@ -143,46 +214,57 @@ class VideoEditor:
             if clip.duration > SHORT_DURATION:
                 clip = clip.subclip(0, SHORT_DURATION)
             
-            # Exportar vídeo
-            print(f"Criando short: {output_filename}")
+            # Exportar vídeo (áudio temporário próprio para permitir renderizações em paralelo)
             clip.write_videofile(
                 str(output_path),
                 codec='libx264',
                 audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
+                temp_audiofile=str(self.data_dir / f"{output_path.stem}-temp-audio.m4a"),
                 remove_temp=True,
+                threads=self.render_threads,
                 verbose=False,
                 logger=None
             )
+            metrics.record('frames_encoded', int(clip.duration * clip.fps))
             
-            # Limpar recursos
-            clip.close()
-            
-            print(f"Short criado: {output_path}")
+            # O leitor do vídeo original é fechado pelo pool (close()); fechar o clipe
+            # derivado aqui encerraria o leitor compartilhado no meio do trabalho
             return output_path
             
         except Exception as e:
             raise Exception(f"Erro ao criar short: {str(e)}")
     
     def create_compilation_short(self, video_path: Path, moments: List[Dict[str, Any]], 
-                               max_duration: float = SHORT_DURATION) -> Path:
+                               max_duration: float = SHORT_DURATION,
+                               rendered_shorts: Optional[Dict[tuple, Path]] = None) -> Path:
         """
         Cria um short de compilação com múltiplos momentos.
         
+        Reaproveita os shorts individuais já renderizados (rendered_shorts) e
+        renderiza apenas os momentos que ainda não têm short. Partes com os
+        mesmos parâmetros de stream são unidas pelo concat demuxer sem
+        recodificação; se diferirem (backends ou fontes diferentes), a
+        compilação é recodificada com o filtro concat.
+        
         Args:
             video_path: Caminho para o vídeo original
             moments: Lista de momentos a serem incluídos
             max_duration: Duração máxima do short
+            rendered_shorts: Shorts já renderizados, indexados por moment_key
             
         Returns:
             Path: Caminho para o short de compilação
         """
-        output_path = self.output_dir / "compilation_short.mp4"
+        output_path = self.output_dir / COMPILATION_FILENAME
+        # Como nos shorts individuais: se a compilação existe, está completa
+        partial_path = output_path.with_name(f"{output_path.stem}.partial{output_path.suffix}")
+        rendered_shorts = rendered_shorts or {}
+        
+        parts = []
+        temp_files = [partial_path]
+        total_duration = 0
         
         try:
-            clips = []
-            total_duration = 0
-            
             # Ordenar momentos por prioridade
             sorted_moments = sorted(moments, key=lambda x: x['priority'], reverse=True)
             
@@ -192,56 +274,259 @@ class VideoEditor:
                 
                 # Calcular duração disponível
                 remaining_time = max_duration - total_duration
-                moment_duration = min(moment['duration'], remaining_time)
+                moment_duration = min(moment['duration'], SHORT_DURATION, remaining_time)
                 
-                # Extrair segmento
-                clip = self.extract_video_segment(
-                    video_path,
-                    moment['start'],
-                    moment['start'] + moment_duration
-                )
-                
-                # Redimensionar
-                clip = self.resize_for_shorts(clip)
-                
-                # Adicionar texto
-                if moment.get('title'):
-                    clip = self.add_text_overlay(clip, moment['title'], 'bottom')
+                # Reaproveitar o short individual ou renderizar só esta parte
+                part_path = rendered_shorts.get(self.moment_key(moment))
+                if not part_path or not part_path.exists():
+                    part_path = self.data_dir / f"compilation_part_{len(parts) + 1:02d}.mp4"
+                    part_moment = {**moment, 'end': moment['start'] + moment_duration}
+                    self._render_segment(video_path, part_moment, part_path)
+                    temp_files.append(part_path)
                 
-                clips.append(clip)
+                parts.append((part_path, moment_duration))
                 total_duration += moment_duration
             
-            if not clips:
+            if not parts:
                 raise Exception("Nenhum clipe válido para compilação")
             
-            # Concatenar clipes
-            final_clip = concatenate_videoclips(clips, method="compose")
-            
-            # Exportar
+            # Concatenar partes sem recodificar
             print("Criando short de compilação...")
-            final_clip.write_videofile(
-                str(output_path),
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile='temp-audio.m4a',
-                remove_temp=True,
-                verbose=False,
-                logger=None
-            )
-            
-            # Limpar recursos
-            for clip in clips:
-                clip.close()
-            final_clip.close()
+            self._concat_parts(parts, partial_path)
+            os.replace(partial_path, output_path)
             
             print(f"Short de compilação criado: {output_path}")
             return output_path
             
         except Exception as e:
             raise Exception(f"Erro ao criar compilação: {str(e)}")
+        
+        finally:
+            for temp_file in temp_files:
+                temp_file.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _probe_streams(path: Path) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parâmetros de cada stream que precisam coincidir para concatenar sem recodificar.
+        
+        Returns:
+            List: Codec, resolução, formato de pixel, taxa de quadros, base de
+            tempo e formato do áudio por stream (None se o ffprobe falhar)
+        """
+        fields = ('codec_type', 'codec_name', 'profile', 'width', 'height', 'pix_fmt',
+                  'r_frame_rate', 'time_base', 'sample_rate', 'channels')
+        cmd = [
+            "ffprobe", "-v", "quiet", "-print_format", "json",
+            "-show_streams", str(path)
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            streams = json.loads(result.stdout)['streams']
+        except (OSError, subprocess.CalledProcessError, json.JSONDecodeError, KeyError):
+            return None
+        return [{field: stream.get(field) for field in fields} for stream in streams]
+    
+    def _concat_parts(self, parts: List[tuple], output_path: Path):
+        """
+        Une arquivos já renderizados, sem recodificar quando possível.
+        
+        O concat demuxer com -c copy só é usado se todas as partes tiverem os
+        mesmos parâmetros de stream; partes de backends ou fontes diferentes
+        (ou que o ffprobe não conseguiu ler) são recodificadas.
+        
+        Args:
+            parts: Lista de (caminho, duração_usada) na ordem da compilação
+            output_path: Caminho do arquivo de saída
+        """
+        probes = [self._probe_streams(part_path) for part_path, _ in parts]
+        if None in probes or any(probe != probes[0] for probe in probes):
+            print("Partes com parâmetros de stream diferentes: recodificando a compilação")
+            self._concat_reencode(parts, probes, output_path)
+            return
+        
+        list_path = self.data_dir / f"{output_path.stem}-concat.txt"
+        
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for part_path, duration in parts:
+                escaped = str(part_path.resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+                f.write(f"outpoint {duration:.3f}\n")
+        
+        try:
+            cmd = [
+                FFMPEG_PATH, "-nostdin", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", str(list_path),
+                "-c", "copy", "-movflags", "+faststart",
+                "-y", str(output_path)
+            ]
+            subprocess.run(cmd, check=True, capture_output=True)
+            
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erro ao concatenar partes: {e.stderr.decode(errors='replace')}")
+        
+        finally:
+            list_path.unlink(missing_ok=True)
+    
+    def _concat_reencode(self, parts: List[tuple], probes: List[Optional[List[Dict[str, Any]]]],
+                         output_path: Path):
+        """
+        Une as partes com o filtro concat, normalizando resolução, quadros e áudio.
+        
+        Args:
+            parts: Lista de (caminho, duração_usada) na ordem da compilação
+            probes: Streams de cada parte (_probe_streams)
+            output_path: Caminho do arquivo de saída
+        """
+        target_w, target_h = SHORT_RESOLUTION
+        
+        # Taxa de quadros da primeira parte (30 se o ffprobe não a informou)
+        fps = next((stream['r_frame_rate'] for stream in probes[0] or []
+                    if stream['codec_type'] == 'video' and stream['r_frame_rate'] not in (None, '0/0')), "30")
+        has_audio = all(
+            probe is not None and any(stream['codec_type'] == 'audio' for stream in probe)
+            for probe in probes
+        )
+        
+        cmd = [FFMPEG_PATH, "-nostdin", "-loglevel", "error"]
+        for part_path, duration in parts:
+            cmd += ["-t", f"{duration:.3f}", "-i", str(part_path)]
+        
+        filters = []
+        inputs = ""
+        for i in range(len(parts)):
+            filters.append(
+                f"[{i}:v]scale={target_w}:{target_h}:force_original_aspect_ratio=decrease,"
+                f"pad={target_w}:{target_h}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                f"setpts=PTS-STARTPTS,fps={fps}[v{i}]"
+            )
+            inputs += f"[v{i}]"
+            if has_audio:
+                filters.append(f"[{i}:a]aresample=44100,aformat=channel_layouts=stereo,"
+                               f"asetpts=PTS-STARTPTS[a{i}]")
+                inputs += f"[a{i}]"
+        
+        outputs = "[v][a]" if has_audio else "[v]"
+        filters.append(f"{inputs}concat=n={len(parts)}:v=1:a={int(has_audio)}{outputs}")
+        
+        cmd += ["-filter_complex", ";".join(filters), "-map", "[v]"]
+        if has_audio:
+            cmd += ["-map", "[a]", "-c:a", "aac", "-ar", "44100", "-ac", "2"]
+        cmd += [
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",
+            "-y", str(output_path)
+        ]
+        
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erro ao recodificar a compilação: {e.stderr.decode(errors='replace')}")
+    
+    @staticmethod
+    def moment_key(moment: Dict[str, Any]) -> tuple:
+        """Identifica um momento pelo seu intervalo de tempo."""
+        return (moment['start'], moment['end'])
+    
+    @staticmethod
+    def _moment_source(video_path: Path, moment: Dict[str, Any]) -> tuple:
+        """
+        Arquivo de onde o momento é lido e o momento no tempo desse arquivo.
+        
+        Momentos com 'source_path' (trecho baixado pelo --audio-first) são lidos
+        do trecho, deslocados por 'source_offset'; os demais, do vídeo original.
+        """
+        if not moment.get('source_path'):
+            return video_path, moment
+        
+        offset = moment.get('source_offset', 0.0)
+        local_moment = {**moment, 'start': moment['start'] - offset, 'end': moment['end'] - offset}
+        del local_moment['source_path']
+        return Path(moment['source_path']), local_moment
+    
+    @staticmethod
+    def _job_moment(moment: Dict[str, Any]) -> Dict[str, Any]:
+        """Momento enviado aos processos de renderização, sem a visão da transcrição."""
+        return {key: value for key, value in moment.items() if key != 'segments'}
+    
+    def create_individual_shorts(self, video_path: Path, moments: List[Dict[str, Any]],
+                                 workers: int = RENDER_WORKERS,
+                                 threads_per_job: int = RENDER_THREADS_PER_JOB,
+                                 resume: bool = False) -> List[Optional[Path]]:
+        """
+        Renderiza um short por momento, em paralelo quando workers > 1.
+        
+        Cada short roda em um processo próprio com no máximo threads_per_job
+        threads de encoder; uma falha afeta apenas o seu próprio short.
+        
+        Args:
+            video_path: Caminho para o vídeo original
+            moments: Momentos a renderizar, em ordem de prioridade
+            workers: Número de processos de renderização
+            threads_per_job: Threads do encoder por short
+            resume: Manter os shorts que já existem em output_dir (job retomado
+                com os mesmos momentos) e renderizar só os que faltam
+            
+        Returns:
+            List: Caminho de cada short na mesma ordem de moments (None se falhou)
+        """
+        filenames = [f"short_{i+1:02d}.mp4" for i in range(len(moments))]
+        results: List[Optional[Path]] = [None] * len(moments)
+        
+        if resume:
+            for i, filename in enumerate(filenames):
+                if (self.output_dir / filename).exists():
+                    results[i] = self.output_dir / filename
+            reused = sum(1 for path in results if path)
+            if reused:
+                print(f"♻️  {reused} shorts já renderizados foram mantidos")
+        
+        pending = [i for i, path in enumerate(results) if path is None]
+        workers = max(1, min(workers, len(pending)))
+        
+        if workers == 1:
+            for i in pending:
+                moment = moments[i]
+                try:
+                    results[i] = self.create_short_from_moment(video_path, moment, filenames[i])
+                except Exception as e:
+                    print(f"Erro ao criar short {i+1}: {e}")
+            return results
+        
+        print(f"Renderizando em paralelo: {workers} processos x {threads_per_job} threads")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _render_short_job, self.render_backend, self.output_dir, self.data_dir,
+                    threads_per_job, video_path, self._job_moment(moments[i]), filenames[i]
+                )
+                for i in pending
+            ]
+            
+            for i, future in zip(pending, futures):
+                try:
+                    results[i], counters = future.result()
+                    metrics.merge(counters)
+                except Exception as e:
+                    print(f"Erro ao criar short {i+1}: {e}")
+        
+        return results
+    
+    @staticmethod
+    def expected_shorts(moments: List[Dict[str, Any]], create_individual: bool = True,
+                        create_compilation: bool = True) -> int:
+        """Quantos arquivos create_shorts produz quando nenhum short falha."""
+        expected = min(len(moments), MAX_INDIVIDUAL_SHORTS) if create_individual else 0
+        if create_compilation and len(moments) > 1:
+            expected += 1
+        return expected
     
     def create_shorts(self, video_path: Path, moments: List[Dict[str, Any]], 
-                     create_individual: bool = True, create_compilation: bool = True) -> List[Path]:
+                     create_individual: bool = True, create_compilation: bool = True,
+                     resume: bool = False) -> List[Path]:
         """
         Método principal para criar shorts.
         
@@ -250,6 +535,8 @@ class VideoEditor:
             moments: Lista de momentos identificados
             create_individual: Se deve criar shorts individuais
             create_compilation: Se deve criar short de compilação
+            resume: Reaproveitar shorts já renderizados (ver create_individual_shorts),
+                inclusive a compilação
             
         Returns:
             List[Path]: Lista de caminhos para os shorts criados
@@ -263,20 +550,27 @@ class VideoEditor:
         try:
             # Criar shorts individuais
             if create_individual:
-                print(f"Criando {len(moments)} shorts individuais...")
-                for i, moment in enumerate(moments[:5]):  # Limitar a 5 shorts
-                    try:
-                        short_path = self.create_short_from_moment(
-                            video_path, moment, f"short_{i+1:02d}.mp4"
-                        )
-                        created_shorts.append(short_path)
-                    except Exception as e:
-                        print(f"Erro ao criar short {i+1}: {e}")
-            
-            # Criar compilação
-            if create_compilation and len(moments) > 1:
+                selected = moments[:MAX_INDIVIDUAL_SHORTS]
+                print(f"Criando {len(selected)} shorts individuais...")
+                rendered = self.create_individual_shorts(video_path, selected, resume=resume)
+                created_shorts.extend(path for path in rendered if path)
+                rendered_shorts = {
+                    self.moment_key(moment): path
+                    for moment, path in zip(selected, rendered) if path
+                }
+            else:
+                rendered_shorts = {}
+            
+            # Criar compilação a partir dos shorts já renderizados
+            compilation_path = self.output_dir / COMPILATION_FILENAME
+            if create_compilation and len(moments) > 1 and resume and compilation_path.exists():
+                print("♻️  Short de compilação já renderizado foi mantido")
+                created_shorts.append(compilation_path)
+            elif create_compilation and len(moments) > 1:
                 try:
-                    compilation_path = self.create_compilation_short(video_path, moments)
+                    compilation_path = self.create_compilation_short(
+                        video_path, moments, rendered_shorts=rendered_shorts
+                    )
                     created_shorts.append(compilation_path)
                 except Exception as e:
                     print(f"Erro ao criar compilação: {e}")
@@ -286,4 +580,11 @@ class VideoEditor:
             
         except Exception as e:
             raise Exception(f"Erro geral na criação de shorts: {str(e)}")
+        
+        finally:
+            stats = self.reader_pool.stats()
+            self.close()
+            if stats['readers_opened']:
+                print(f"Leitores de vídeo: {stats['readers_opened']} abertos "
+                      f"(pico {stats['peak_open_readers']}), {stats['reuse_hits']} reutilizações")
 
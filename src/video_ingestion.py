@@ -1,9 +1,21 @@
 import os
+import json
 import subprocess
 from pathlib import Path
-from typing import Optional, Union
-import yt_dlp
-from config.settings import DATA_DIR, FFMPEG_PATH
+from typing import List, Dict, Any, Optional, Union
+from config.settings import DATA_DIR, FFMPEG_PATH, LOCAL_VIDEO_STRATEGY, SECTION_PADDING
+from src import metrics
+
+# Contêineres (format_name do ffprobe) com índice que permitem busca direta
+SEEKABLE_FORMATS = {'mov', 'mp4', 'matroska', 'webm'}
+
+# Vídeo dos trechos: o mesmo limite de qualidade do download completo; sem arquivo
+# progressivo (ex.: DASH), vídeo e áudio separados são unidos pelo FFmpeg
+SECTION_FORMAT = 'best[height<=720]/bestvideo[height<=720]+bestaudio/best'
+
+# Codecs que podem ser copiados (-c copy) para um contêiner MP4
+MP4_VIDEO_CODECS = {'h264', 'hevc', 'av1', 'vp9', 'mpeg4'}
+MP4_AUDIO_CODECS = {'aac', 'mp3', 'opus', 'ac3', 'alac'}
 
 
 class VideoIngestion:
@@ -11,6 +23,7 @@ class VideoIngestion:
     
     def __init__(self):
         self.data_dir = DATA_DIR
+        self.last_ingest_strategy = None
         
     def download_video(self, url: str, output_filename: Optional[str] = None) -> Path:
         """
@@ -36,25 +49,160 @@ class VideoIngestion:
         }
         
         try:
+            import yt_dlp
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+                info = ydl.extract_info(url, download=True)
                 
-            # Encontrar o arquivo baixado (yt-dlp pode mudar a extensão)
-            downloaded_files = list(self.data_dir.glob("downloaded_video.*"))
-            if downloaded_files:
-                return downloaded_files[0]
+            # O yt-dlp informa o arquivo final (a extensão depende do formato escolhido)
+            downloaded_file = Path(info['requested_downloads'][0]['filepath'])
+            if downloaded_file.exists():
+                metrics.record('bytes_downloaded', downloaded_file.stat().st_size)
+                return downloaded_file
             else:
                 raise FileNotFoundError("Arquivo de vídeo não encontrado após download")
                 
         except Exception as e:
             raise Exception(f"Erro ao baixar vídeo: {str(e)}")
     
-    def process_local_video(self, video_path: Union[str, Path]) -> Path:
+    def download_audio(self, url: str, output_filename: Optional[str] = None) -> tuple[Path, dict]:
+        """
+        Baixa apenas o áudio de uma URL (primeira fase da ingestão --audio-first).
+        
+        Args:
+            url: URL do vídeo ou live stream
+            output_filename: Nome do arquivo de saída (opcional)
+        
+        Returns:
+            tuple: (caminho_do_audio, informações do yt-dlp)
+        """
+        if not output_filename:
+            output_filename = "downloaded_audio.%(ext)s"
+        
+        ydl_opts = {
+            'outtmpl': str(self.data_dir / output_filename),
+            'format': 'bestaudio/best',
+            'writesubtitles': False,
+            'writeautomaticsub': False,
+        }
+        
+        try:
+            import yt_dlp
+            
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+            
+            audio_path = Path(info['requested_downloads'][0]['filepath'])
+            metrics.record('bytes_downloaded', audio_path.stat().st_size)
+            return audio_path, info
+        
+        except Exception as e:
+            raise Exception(f"Erro ao baixar áudio: {str(e)}")
+    
+    def download_sections(self, url: str, moments: List[Dict[str, Any]],
+                          padding: float = SECTION_PADDING) -> List[Dict[str, Any]]:
+        """
+        Baixa só os trechos de vídeo que cobrem os momentos (segunda fase do --audio-first).
+        
+        Cada momento ganha padding segundos de margem; trechos que se sobrepõem
+        viram um único download. O yt-dlp repassa os intervalos ao FFmpeg, que
+        busca no arquivo remoto (requisições Range/fragmentos) sem baixá-lo inteiro.
+        Cada momento recebe 'source_path' (arquivo do trecho) e 'source_offset'
+        (início do trecho no vídeo original), usados pelo VideoEditor. Os cortes
+        são feitos exatamente no início pedido (force_keyframes_at_cuts): sem
+        isso o trecho começaria no keyframe anterior, até um GOP antes, e todo
+        o short ficaria deslocado em relação a source_offset. O custo é
+        recodificar os trechos, que são curtos.
+        
+        Args:
+            url: URL do vídeo (a mesma usada em download_audio)
+            moments: Momentos finais, com 'start' e 'end' no tempo do vídeo original
+            padding: Margem (segundos) antes e depois de cada momento
+        
+        Returns:
+            List: Os mesmos momentos, com 'source_path' e 'source_offset'
+        """
+        if not moments:
+            return moments
+        
+        sections: List[List[float]] = []
+        for start, end in sorted((m['start'], m['end']) for m in moments):
+            start, end = max(0.0, start - padding), end + padding
+            if sections and start <= sections[-1][1]:
+                sections[-1][1] = max(sections[-1][1], end)
+            else:
+                sections.append([start, end])
+        
+        try:
+            import yt_dlp
+            from yt_dlp.utils import download_range_func
+            
+            ydl_opts = {
+                'outtmpl': str(self.data_dir / "section_%(section_start)010.3f.%(ext)s"),
+                'format': SECTION_FORMAT,
+                'download_ranges': download_range_func(None, [tuple(s) for s in sections]),
+                'force_keyframes_at_cuts': True,
+                'writesubtitles': False,
+                'writeautomaticsub': False,
+            }
+            if os.path.dirname(FFMPEG_PATH):
+                ydl_opts['ffmpeg_location'] = FFMPEG_PATH
+            
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(url, download=True)
+        
+        except Exception as e:
+            raise Exception(f"Erro ao baixar trechos do vídeo: {str(e)}")
+        
+        downloads = sorted(
+            (d['section_start'], Path(d['filepath']))
+            for d in info.get('requested_downloads', [])
+            if d.get('filepath') and d.get('section_start') is not None
+        )
+        if len(downloads) != len(sections):
+            raise Exception(f"Erro ao baixar trechos do vídeo: {len(downloads)} de {len(sections)} baixados")
+        
+        for moment in moments:
+            section_start, section_path = next(
+                (start, path) for start, path in reversed(downloads) if start <= moment['start']
+            )
+            moment['source_path'] = section_path
+            moment['source_offset'] = section_start
+        
+        section_bytes = sum(path.stat().st_size for _, path in downloads)
+        metrics.record('bytes_downloaded', section_bytes)
+        section_seconds = sum(end - start for start, end in sections)
+        full_bytes = self._estimated_size(info)
+        summary = f"{len(sections)} trechos de vídeo ({section_seconds:.0f}s): {section_bytes / 1e6:.1f} MB"
+        if full_bytes:
+            summary += f" (vídeo completo: ~{full_bytes / 1e6:.1f} MB)"
+        print(summary)
+        return moments
+    
+    @staticmethod
+    def _estimated_size(info: dict) -> Optional[float]:
+        """Tamanho estimado do vídeo completo no formato escolhido, se o site informar."""
+        formats = info.get('requested_formats') or [info]
+        sizes = [f.get('filesize') or f.get('filesize_approx') for f in formats]
+        if not all(sizes):
+            return None
+        return sum(sizes)
+    
+    def process_local_video(self, video_path: Union[str, Path],
+                            strategy: str = LOCAL_VIDEO_STRATEGY) -> Path:
         """
-        Processa um arquivo de vídeo local, copiando-o para o diretório de dados.
+        Processa um arquivo de vídeo local, disponibilizando-o no diretório de dados.
+        
+        O arquivo é inspecionado com ffprobe e só é recodificado quando necessário:
+        
+        - link: hard link do original em data/ (sem cópia)
+        - reference: usa o arquivo original no lugar
+        - remux: copia os streams (-c copy) para um contêiner MP4
+        - transcode: recodifica com libx264/aac
         
         Args:
             video_path: Caminho para o arquivo de vídeo local
+            strategy: Estratégia de ingestão ("auto" escolhe a mais barata possível)
             
         Returns:
             Path: Caminho para o arquivo processado
@@ -63,33 +211,101 @@ class VideoIngestion:
         
         if not video_path.exists():
             raise FileNotFoundError(f"Arquivo de vídeo não encontrado: {video_path}")
-            
-        # Copiar para o diretório de dados
+        
+        auto = strategy == "auto"
+        if auto:
+            strategy = self._choose_ingest_strategy(self.probe_video(video_path))
+        
+        if strategy == "link":
+            output_path = self._link_video(video_path)
+            if output_path is None:
+                strategy, output_path = "reference", video_path
+        elif strategy == "reference":
+            output_path = video_path
+        elif strategy == "remux":
+            try:
+                output_path = self._run_ffmpeg_ingest(
+                    video_path, self.data_dir / "input_video.mp4",
+                    ["-map", "0:v:0", "-map", "0:a:0?", "-c", "copy", "-movflags", "+faststart"]
+                )
+            except Exception as e:
+                if not auto:
+                    raise
+                print(f"Aviso: Remux falhou, recodificando: {e}")
+                strategy = "transcode"
+        
+        if strategy == "transcode":
+            output_path = self._run_ffmpeg_ingest(
+                video_path, self.data_dir / f"input_video{video_path.suffix}",
+                ["-c:v", "libx264", "-c:a", "aac"]
+            )
+        elif strategy not in ("link", "reference", "remux"):
+            raise ValueError(f"Estratégia de ingestão desconhecida: {strategy}")
+        
+        self.last_ingest_strategy = strategy
+        print(f"Estratégia de ingestão: {strategy}")
+        return output_path
+    
+    def _choose_ingest_strategy(self, probe: dict) -> str:
+        """Escolhe a estratégia mais barata compatível com os streams do arquivo."""
+        streams = probe.get('streams', [])
+        video_codec = next(
+            (s.get('codec_name') for s in streams if s.get('codec_type') == 'video'), None
+        )
+        audio_codec = next(
+            (s.get('codec_name') for s in streams if s.get('codec_type') == 'audio'), None
+        )
+        format_names = set(probe.get('format', {}).get('format_name', '').split(','))
+        
+        # Codecs fora de MP4_*_CODECS (ex.: VP8/Vorbis em WebM, MPEG-2 em MKV) falhariam
+        # só na renderização ou no concat com -c copy: recodificar já na ingestão
+        codecs_fit = (video_codec in MP4_VIDEO_CODECS
+                      and (audio_codec is None or audio_codec in MP4_AUDIO_CODECS))
+        if not codecs_fit:
+            return "transcode"
+        
+        # MP4/MOV/MKV/WebM têm índice e permitem busca direta pelo FFmpeg/MoviePy
+        if format_names & SEEKABLE_FORMATS:
+            return "link"
+        
+        # FLV, MPEG-TS etc.: basta trocar o contêiner
+        return "remux"
+    
+    def _link_video(self, video_path: Path) -> Optional[Path]:
+        """Cria um hard link do vídeo em data/; retorna None se não for possível."""
         output_path = self.data_dir / f"input_video{video_path.suffix}"
         
         try:
-            # Usar ffmpeg para recodificar e garantir compatibilidade
-            cmd = [
-                FFMPEG_PATH, "-i", str(video_path),
-                "-c:v", "libx264", "-c:a", "aac",
-                "-y", str(output_path)
-            ]
+            if output_path.exists():
+                if output_path.samefile(video_path):
+                    return output_path
+                output_path.unlink()
+            os.link(video_path, output_path)
+            return output_path
             
+        except OSError:
+            # Sistemas de arquivos diferentes ou sem suporte a hard links
+            return None
+    
+    def _run_ffmpeg_ingest(self, video_path: Path, output_path: Path, codec_args: list) -> Path:
+        """Executa o FFmpeg de ingestão (remux ou recodificação)."""
+        try:
+            cmd = [FFMPEG_PATH, "-i", str(video_path), *codec_args, "-y", str(output_path)]
             subprocess.run(cmd, check=True, capture_output=True)
             return output_path
             
         except subprocess.CalledProcessError as e:
             raise Exception(f"Erro ao processar vídeo local: {e.stderr.decode()}")
     
-    def get_video_info(self, video_path: Path) -> dict:
+    def probe_video(self, video_path: Path) -> dict:
         """
-        Obtém informações sobre o vídeo usando ffprobe.
+        Executa o ffprobe e retorna o JSON bruto de formato e streams.
         
         Args:
             video_path: Caminho para o arquivo de vídeo
             
         Returns:
-            dict: Informações do vídeo (duração, resolução, etc.)
+            dict: Saída do ffprobe
         """
         try:
             cmd = [
@@ -98,33 +314,108 @@ class VideoIngestion:
             ]
             
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            import json
-            info = json.loads(result.stdout)
+            return json.loads(result.stdout)
             
-            # Extrair informações relevantes
-            video_stream = next(
-                (s for s in info['streams'] if s['codec_type'] == 'video'), None
-            )
-            
-            if video_stream:
-                duration = float(info['format']['duration'])
-                width = video_stream['width']
-                height = video_stream['height']
-                
-                return {
-                    'duration': duration,
-                    'width': width,
-                    'height': height,
-                    'format': info['format']['format_name']
-                }
-            else:
-                raise Exception("Stream de vídeo não encontrado")
-                
         except subprocess.CalledProcessError as e:
             raise Exception(f"Erro ao obter informações do vídeo: {e.stderr}")
         except json.JSONDecodeError:
             raise Exception("Erro ao decodificar informações do vídeo")
     
+    def get_video_info(self, video_path: Path) -> dict:
+        """
+        Obtém informações sobre o vídeo usando ffprobe.
+        
+        Args:
+            video_path: Caminho para o arquivo de vídeo
+            
+        Returns:
+            dict: Informações do vídeo (duração, resolução, etc.)
+        """
+        info = self.probe_video(video_path)
+        
+        # Extrair informações relevantes
+        video_stream = next(
+            (s for s in info['streams'] if s['codec_type'] == 'video'), None
+        )
+        
+        if video_stream:
+            duration = float(info['format']['duration'])
+            width = video_stream['width']
+            height = video_stream['height']
+            
+            return {
+                'duration': duration,
+                'width': width,
+                'height': height,
+                'format': info['format']['format_name']
+            }
+        else:
+            raise Exception("Stream de vídeo não encontrado")
+    
+    def resolve_stream_url(self, source: str, format_spec: str = 'best[height<=720]/best') -> str:
+        """
+        Resolve a URL de mídia que o FFmpeg consegue ler diretamente.
+        
+        Playlists HLS (.m3u8), arquivos locais e URLs de mídia são usados como
+        estão; páginas de plataformas (ex.: YouTube) passam pelo yt-dlp, que
+        retorna a URL do stream sem baixar nada.
+        
+        Args:
+            source: URL da live, playlist HLS ou caminho local
+            format_spec: Formato pedido ao yt-dlp (ex.: 'bestaudio/best' para só o áudio)
+            
+        Returns:
+            str: URL ou caminho para a entrada do FFmpeg
+        """
+        if not self.is_url(source):
+            return source
+        
+        path = source.split('?', 1)[0].lower()
+        if path.endswith(('.m3u8', '.mpd', '.ts', '.mp4', '.mkv', '.flv')):
+            return source
+        
+        try:
+            import yt_dlp
+            
+            with yt_dlp.YoutubeDL({'quiet': True, 'format': format_spec}) as ydl:
+                info = ydl.extract_info(source, download=False)
+            return info['url']
+            
+        except Exception as e:
+            raise Exception(f"Erro ao resolver URL do stream: {str(e)}")
+    
+    @staticmethod
+    def is_url(source: str) -> bool:
+        """Verifica se a fonte é uma URL (e não um arquivo local)."""
+        return source.startswith(('http://', 'https://', 'www.'))
+    
+    def ingest_audio(self, source: str) -> tuple[Path, dict]:
+        """
+        Primeira fase da ingestão --audio-first: baixa só o áudio da URL.
+        
+        O vídeo dos momentos é baixado depois, com download_sections.
+        
+        Args:
+            source: URL do vídeo ou live stream
+        
+        Returns:
+            tuple: (caminho_do_audio, informações_da_midia)
+        """
+        print(f"Baixando apenas o áudio de: {source}")
+        audio_path, info = self.download_audio(source)
+        self.last_ingest_strategy = "audio-first"
+        
+        duration = info.get('duration') or float(self.probe_video(audio_path)['format']['duration'])
+        media_info = {
+            'duration': duration,
+            'ingest_strategy': self.last_ingest_strategy,
+        }
+        
+        print(f"Áudio baixado: {audio_path} ({audio_path.stat().st_size / 1e6:.1f} MB)")
+        print(f"Duração: {duration:.2f} segundos")
+        
+        return audio_path, media_info
+    
     def ingest_video(self, source: str) -> tuple[Path, dict]:
         """
         Método principal para ingestão de vídeo.
@@ -136,15 +427,17 @@ class VideoIngestion:
             tuple: (caminho_do_video, informações_do_video)
         """
         # Verificar se é URL ou arquivo local
-        if source.startswith(('http://', 'https://', 'www.')):
+        if self.is_url(source):
             print(f"Baixando vídeo de: {source}")
             video_path = self.download_video(source)
+            self.last_ingest_strategy = "download"
         else:
             print(f"Processando vídeo local: {source}")
             video_path = self.process_local_video(source)
         
         # Obter informações do vídeo
         video_info = self.get_video_info(video_path)
+        video_info['ingest_strategy'] = self.last_ingest_strategy
         
         print(f"Vídeo processado: {video_path}")
         print(f"Duração: {video_info['duration']:.2f} segundos")
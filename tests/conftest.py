@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path para os imports de src e config
+sys.path.insert(0, str(Path(__file__).parent.parent))
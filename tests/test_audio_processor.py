@@ -0,0 +1,112 @@
+import pytest
+
+from src.audio_processor import AudioProcessor
+
+INF = float('inf')
+
+
+@pytest.fixture
+def processor():
+    return AudioProcessor(use_cache=False, use_vad=False, two_pass=False)
+
+
+def words(*items):
+    return [{'start': start, 'end': end, 'word': f" {word}"} for start, end, word in items]
+
+
+def segment(start, end, text, word_items=None):
+    result = {'start': start, 'end': end, 'text': f" {text}"}
+    if word_items is not None:
+        result['words'] = words(*word_items)
+    return result
+
+
+def texts(segments):
+    return [s['text'].strip() for s in segments]
+
+
+def test_stitch_assigns_segments_to_their_nominal_chunk(processor):
+    first = [segment(0, 4, "a"), segment(4, 9, "b"), segment(10, 13, "sobra")]
+    second = [segment(6, 8, "de novo"), segment(10, 13, "c"), segment(14, 16, "d")]
+    
+    stitched = processor._stitch_chunks([first, second], [0, 10, INF])
+    
+    assert texts(stitched) == ["a", "b", "c", "d"]
+    assert [s['id'] for s in stitched] == [0, 1, 2, 3]
+
+
+def test_stitch_keeps_a_segment_crossing_the_boundary_once(processor):
+    first = [segment(20, 28, "um dois tres"),
+             segment(28, 33, "quatro cinco seis",
+                     [(28, 30, "quatro"), (30, 31.5, "cinco"), (31.5, 33, "seis")])]
+    second = [segment(25, 29, "s tres", [(25, 26, "s"), (26, 29, "tres")]),
+              segment(29.5, 36, "cinco seis sete",
+                      [(29.5, 31, "cinco"), (31, 32.8, "seis"), (33, 36, "sete")]),
+              segment(36, 40, "oito", [(36, 40, "oito")])]
+    
+    stitched = processor._stitch_chunks([first, second], [0, 30, INF])
+    
+    assert texts(stitched) == ["um dois tres", "quatro cinco seis", "sete", "oito"]
+    assert stitched[2]['start'] == 33
+    assert stitched[2]['words'] == words((33, 36, "sete"))
+
+
+def test_stitch_without_words_drops_mostly_covered_segments(processor):
+    first = [segment(26, 33, "fala longa")]
+    second = [segment(30.5, 33, "longa"), segment(32, 38, "seguinte")]
+    
+    stitched = processor._stitch_chunks([first, second], [0, 30, INF])
+    
+    assert texts(stitched) == ["fala longa", "seguinte"]
+
+
+def test_stitch_drops_repeated_text_at_the_junction(processor):
+    first = [segment(25, 29, "olá pessoal")]
+    second = [segment(30, 33, "Olá, pessoal!"), segment(33, 35, "bem-vindos")]
+    
+    stitched = processor._stitch_chunks([first, second], [0, 30, INF])
+    
+    assert texts(stitched) == ["olá pessoal", "bem-vindos"]
+
+
+def test_trim_overlap_keeps_uncovered_segments(processor):
+    original = segment(10, 12, "livre", [(10, 12, "livre")])
+    
+    assert processor._trim_overlap(original, 9.5) is original
+    assert processor._trim_overlap(original, -INF) is original
+
+
+class FakeWhisper:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+    
+    def transcribe(self, audio, verbose=None, **options):
+        self.calls += 1
+        if not self.text:
+            return {'text': "", 'segments': [], 'language': None}
+        return {'text': f" {self.text}", 'language': 'pt',
+                'segments': [{'start': 0.0, 'end': 1.0, 'text': f" {self.text}"}]}
+
+
+def test_empty_draft_falls_back_and_caches_under_the_accurate_model(tmp_path):
+    import numpy as np
+    from src.disk_cache import DiskCache
+    
+    processor = AudioProcessor(use_cache=True, use_vad=False, two_pass=False)
+    processor.cache = DiskCache(tmp_path, max_bytes=10_000_000)
+    processor.draft_model_name, processor.model_name = "tiny", "base"
+    draft, accurate = FakeWhisper(""), FakeWhisper("olá")
+    processor._models.update({"tiny": draft, "base": accurate})
+    audio = np.full(16000, 0.1, dtype=np.float32)
+    
+    transcript = processor.transcribe_chunk(audio)
+    
+    assert transcript.text == "olá"
+    assert (draft.calls, accurate.calls) == (1, 1)
+    assert processor.cache.get(processor._cache_key(audio, "tiny")) is None
+    assert processor.cache.get(processor._cache_key(audio, "base")) is not None
+    
+    # A transcrição do modelo preciso em cache evita repetir as duas passadas
+    assert processor.transcribe_chunk(audio).text == "olá"
+    assert (draft.calls, accurate.calls) == (1, 1)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.boundary_refiner import BoundaryRefiner, SAMPLE_RATE
+from src.transcript import Transcript
+
+
+@pytest.fixture
+def refiner():
+    return BoundaryRefiner(tolerance=0.75, padding=0.1)
+
+
+@pytest.fixture
+def transcript():
+    return Transcript.from_segments([
+        {'start': 1.0, 'end': 2.2, 'text': 'olha isso',
+         'words': [{'start': 1.0, 'end': 1.5, 'word': 'olha'}, {'start': 1.6, 'end': 2.2, 'word': 'isso'}]},
+        {'start': 4.0, 'end': 4.8, 'text': 'incrível',
+         'words': [{'start': 4.0, 'end': 4.8, 'word': 'incrível'}]},
+    ])
+
+
+def moment(start, end):
+    return {'start': start, 'end': end, 'duration': end - start}
+
+
+def test_edges_inside_a_word_keep_the_whole_word(refiner, transcript):
+    moments = refiner.refine([moment(1.2, 4.5)], transcript)
+    
+    assert moments[0]['start'] == pytest.approx(0.9)
+    assert moments[0]['end'] == pytest.approx(4.9)
+    assert moments[0]['duration'] == pytest.approx(4.0)
+    assert [s['text'] for s in moments[0]['segments']] == ['olha isso', 'incrível']
+
+
+def test_padding_does_not_reach_the_neighbouring_word(refiner, transcript):
+    # "isso" começa 0.1s depois de "olha": o corte fica no fim da palavra anterior
+    moments = refiner.refine([moment(1.7, 4.5)], transcript)
+    
+    assert moments[0]['start'] == pytest.approx(1.5)
+
+
+def test_edges_between_words_go_to_the_nearest_cut(refiner, transcript):
+    moments = refiner.refine([moment(3.5, 5.3)], transcript)
+    
+    assert moments[0]['start'] == pytest.approx(3.9)
+    assert moments[0]['end'] == pytest.approx(4.9)
+
+
+def test_edges_beyond_the_tolerance_are_kept(refiner, transcript):
+    moments = refiner.refine([moment(8.0, 12.0)], transcript)
+    
+    assert (moments[0]['start'], moments[0]['end']) == (8.0, 12.0)
+
+
+def test_without_words_edges_go_to_the_quietest_audio(refiner):
+    t = np.arange(20 * SAMPLE_RATE) / SAMPLE_RATE
+    audio = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    audio[int(5.3 * SAMPLE_RATE):int(5.4 * SAMPLE_RATE)] = 0.0
+    audio[int(14.6 * SAMPLE_RATE):int(14.7 * SAMPLE_RATE)] = 0.0
+    
+    moments = refiner.refine([moment(5.0, 15.0)], Transcript(), audio)
+    
+    assert 5.3 <= moments[0]['start'] <= 5.4
+    assert 14.6 <= moments[0]['end'] <= 14.7
+
+
+def test_no_moments(refiner, transcript):
+    assert refiner.refine([], transcript) == []
@@ -0,0 +1,83 @@
+import os
+
+from src import disk_cache
+from src.disk_cache import DiskCache
+
+
+def entry_size(cache, key):
+    return cache._path_for(key).stat().st_size
+
+
+def test_set_and_get(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    key = DiskCache.make_key("audio", {'model': 'base'})
+    
+    assert cache.get(key) is None
+    cache.set(key, {'segments': [1, 2, 3]})
+    
+    assert cache.get(key) == {'segments': [1, 2, 3]}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_make_key_is_stable():
+    assert DiskCache.make_key({'a': 1, 'b': 2}) == DiskCache.make_key({'b': 2, 'a': 1})
+    assert DiskCache.make_key("x", 1) != DiskCache.make_key("x", 2)
+
+
+def test_evicts_the_least_recently_used_entry(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    cache.set("a", "x" * 100)
+    cache.set("b", "y" * 100)
+    os.utime(cache._path_for("a"), (1000, 1000))
+    os.utime(cache._path_for("b"), (2000, 2000))
+    
+    # Ler "a" a torna a mais recente; "b" passa a ser a menos usada
+    assert cache.get("a") is not None
+    cache.max_bytes = entry_size(cache, "a") * 2
+    cache.set("c", "z" * 100)
+    
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_expired_entries_are_missing(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, max_bytes=10_000, ttl=60)
+    now = 1_000_000.0
+    monkeypatch.setattr(disk_cache.time, "time", lambda: now)
+    cache.set("key", "valor")
+    
+    now += 30
+    assert cache.get("key") == "valor"
+    
+    now += 31
+    assert cache.get("key") is None
+    assert not cache._path_for("key").exists()
+
+
+def test_corrupted_entries_are_removed(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    cache.set("key", "valor")
+    cache._path_for("key").write_text("{não é json", encoding="utf-8")
+    
+    assert cache.get("key") is None
+    assert not cache._path_for("key").exists()
+
+
+def test_disabled_cache_does_nothing(tmp_path):
+    cache = DiskCache(tmp_path / "cache", max_bytes=10_000, enabled=False)
+    cache.set("key", "valor")
+    
+    assert cache.get("key") is None
+    assert not (tmp_path / "cache").exists()
+
+
+def test_binary_entries(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10_000, suffix=".png")
+    
+    assert cache.get_path("key") is None
+    path = cache.set_bytes("key", b"\x89PNG")
+    
+    assert path.suffix == ".png"
+    assert cache.get_path("key") == path
+    assert path.read_bytes() == b"\x89PNG"
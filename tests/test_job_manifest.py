@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from src import job_manifest
+from src.job_manifest import JobManifest
+
+
+@pytest.fixture
+def job_dir(tmp_path):
+    return tmp_path / "jobs" / "job-1"
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+def test_checkpoint_survives_a_restart(job_dir):
+    artifact = write(job_dir / "transcript.json", b"{}")
+    record = JobManifest(job_dir, "job-1").checkpoint("transcribe", [artifact], "in", {'model': 'base'})
+    
+    restored = JobManifest(job_dir, "job-1").restore("transcribe", "in", {'model': 'base'})
+    
+    assert restored == record
+    assert restored['artifacts'][0]['path'] == str(artifact.resolve())
+
+
+def test_restore_requires_the_same_input_and_params(job_dir):
+    artifact = write(job_dir / "transcript.json", b"{}")
+    manifest = JobManifest(job_dir, "job-1")
+    manifest.checkpoint("transcribe", [artifact], "in", {'model': 'base', 'vad': True})
+    
+    assert manifest.restore("transcribe", "outro", {'model': 'base', 'vad': True}) is None
+    assert manifest.restore("transcribe", "in", {'model': 'small', 'vad': True}) is None
+    assert manifest.restore("analyze", "in", {'model': 'base', 'vad': True}) is None
+    assert manifest.restore("transcribe", "in", {'vad': True, 'model': 'base'}) is not None
+
+
+def test_changed_or_missing_artifacts_invalidate_the_stage(job_dir):
+    first = write(job_dir / "a.json", b"1")
+    second = write(job_dir / "b.json", b"2")
+    manifest = JobManifest(job_dir, "job-1")
+    manifest.checkpoint("render", [first, second], "in", {})
+    
+    first.write_bytes(b"alterado")
+    assert manifest.restore("render", "in", {}) is None
+    
+    manifest.checkpoint("render", [first, second], "in", {})
+    second.unlink()
+    assert manifest.restore("render", "in", {}) is None
+
+
+def test_large_files_use_size_and_mtime(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_manifest, "CHECKPOINT_HASH_MAX_BYTES", 4)
+    video = write(tmp_path / "video.mp4", b"123456")
+    before = JobManifest.fingerprint(video)
+    
+    # Mesmo tamanho e data de modificação: o conteúdo não é relido
+    stat = video.stat()
+    video.write_bytes(b"abcdef")
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert JobManifest.fingerprint(video) == before
+    
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert JobManifest.fingerprint(video) != before
+
+
+def test_output_hash_chains_the_stages(job_dir):
+    artifact = write(job_dir / "transcript.json", b"{}")
+    manifest = JobManifest(job_dir, "job-1")
+    transcribed = manifest.checkpoint("transcribe", [artifact], "video", {})
+    manifest.checkpoint("analyze", [], transcribed['output_hash'], {})
+    
+    # A transcrição muda: o hash de saída muda e a análise deixa de valer
+    artifact.write_bytes(b'{"segmentos": 1}')
+    transcribed = manifest.checkpoint("transcribe", [artifact], "video", {})
+    
+    assert manifest.restore("analyze", transcribed['output_hash'], {}) is None
+
+
+def test_unreadable_manifest_starts_over(job_dir):
+    write(job_dir / "manifest.json", b"{pela metade")
+    
+    manifest = JobManifest(job_dir, "job-1")
+    
+    assert manifest.data['stages'] == {}
+    assert manifest.restore("transcribe", "in", {}) is None
+
+
+def test_set_info(job_dir):
+    JobManifest(job_dir, "job-1").set_info(source="video.mp4", output_dir="out")
+    
+    data = JobManifest(job_dir, "job-1").data
+    
+    assert (data['source'], data['output_dir']) == ("video.mp4", "out")
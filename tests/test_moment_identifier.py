@@ -0,0 +1,37 @@
+import pytest
+
+from src.moment_identifier import MomentIdentifier
+
+
+@pytest.fixture
+def identifier():
+    return MomentIdentifier(use_cache=False, refine_boundaries=False)
+
+
+def moment(start, end, priority):
+    return {'start': start, 'end': end, 'duration': end - start, 'priority': priority}
+
+
+def test_merge_keeps_the_highest_priority_duplicate(identifier):
+    moments = [moment(10, 40, 5), moment(12, 38, 9), moment(100, 130, 7)]
+    
+    merged = identifier._merge_moments(moments)
+    
+    assert merged == [moment(12, 38, 9), moment(100, 130, 7)]
+
+
+def test_merge_compares_with_the_shorter_moment(identifier):
+    # 15s de sobreposição cobrem todo o momento curto, mas só um quarto do longo
+    moments = [moment(0, 60, 5), moment(20, 35, 4)]
+    
+    assert identifier._merge_moments(moments) == [moment(0, 60, 5)]
+
+
+def test_merge_keeps_moments_that_barely_overlap(identifier):
+    moments = [moment(0, 30, 5), moment(25, 55, 4), moment(60, 90, 3)]
+    
+    assert identifier._merge_moments(moments) == moments
+
+
+def test_merge_empty(identifier):
+    assert identifier._merge_moments([]) == []
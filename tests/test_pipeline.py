@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.audio_processor import AudioProcessor
+from src.pipeline import ShortsPipeline
+from src.transcript import Transcript
+
+INF = float('inf')
+
+
+@pytest.fixture
+def pipeline():
+    # Só o necessário para _nominal_part, sem Whisper nem LLM
+    p = ShortsPipeline.__new__(ShortsPipeline)
+    p.generator = SimpleNamespace(audio_processor=AudioProcessor(use_cache=False, use_vad=False, two_pass=False))
+    p.transcript = Transcript()
+    return p
+
+
+def segment(start, end, text, word_items=()):
+    return {'start': start, 'end': end, 'text': f" {text}",
+            'words': [{'start': s, 'end': e, 'word': f" {w}"} for s, e, w in word_items]}
+
+
+def accept(pipeline, raw_segments, nominal_start, nominal_end):
+    """Anexa a parte nominal de um chunk, como faz a etapa de transcrição."""
+    chunk_transcript = pipeline.generator.audio_processor.format_transcription({'segments': raw_segments})
+    piece = pipeline._nominal_part(chunk_transcript, nominal_start, nominal_end)
+    end = len(pipeline.transcript)
+    pipeline.transcript = pipeline.transcript.replace_ranges([(end, end, piece)])
+
+
+def texts(transcript):
+    return [s['text'] for s in transcript]
+
+
+def test_nominal_part_drops_segments_outside_the_chunk(pipeline):
+    accept(pipeline, [segment(0, 4, "a"), segment(4, 9, "b"), segment(31, 33, "sobra")], 0, 30)
+    accept(pipeline, [segment(6, 8, "de novo"), segment(31, 33, "c")], 30, INF)
+    
+    assert texts(pipeline.transcript) == ["a", "b", "c"]
+
+
+def test_nominal_part_trims_a_segment_crossing_the_boundary(pipeline):
+    accept(pipeline, [segment(20, 28, "um dois tres"),
+                      segment(28, 33, "quatro cinco seis",
+                              [(28, 30, "quatro"), (30, 31.5, "cinco"), (31.5, 33, "seis")])], 0, 30)
+    accept(pipeline, [segment(25, 29, "s tres", [(25, 26, "s"), (26, 29, "tres")]),
+                      segment(29.5, 36, "cinco seis sete",
+                              [(29.5, 31, "cinco"), (31, 32.8, "seis"), (33, 36, "sete")]),
+                      segment(36, 40, "oito", [(36, 40, "oito")])], 30, INF)
+    
+    assert texts(pipeline.transcript) == ["um dois tres", "quatro cinco seis", "sete", "oito"]
+    assert pipeline.transcript.starts[2] == 33
+    assert [w['word'] for w in pipeline.transcript.words_of(2)] == ["sete"]
+
+
+def test_nominal_part_drops_repeated_text_at_the_junction(pipeline):
+    accept(pipeline, [segment(25, 29, "olá pessoal")], 0, 30)
+    accept(pipeline, [segment(30, 33, "Olá, pessoal!"), segment(33, 35, "bem-vindos")], 30, INF)
+    
+    assert texts(pipeline.transcript) == ["olá pessoal", "bem-vindos"]
+
+
+def test_first_chunk_is_kept_as_is(pipeline):
+    accept(pipeline, [segment(0, 4, "a"), segment(4, 9, "b")], 0, 30)
+    
+    assert texts(pipeline.transcript) == ["a", "b"]
+    assert pipeline._nominal_part(Transcript(), 30, 60).to_segments() == []
@@ -0,0 +1,205 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src import service
+from src.service import JobStore, ShortsService, JOB_OPTIONS
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / "service.db")
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    jobs = tmp_path / "jobs"
+    monkeypatch.setattr(service, "JOBS_DIR", jobs)
+    return jobs
+
+
+def test_create_and_get(store):
+    job = store.create("video.mp4", dict(JOB_OPTIONS))
+    
+    assert job['status'] == 'queued'
+    assert job['options'] == JOB_OPTIONS
+    assert store.get(job['id']) == job
+    assert store.get("inexistente") is None
+    assert store.counts() == {'queued': 1}
+
+
+def test_claim_next_is_fifo(store):
+    first = store.create("a.mp4", {})
+    second = store.create("b.mp4", {})
+    
+    assert store.claim_next()['id'] == first['id']
+    assert store.claim_next()['id'] == second['id']
+    assert store.claim_next() is None
+    assert store.counts() == {'running': 2}
+
+
+def test_concurrent_claims_never_share_a_job(store):
+    created = {store.create(f"{i}.mp4", {})['id'] for i in range(20)}
+    claimed = []
+    
+    def worker():
+        while (job := store.claim_next()) is not None:
+            claimed.append(job['id'])
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sorted(claimed) == sorted(created)
+
+
+def test_cancel_queued_job_is_immediate(store):
+    job = store.create("video.mp4", {})
+    
+    cancelled = store.request_cancel(job['id'])
+    
+    assert cancelled['status'] == 'cancelled'
+    assert store.claim_next() is None
+
+
+def test_cancel_running_job_is_only_requested(store):
+    job = store.create("video.mp4", {})
+    store.claim_next()
+    
+    requested = store.request_cancel(job['id'])
+    
+    assert requested['status'] == 'running'
+    assert store.cancel_requested(job['id'])
+
+
+def test_cancel_finished_job_does_nothing(store):
+    job = store.create("video.mp4", {})
+    store.claim_next()
+    store.finish(job['id'], 'done', result={'shorts': []})
+    
+    assert store.request_cancel(job['id'])['status'] == 'done'
+    assert not store.cancel_requested(job['id'])
+
+
+def test_recover_requeues_interrupted_jobs(store):
+    interrupted = store.create("a.mp4", {})
+    cancelling = store.create("b.mp4", {})
+    store.claim_next()
+    store.claim_next()
+    store.set_stage(interrupted['id'], 'asr')
+    store.request_cancel(cancelling['id'])
+    
+    assert store.recover() == 1
+    
+    requeued = store.get(interrupted['id'])
+    assert (requeued['status'], requeued['stage'], requeued['started_at']) == ('queued', None, None)
+    assert store.get(cancelling['id'])['status'] == 'cancelled'
+    assert store.claim_next()['id'] == interrupted['id']
+
+
+class FakeMetrics:
+    def report(self):
+        return {'stages': {}}
+
+
+class FakeGenerator:
+    """Substitui o ShortsGenerator: passa pelas etapas e grava um relatório no diretório do job."""
+    
+    def __init__(self, job_dir: Path, output_dir: Path, on_stage, fail: bool = False):
+        self.job_dir = job_dir
+        self.output_dir = output_dir
+        self.on_stage = on_stage
+        self.fail = fail
+        self.metrics = FakeMetrics()
+    
+    def generate_shorts(self, source, create_individual=True, create_compilation=True):
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        (self.job_dir / "metrics.json").write_text("{}")
+        for stage in ("ingest", "asr", "llm", "render"):
+            self.on_stage(stage)
+        if self.fail:
+            raise Exception("falha simulada")
+        return [self.output_dir / "short_01.mp4"]
+
+
+def make_service(store, jobs_dir, tmp_path, fail=False, before_stage=None):
+    shorts_service = ShortsService(store, workers=1, poll_interval=0.01)
+    
+    def new_generator(job_id, options, on_stage=None):
+        def stage_hook(stage):
+            if before_stage:
+                before_stage(job_id, stage)
+            on_stage(stage)
+        return FakeGenerator(jobs_dir / job_id, tmp_path / "output" / job_id, stage_hook, fail)
+    
+    shorts_service._new_generator = new_generator
+    return shorts_service
+
+
+def test_run_job_done_removes_the_job_dir_and_keeps_reports(store, jobs_dir, tmp_path):
+    shorts_service = make_service(store, jobs_dir, tmp_path)
+    job = shorts_service.submit("video.mp4")
+    
+    shorts_service._run_job(store.claim_next())
+    
+    finished = store.get(job['id'])
+    assert finished['status'] == 'done'
+    assert finished['stage'] == 'render'
+    assert finished['result']['shorts'] == [str(tmp_path / "output" / job['id'] / "short_01.mp4")]
+    assert not (jobs_dir / job['id']).exists()
+    assert (tmp_path / "output" / job['id'] / "metrics.json").exists()
+    assert shorts_service.completed
+
+
+def test_run_job_failure_keeps_the_checkpoints(store, jobs_dir, tmp_path):
+    shorts_service = make_service(store, jobs_dir, tmp_path, fail=True)
+    job = shorts_service.submit("video.mp4")
+    
+    shorts_service._run_job(store.claim_next())
+    
+    assert store.get(job['id'])['status'] == 'failed'
+    assert store.get(job['id'])['error'] == "falha simulada"
+    assert (jobs_dir / job['id'] / "metrics.json").exists()
+
+
+def test_cancel_stops_a_running_job_at_the_next_stage(store, jobs_dir, tmp_path):
+    def cancel_before_llm(job_id, stage):
+        if stage == 'llm':
+            store.request_cancel(job_id)
+    
+    shorts_service = make_service(store, jobs_dir, tmp_path, before_stage=cancel_before_llm)
+    job = shorts_service.submit("video.mp4")
+    
+    shorts_service._run_job(store.claim_next())
+    
+    cancelled = store.get(job['id'])
+    assert cancelled['status'] == 'cancelled'
+    assert cancelled['stage'] == 'asr'
+    assert not (jobs_dir / job['id']).exists()
+
+
+def test_workers_process_the_queue(store, jobs_dir, tmp_path):
+    shorts_service = make_service(store, jobs_dir, tmp_path)
+    shorts_service.start(preload=False)
+    try:
+        jobs = [shorts_service.submit(f"{i}.mp4") for i in range(3)]
+        for _ in range(500):
+            if all(store.get(job['id'])['status'] == 'done' for job in jobs):
+                break
+            threading.Event().wait(0.01)
+    finally:
+        shorts_service.stop()
+    
+    assert [store.get(job['id'])['status'] for job in jobs] == ['done'] * 3
+    assert shorts_service.health()['completed_this_run'] == 3
+
+
+def test_submit_rejects_unknown_options(store, jobs_dir, tmp_path):
+    shorts_service = make_service(store, jobs_dir, tmp_path)
+    
+    with pytest.raises(ValueError):
+        shorts_service.submit("video.mp4", {'turbo': True})
+    assert store.counts() == {}
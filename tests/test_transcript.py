@@ -0,0 +1,110 @@
+import pickle
+
+from src.transcript import Transcript, TranscriptSlice
+
+
+def make_transcript():
+    return Transcript.from_segments([
+        {'start': 0.0, 'end': 2.0, 'text': 'um', 'words': [{'start': 0.0, 'end': 1.0, 'word': 'um'}]},
+        {'start': 2.0, 'end': 4.0, 'text': 'dois', 'words': [{'start': 2.5, 'end': 3.5, 'word': 'dois'}]},
+        {'start': 4.0, 'end': 6.0, 'text': 'tres', 'words': [{'start': 4.0, 'end': 5.0, 'word': 'tres'}]},
+        {'start': 6.0, 'end': 8.0, 'text': 'quatro', 'words': []},
+    ])
+
+
+def test_segments_keep_the_old_dict_format():
+    transcript = make_transcript()
+    
+    assert len(transcript) == 4
+    assert transcript[1] == {'start': 2.0, 'end': 4.0, 'text': 'dois', 'duration': 2.0}
+    assert transcript[-1]['text'] == 'quatro'
+    assert transcript.text == "um dois tres quatro"
+    assert transcript.words_of(1) == [{'start': 2.5, 'end': 3.5, 'word': 'dois'}]
+    assert transcript.words_of(3) == []
+
+
+def test_range_returns_overlapping_segments():
+    transcript = make_transcript()
+    
+    assert [s['text'] for s in transcript.range(2.0, 4.0)] == ['dois']
+    assert [s['text'] for s in transcript.range(1.5, 4.5)] == ['um', 'dois', 'tres']
+    assert len(transcript.range(8.0, 10.0)) == 0
+
+
+def test_range_includes_every_overlapping_segment():
+    # A visão é contígua: um segmento longo puxa os que estão dentro dele
+    transcript = Transcript([0.0, 1.0, 5.0, 12.0], [10.0, 2.0, 6.0, 13.0], ['longo', 'curto', 'fim', 'depois'])
+    
+    assert [s['text'] for s in transcript.range(5.5, 7.0)] == ['longo', 'curto', 'fim']
+    assert [s['text'] for s in transcript.range(11.0, 12.5)] == ['depois']
+
+
+def test_slice_range_stays_inside_the_slice():
+    transcript = make_transcript()
+    window = transcript.range(2.0, 6.0)
+    
+    assert [s['text'] for s in window.range(0.0, 10.0)] == ['dois', 'tres']
+    assert [s['text'] for s in window.range(4.5, 5.0)] == ['tres']
+
+
+def test_slice_range_outside_the_slice_is_empty():
+    transcript = make_transcript()
+    window = transcript.range(2.0, 6.0)
+    
+    for start, end in ((0.0, 1.0), (7.0, 8.0), (20.0, 30.0)):
+        inner = window.range(start, end)
+        assert len(inner) == 0
+        assert inner.lo <= inner.hi
+        assert list(inner) == []
+
+
+def test_slice_indexing_and_copy():
+    transcript = make_transcript()
+    window = transcript[1:3]
+    
+    assert isinstance(window, TranscriptSlice)
+    assert window[0]['text'] == 'dois'
+    assert [s['text'] for s in window[1:]] == ['tres']
+    
+    copy = window.copy()
+    assert isinstance(copy, Transcript)
+    assert copy.text == "dois tres"
+    assert copy.words_of(0) == [{'start': 2.5, 'end': 3.5, 'word': 'dois'}]
+
+
+def test_slice_pickles_only_its_segments():
+    window = make_transcript()[1:3]
+    
+    restored = pickle.loads(pickle.dumps(window))
+    
+    assert len(restored.transcript) == 2
+    assert restored.text == "dois tres"
+
+
+def test_shifted_moves_segments_and_words():
+    shifted = make_transcript().shifted(10.0)
+    
+    assert shifted[0]['start'] == 10.0
+    assert shifted.words_of(1) == [{'start': 12.5, 'end': 13.5, 'word': 'dois'}]
+    assert [s['text'] for s in shifted.range(12.0, 14.0)] == ['dois']
+
+
+def test_replace_ranges():
+    transcript = make_transcript()
+    replacement = Transcript([2.0, 3.0], [3.0, 4.0], ['DOIS', 'e meio'])
+    appended = Transcript([8.0], [9.0], ['cinco'])
+    
+    result = transcript.replace_ranges([(4, 4, appended), (1, 2, replacement)])
+    
+    assert [s['text'] for s in result] == ['um', 'DOIS', 'e meio', 'tres', 'quatro', 'cinco']
+    assert result.has_words
+    assert transcript.text == "um dois tres quatro"
+
+
+def test_dict_round_trip():
+    transcript = make_transcript()
+    
+    restored = Transcript.from_dict(transcript.to_dict())
+    
+    assert list(restored) == list(transcript)
+    assert [restored.words_of(i) for i in range(4)] == [transcript.words_of(i) for i in range(4)]
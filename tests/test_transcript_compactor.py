@@ -0,0 +1,60 @@
+from src.transcript_compactor import TranscriptCompactor
+
+
+def segments(count, spacing=10.0, text="uma frase qualquer sobre o jogo"):
+    return [{'start': i * spacing, 'end': i * spacing + 5, 'text': f"{text} {i}"} for i in range(count)]
+
+
+def test_removes_fillers_and_repetitions():
+    compactor = TranscriptCompactor(bucket_seconds=30, token_budget=10_000)
+    
+    assert compactor._clean_text("né então então hmm Olha olha, isso") == "então Olha isso"
+
+
+def test_groups_segments_into_timestamped_buckets():
+    compactor = TranscriptCompactor(bucket_seconds=30, token_budget=10_000)
+    
+    lines = compactor.compact(segments(6)).splitlines()
+    
+    assert lines == [
+        "[00:00:00] uma frase qualquer sobre o jogo 0 uma frase qualquer sobre o jogo 1 "
+        "uma frase qualquer sobre o jogo 2",
+        "[00:00:30] uma frase qualquer sobre o jogo 3 uma frase qualquer sobre o jogo 4 "
+        "uma frase qualquer sobre o jogo 5",
+    ]
+
+
+def test_larger_buckets_before_cutting_text():
+    compactor = TranscriptCompactor(bucket_seconds=10, token_budget=10_000)
+    full = compactor.compact(segments(30))
+    
+    compactor.token_budget = compactor.count_tokens(full) - 20
+    compacted = compactor.compact(segments(30))
+    
+    assert compactor.count_tokens(compacted) <= compactor.token_budget
+    assert "…" not in compacted
+
+
+def test_cuts_text_to_fit_the_budget():
+    compactor = TranscriptCompactor(bucket_seconds=120, token_budget=300)
+    
+    compacted = compactor.compact(segments(60, spacing=130.0, text="palavra diferente " * 20))
+    
+    assert compactor.count_tokens(compacted) <= 300
+    assert "…" in compacted
+
+
+def test_drops_lines_when_the_minimum_per_line_exceeds_the_budget():
+    compactor = TranscriptCompactor(bucket_seconds=120, token_budget=200)
+    
+    lines = compactor.compact(segments(60, spacing=130.0)).splitlines()
+    
+    assert compactor.count_tokens("\n".join(lines)) <= 200
+    assert 1 < len(lines) < 60
+    # Os blocos mantidos cobrem a janela toda, não só o começo
+    assert lines[0].startswith("[00:00:00]")
+    assert lines[-1] > "[01:30:00]"
+
+
+def test_empty_transcript():
+    assert TranscriptCompactor().compact([]) == ""
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.vad import VoiceActivityDetector, SAMPLE_RATE
+
+
+@pytest.fixture
+def detector():
+    return VoiceActivityDetector(min_silence=0.3, padding=0.1)
+
+
+def tone(seconds, amplitude=0.3, frequency=220.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_detects_speech_between_pauses(detector):
+    audio = np.concatenate([silence(2), tone(3), silence(2), tone(1), silence(2)])
+    
+    regions = detector.detect(audio)
+    
+    assert len(regions) == 2
+    assert regions[0] == pytest.approx((1.9, 5.1), abs=0.05)
+    assert regions[1] == pytest.approx((6.9, 8.1), abs=0.05)
+
+
+def test_short_bursts_are_discarded(detector):
+    audio = np.concatenate([silence(2), tone(0.1), silence(2)])
+    
+    assert detector.detect(audio) == []
+
+
+def test_continuous_sound_is_kept(detector):
+    # Sem pausas (música, som de jogo) o limiar relativo não pode descartar tudo
+    rng = np.random.default_rng(0)
+    audio = (tone(10) + 0.05 * rng.standard_normal(10 * SAMPLE_RATE)).astype(np.float32)
+    
+    regions = detector.detect(audio)
+    
+    assert sum(end - start for start, end in regions) == pytest.approx(10.0, abs=0.1)
+    assert not detector.is_silent(audio)
+
+
+def test_digital_silence(detector):
+    audio = silence(5)
+    
+    assert detector.detect(audio) == []
+    assert detector.is_silent(audio)
+    assert detector.is_silent(np.zeros(0, dtype=np.float32))
+
+
+def test_extract_speech_maps_back_to_the_original_timeline(detector):
+    audio = np.concatenate([silence(2), tone(3), silence(2), tone(1), silence(2)])
+    
+    speech, timeline = detector.extract_speech(audio)
+    
+    assert len(speech) / SAMPLE_RATE == pytest.approx(4.4, abs=0.1)
+    assert timeline.skipped_fraction == pytest.approx(1 - 4.4 / 10, abs=0.02)
+    
+    segments = [{'start': 0.5, 'end': 1.0, 'text': 'a'}, {'start': 3.5, 'end': 4.0, 'text': 'b'}]
+    timeline.remap_segments(segments)
+    assert segments[0]['start'] == pytest.approx(2.4, abs=0.05)
+    assert segments[1]['start'] == pytest.approx(7.2, abs=0.05)
+
+
+def test_options_change_with_the_parameters():
+    assert VoiceActivityDetector().options != VoiceActivityDetector(threshold_db=6.0).options
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import src.video_editor as video_editor
+from src.video_editor import VideoEditor
+
+
+class InlinePool(ThreadPoolExecutor):
+    """ProcessPoolExecutor em threads: os monkeypatches valem nos "processos"."""
+    
+    def __init__(self, max_workers=None, mp_context=None):
+        super().__init__(max_workers=max_workers)
+
+
+def fake_moviepy_render(self, video_path, moment, output_path):
+    # Como o MoviePy: áudio temporário em data_dir com o nome do arquivo parcial
+    temp_audio = self.data_dir / f"{output_path.stem}-temp-audio.m4a"
+    temp_audio.write_bytes(b"audio")
+    output_path.write_bytes(b"video")
+    temp_audio.unlink()
+    return output_path
+
+
+@pytest.fixture
+def shared_data_dir(tmp_path, monkeypatch):
+    shared = tmp_path / "data"
+    monkeypatch.setattr(video_editor, "DATA_DIR", shared)
+    monkeypatch.setattr(video_editor, "ProcessPoolExecutor", InlinePool)
+    return shared
+
+
+def test_parallel_jobs_render_inside_their_own_directories(tmp_path, shared_data_dir, monkeypatch):
+    written = []
+    original = fake_moviepy_render
+    
+    def recording_render(self, video_path, moment, output_path):
+        written.append(self.data_dir / f"{output_path.stem}-temp-audio.m4a")
+        return original(self, video_path, moment, output_path)
+    
+    monkeypatch.setattr(VideoEditor, "_render_short_moviepy", recording_render)
+    
+    moments = [{'start': 0.0, 'end': 5.0, 'title': 'um'}, {'start': 10.0, 'end': 15.0, 'title': 'dois'}]
+    results = {}
+    
+    def run_job(name):
+        editor = VideoEditor(render_backend="moviepy")
+        editor.data_dir = tmp_path / "jobs" / name
+        editor.output_dir = tmp_path / "output" / name
+        editor.data_dir.mkdir(parents=True)
+        editor.output_dir.mkdir(parents=True)
+        try:
+            results[name] = editor.create_individual_shorts(tmp_path / "video.mp4", moments, workers=2)
+        finally:
+            editor.close()
+    
+    jobs = [threading.Thread(target=run_job, args=(name,)) for name in ("a", "b")]
+    for job in jobs:
+        job.start()
+    for job in jobs:
+        job.join()
+    
+    for name in ("a", "b"):
+        assert results[name] == [tmp_path / "output" / name / "short_01.mp4",
+                                 tmp_path / "output" / name / "short_02.mp4"]
+    assert sorted(path.parent.name for path in written) == ["a", "a", "b", "b"]
+    assert all(path.parent.parent == tmp_path / "jobs" for path in written)
+    assert not shared_data_dir.exists()
+
+
+def test_failed_shorts_are_rendered_again_on_resume(tmp_path, shared_data_dir, monkeypatch):
+    rendered = []
+    failing = {'short_02.partial.mp4'}
+    
+    def flaky_render(self, video_path, moment, output_path):
+        rendered.append(output_path.name)
+        if output_path.name in failing:
+            raise Exception("falha simulada")
+        output_path.write_bytes(b"video")
+        return output_path
+    
+    def fake_concat(self, parts, output_path):
+        output_path.write_bytes(b"".join(path.read_bytes() for path, _ in parts))
+    
+    monkeypatch.setattr(VideoEditor, "_render_short_moviepy", flaky_render)
+    monkeypatch.setattr(VideoEditor, "_concat_parts", fake_concat)
+    
+    moments = [{'start': i * 20.0, 'end': i * 20.0 + 5, 'duration': 5.0, 'priority': 5, 'title': f"m{i}"}
+               for i in range(3)]
+    editor = VideoEditor(render_backend="moviepy")
+    editor.data_dir = tmp_path / "jobs" / "a"
+    editor.output_dir = tmp_path / "output" / "a"
+    editor.data_dir.mkdir(parents=True)
+    editor.output_dir.mkdir(parents=True)
+    expected = VideoEditor.expected_shorts(moments)
+    
+    created = editor.create_shorts(tmp_path / "video.mp4", moments)
+    assert expected == 4
+    assert len(created) < expected
+    assert not (editor.output_dir / "short_02.mp4").exists()
+    
+    failing.clear()
+    rendered.clear()
+    created = editor.create_shorts(tmp_path / "video.mp4", moments, resume=True)
+    
+    assert len(created) == expected
+    assert rendered == ["short_02.partial.mp4"]
+    assert not shared_data_dir.exists()
+
+
+def test_expected_shorts():
+    moments = [{'start': 0.0, 'end': 5.0}] * 3
+    
+    assert VideoEditor.expected_shorts(moments) == 4
+    assert VideoEditor.expected_shorts(moments, create_compilation=False) == 3
+    assert VideoEditor.expected_shorts(moments, create_individual=False) == 1
+    assert VideoEditor.expected_shorts(moments[:1]) == 1
+
+
+VIDEO_STREAM = {'codec_type': 'video', 'codec_name': 'h264', 'width': 1080, 'height': 1920}
+AUDIO_STREAM = {'codec_type': 'audio', 'codec_name': 'aac', 'sample_rate': '44100', 'channels': 2}
+
+
+@pytest.mark.parametrize("probes, reencode", [
+    ([[VIDEO_STREAM, AUDIO_STREAM]] * 2, False),
+    ([[VIDEO_STREAM, AUDIO_STREAM], [dict(VIDEO_STREAM, width=720), AUDIO_STREAM]], True),
+    ([[VIDEO_STREAM, AUDIO_STREAM], [VIDEO_STREAM]], True),
+    ([[VIDEO_STREAM, AUDIO_STREAM], None], True),
+])
+def test_concat_copies_only_matching_parts(tmp_path, shared_data_dir, monkeypatch, probes, reencode):
+    parts = [(tmp_path / f"part_{i}.mp4", 5.0) for i in range(len(probes))]
+    by_path = {str(path): probe for (path, _), probe in zip(parts, probes)}
+    monkeypatch.setattr(VideoEditor, "_probe_streams", staticmethod(lambda path: by_path[str(path)]))
+    
+    calls = []
+    monkeypatch.setattr(VideoEditor, "_concat_reencode",
+                        lambda self, parts, probes, output_path: calls.append("reencode"))
+    monkeypatch.setattr(video_editor.subprocess, "run",
+                        lambda cmd, **kwargs: calls.append("copy" if "copy" in cmd else cmd))
+    
+    editor = VideoEditor(render_backend="moviepy")
+    editor.data_dir = tmp_path / "job"
+    editor.data_dir.mkdir()
+    editor._concat_parts(parts, tmp_path / "compilation.mp4")
+    
+    assert calls == ["reencode" if reencode else "copy"]
+    # a lista do concat demuxer não fica para trás
+    assert list(editor.data_dir.iterdir()) == []
@@ -0,0 +1,31 @@
+import pytest
+
+from src.video_ingestion import VideoIngestion
+
+
+def probe(format_name, video_codec, audio_codec=None):
+    streams = []
+    if video_codec:
+        streams.append({'codec_type': 'video', 'codec_name': video_codec})
+    if audio_codec:
+        streams.append({'codec_type': 'audio', 'codec_name': audio_codec})
+    return {'format': {'format_name': format_name}, 'streams': streams}
+
+
+@pytest.mark.parametrize("format_name, video_codec, audio_codec, expected", [
+    ("mov,mp4,m4a,3gp,3g2,mj2", "h264", "aac", "link"),
+    ("matroska,webm", "vp9", "opus", "link"),
+    ("matroska,webm", "hevc", None, "link"),
+    ("flv", "h264", "aac", "remux"),
+    ("mpegts", "h264", "mp3", "remux"),
+    # Contêiner com busca, mas codecs que não podem ser copiados para MP4
+    ("matroska,webm", "vp8", "vorbis", "transcode"),
+    ("matroska,webm", "mpeg2video", "aac", "transcode"),
+    ("mov,mp4,m4a,3gp,3g2,mj2", "h264", "pcm_s16le", "transcode"),
+    ("avi", "msmpeg4v3", "mp3", "transcode"),
+    ("mp3", None, "mp3", "transcode"),
+])
+def test_choose_ingest_strategy(format_name, video_codec, audio_codec, expected):
+    strategy = VideoIngestion()._choose_ingest_strategy(probe(format_name, video_codec, audio_codec))
+    
+    assert strategy == expected